@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 from logging.config import fileConfig
 
@@ -37,6 +38,24 @@ config.set_main_option('sqlalchemy.url', url)
 
 target_metadata = Base.metadata
 
+# the sqlite full text search tables are created by the models' DDL events
+SEARCH_TABLES = re.compile(r"^(posts|comments)_search(_\w+)?$")
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return SEARCH_TABLES.match(name) is None
+
+    return True
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # gin indexes are only created on postgresql, see src/models/index.py
+    if type_ == "index" and not reflected and object.dialect_options["postgresql"]["using"] == "gin":
+        return context.get_context().dialect.name == "postgresql"
+
+    return True
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -62,6 +81,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -83,7 +104,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
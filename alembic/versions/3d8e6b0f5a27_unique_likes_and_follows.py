@@ -0,0 +1,63 @@
+"""unique likes and follows
+
+Revision ID: 3d8e6b0f5a27
+Revises: 7c2f4a9d1b63
+Create Date: 2026-10-18 14:21:05.403519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d8e6b0f5a27'
+down_revision = '7c2f4a9d1b63'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_likes_post_id_owner_id', 'likes', ['post_id', 'owner_id']),
+    ('ix_likes_comment_id_owner_id', 'likes', ['comment_id', 'owner_id']),
+    ('ix_follows_follower_id_following_id', 'follows', ['follower_id', 'following_id']),
+]
+
+
+def delete_duplicates(table, columns):
+    duplicates = sa.table(table, sa.column('id'), *[sa.column(column) for column in columns])
+    kept = (
+        sa.select(sa.func.min(duplicates.c.id))
+        .where(*[duplicates.c[column].is_not(None) for column in columns])
+        .group_by(*[duplicates.c[column] for column in columns])
+    )
+    op.execute(
+        duplicates.delete()
+        .where(*[duplicates.c[column].is_not(None) for column in columns])
+        .where(duplicates.c.id.not_in(kept))
+    )
+
+
+def upgrade() -> None:
+    # counters of the affected rows drift by the deleted duplicates,
+    # run `python -m src.reconcile` afterwards
+    for name, table, columns in INDEXES:
+        delete_duplicates(table, columns)
+
+    # the autocommit block commits the deletes above before the unique
+    # indexes are built, so the index build sees no duplicates
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,40 @@
+"""rate limit bucket expiry
+
+Revision ID: 4b9c2e7a1d56
+Revises: 8e1d5b3a6f02
+Create Date: 2026-10-18 19:12:38.204615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b9c2e7a1d56'
+down_revision = '8e1d5b3a6f02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # existing buckets get full_at = 0 and are pruned on the next tick,
+    # which only hands their clients a full bucket early
+    op.add_column('rate_limit_buckets', sa.Column('full_at', sa.Float(), server_default='0', nullable=False))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_rate_limit_buckets_full_at'), 'rate_limit_buckets', ['full_at'], unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_rate_limit_buckets_full_at'), table_name='rate_limit_buckets',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.drop_column('rate_limit_buckets', 'full_at')
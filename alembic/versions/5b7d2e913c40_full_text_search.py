@@ -0,0 +1,84 @@
+"""full text search
+
+Revision ID: 5b7d2e913c40
+Revises: a41c9e7d2f85
+Create Date: 2026-10-18 15:48:31.226107
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7d2e913c40'
+down_revision = 'a41c9e7d2f85'
+branch_labels = None
+depends_on = None
+
+TABLES = ['posts', 'comments']
+
+
+def create_search_table(table):
+    search = f'{table}_search'
+
+    op.execute(f"CREATE VIRTUAL TABLE {search} USING fts5(text, content='{table}', content_rowid='id')")
+    op.execute(f"""CREATE TRIGGER {search}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {search}(rowid, text) VALUES (new.id, new.text);
+        END""")
+    op.execute(f"""CREATE TRIGGER {search}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {search}({search}, rowid, text) VALUES ('delete', old.id, old.text);
+        END""")
+    op.execute(f"""CREATE TRIGGER {search}_update AFTER UPDATE OF text ON {table} BEGIN
+            INSERT INTO {search}({search}, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO {search}(rowid, text) VALUES (new.id, new.text);
+        END""")
+    op.execute(f"INSERT INTO {search}({search}) VALUES ('rebuild')")
+
+
+def drop_search_table(table):
+    search = f'{table}_search'
+
+    for trigger in ['insert', 'delete', 'update']:
+        op.execute(f'DROP TRIGGER IF EXISTS {search}_{trigger}')
+    op.execute(f'DROP TABLE IF EXISTS {search}')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                f'ix_{table}_text', table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+            if op.get_bind().dialect.name == 'postgresql':
+                op.create_index(
+                    f'ix_{table}_text_search', table,
+                    [sa.text("to_tsvector('english'::regconfig, text)")],
+                    unique=False,
+                    postgresql_using='gin',
+                    postgresql_concurrently=True,
+                )
+
+    if op.get_bind().dialect.name == 'sqlite':
+        for table in TABLES:
+            create_search_table(table)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for table in TABLES:
+            drop_search_table(table)
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                f'ix_{table}_text_search', table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+            op.create_index(
+                f'ix_{table}_text', table, ['text'], unique=False,
+                postgresql_concurrently=True,
+            )
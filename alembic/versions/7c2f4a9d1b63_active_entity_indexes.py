@@ -0,0 +1,73 @@
+"""active entity indexes
+
+Revision ID: 7c2f4a9d1b63
+Revises: 9a3e5c7f1d28
+Create Date: 2026-10-18 13:42:17.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2f4a9d1b63'
+down_revision = '9a3e5c7f1d28'
+branch_labels = None
+depends_on = None
+
+
+def active(*columns):
+    return sa.and_(*[sa.column(column) == True for column in columns])
+
+
+POST_ACTIVE = active('is_active', 'is_owner_active')
+COMMENT_ACTIVE = active('is_active', 'is_owner_active')
+LIKE_ACTIVE = active('is_comment_active', 'is_post_active', 'is_owner_active')
+FOLLOW_ACTIVE = active('is_follower_active', 'is_following_active')
+USER_ACTIVE = active('is_active')
+
+INDEXES = [
+    ('ix_users_active_id', 'users', ['id'], USER_ACTIVE),
+    ('ix_posts_owner_id_id', 'posts', ['owner_id', 'id'], None),
+    ('ix_posts_active_id', 'posts', ['id'], POST_ACTIVE),
+    ('ix_posts_active_owner_id_id', 'posts', ['owner_id', 'id'], POST_ACTIVE),
+    ('ix_comments_owner_id_id', 'comments', ['owner_id', 'id'], None),
+    ('ix_comments_post_id_id', 'comments', ['post_id', 'id'], None),
+    ('ix_comments_active_id', 'comments', ['id'], COMMENT_ACTIVE),
+    ('ix_comments_active_owner_id_id', 'comments', ['owner_id', 'id'], COMMENT_ACTIVE),
+    ('ix_comments_active_post_id_id', 'comments', ['post_id', 'id'], COMMENT_ACTIVE),
+    ('ix_likes_owner_id_id', 'likes', ['owner_id', 'id'], None),
+    ('ix_likes_post_id_id', 'likes', ['post_id', 'id'], None),
+    ('ix_likes_comment_id_id', 'likes', ['comment_id', 'id'], None),
+    ('ix_likes_active_id', 'likes', ['id'], LIKE_ACTIVE),
+    ('ix_likes_active_owner_id_id', 'likes', ['owner_id', 'id'], LIKE_ACTIVE),
+    ('ix_likes_active_post_id_id', 'likes', ['post_id', 'id'], LIKE_ACTIVE),
+    ('ix_likes_active_comment_id_id', 'likes', ['comment_id', 'id'], LIKE_ACTIVE),
+    ('ix_follows_follower_id_id', 'follows', ['follower_id', 'id'], None),
+    ('ix_follows_following_id_id', 'follows', ['following_id', 'id'], None),
+    ('ix_follows_active_id', 'follows', ['id'], FOLLOW_ACTIVE),
+    ('ix_follows_active_follower_id_id', 'follows', ['follower_id', 'id'], FOLLOW_ACTIVE),
+    ('ix_follows_active_following_id_id', 'follows', ['following_id', 'id'], FOLLOW_ACTIVE),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=where, sqlite_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
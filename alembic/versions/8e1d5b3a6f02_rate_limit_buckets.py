@@ -0,0 +1,29 @@
+"""rate limit buckets
+
+Revision ID: 8e1d5b3a6f02
+Revises: f27a6c0d84b9
+Create Date: 2026-10-18 18:04:27.640915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e1d5b3a6f02'
+down_revision = 'f27a6c0d84b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('rate_limit_buckets',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_buckets')
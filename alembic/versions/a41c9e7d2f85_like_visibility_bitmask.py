@@ -0,0 +1,96 @@
+"""like visibility bitmask
+
+Revision ID: a41c9e7d2f85
+Revises: 3d8e6b0f5a27
+Create Date: 2026-10-18 15:02:44.871930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41c9e7d2f85'
+down_revision = '3d8e6b0f5a27'
+branch_labels = None
+depends_on = None
+
+FLAGS = [
+    ('is_post_active', 1),
+    ('is_comment_active', 2),
+    ('is_owner_active', 4),
+    ('is_post_owner_active', 8),
+    ('is_comment_owner_active', 16),
+]
+
+INDEXES = [
+    ('ix_likes_active_id', ['id']),
+    ('ix_likes_active_owner_id_id', ['owner_id', 'id']),
+    ('ix_likes_active_post_id_id', ['post_id', 'id']),
+    ('ix_likes_active_comment_id_id', ['comment_id', 'id']),
+]
+
+likes = sa.table(
+    'likes',
+    sa.column('hidden_by', sa.Integer),
+    *[sa.column(flag, sa.Boolean) for flag, bit in FLAGS],
+)
+
+
+def create_indexes(where):
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.drop_index(
+                name, table_name='likes',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+            op.create_index(
+                name, 'likes', columns, unique=False,
+                postgresql_where=where, sqlite_where=where,
+                postgresql_concurrently=True,
+            )
+
+
+def upgrade() -> None:
+    op.add_column('likes', sa.Column('hidden_by', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        likes.update().values(
+            hidden_by=sum(
+                sa.case((likes.c[flag] == True, 0), else_=bit)
+                for flag, bit in FLAGS
+            )
+        )
+    )
+    # On PostgreSQL, adding a STORED generated column rewrites the whole
+    # likes table under an ACCESS EXCLUSIVE lock, so reads and writes on
+    # likes wait until it finishes. The backfill above also updates every
+    # row in one transaction. Run this revision in a maintenance window
+    # on large tables.
+    op.add_column('likes', sa.Column('is_visible', sa.Boolean(), sa.Computed('(hidden_by & 7) = 0')))
+
+    create_indexes(sa.column('is_visible') == True)
+
+    for flag, bit in FLAGS:
+        op.drop_column('likes', flag)
+
+
+def downgrade() -> None:
+    for flag, bit in FLAGS:
+        op.add_column('likes', sa.Column(flag, sa.Boolean(), nullable=True))
+
+    op.execute(
+        likes.update().values({
+            flag: likes.c.hidden_by.bitwise_and(bit) == 0
+            for flag, bit in FLAGS
+        })
+    )
+
+    create_indexes(sa.and_(
+        sa.column('is_comment_active') == True,
+        sa.column('is_post_active') == True,
+        sa.column('is_owner_active') == True,
+    ))
+
+    op.drop_column('likes', 'is_visible')
+    op.drop_column('likes', 'hidden_by')
@@ -0,0 +1,51 @@
+"""user trigram search
+
+Revision ID: c93f1a6e8b12
+Revises: 5b7d2e913c40
+Create Date: 2026-10-18 16:31:09.554872
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c93f1a6e8b12'
+down_revision = '5b7d2e913c40'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_users_username_trgm', 'username'),
+    ('ix_users_name_trgm', 'name'),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            op.create_index(
+                name, 'users', [column], unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name, column in reversed(INDEXES):
+            op.drop_index(
+                name, table_name='users',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
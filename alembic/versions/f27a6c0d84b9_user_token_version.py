@@ -0,0 +1,24 @@
+"""user token version
+
+Revision ID: f27a6c0d84b9
+Revises: c93f1a6e8b12
+Create Date: 2026-10-18 17:12:40.318527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f27a6c0d84b9'
+down_revision = 'c93f1a6e8b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,127 @@
+"""``/active-posts/{id}`` throughput with sync and async sessions.
+
+Sends ``--requests`` requests from ``--clients`` concurrent clients and
+serves them through ``deps.Database`` in two modes:
+
+* ``sync``  - a ``Session`` on the 40-thread Starlette threadpool
+  (``DATABASE_ASYNC_ACTIVE_POSTS=false``)
+* ``async`` - an ``AsyncSession`` on the event loop via ``run_sync``
+  (``DATABASE_ASYNC_ACTIVE_POSTS=true``, needs ``asyncpg`` or ``aiosqlite``)
+
+Both modes share the same connection pool size, so the difference is in
+how waiting requests are parked. ``--latency-ms`` adds a simulated network
+round trip to every statement (``asyncio.sleep`` in async mode,
+``time.sleep`` in sync mode).
+
+    python -m benchmarks.async_throughput --clients 500 --requests 5000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.util import await_only
+from src.api import deps
+from src.api.api_v1.api import api_router
+from src.core.config import settings
+from src.database.session import get_async_url
+
+from benchmarks.utils import (get_session_factory, print_table, seed_posts,
+                              seed_users)
+
+
+async def run(app: FastAPI, post_ids: list[int], requests: int, clients: int) -> tuple[int, float]:
+    semaphore = asyncio.Semaphore(clients)
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        async def get() -> bool:
+            async with semaphore:
+                response = await client.get(
+                    f"{settings.API_V1_STR}/active-posts/{random.choice(post_ids)}"
+                )
+                return response.status_code == 200
+
+        start = time.perf_counter()
+        succeeded = sum(await asyncio.gather(*(get() for _ in range(requests))))
+
+    return succeeded, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--posts", type=int, default=1_000)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument(
+        "--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"]
+    )
+    args = parser.parse_args()
+
+    database_url = args.database_url or settings.TEST_DATABASE_URL
+    pool = {"pool_size": args.pool_size, "max_overflow": 0, "pool_timeout": 300}
+
+    SessionLocal = get_session_factory(database_url, **pool)
+    with SessionLocal() as db:
+        owner_id, = seed_users(db, 1)
+        post_ids = seed_posts(db, owner_id=owner_id, count=args.posts)
+
+    async def get_sync_database():
+        with SessionLocal() as db:
+            yield deps.Database(db)
+
+    async def get_async_database():
+        async with AsyncSessionLocal() as db:
+            yield deps.Database(db)
+
+    rows = []
+    for mode in args.modes:
+        if mode == "async":
+            async_engine = create_async_engine(get_async_url(database_url), **pool)
+            AsyncSessionLocal = async_sessionmaker(
+                bind=async_engine, autoflush=False, expire_on_commit=False
+            )
+            engine = async_engine.sync_engine
+            get_database = get_async_database
+
+            @event.listens_for(engine, "before_cursor_execute")
+            def sleep(conn, cursor, statement, parameters, context, executemany):
+                # runs inside the run_sync greenlet, so await_only yields to the loop
+                await_only(asyncio.sleep(args.latency_ms / 1000))
+
+        else:
+            engine = SessionLocal.kw["bind"]
+            get_database = get_sync_database
+
+            @event.listens_for(engine, "before_cursor_execute")
+            def sleep(conn, cursor, statement, parameters, context, executemany):
+                time.sleep(args.latency_ms / 1000)
+
+        app = FastAPI()
+        app.include_router(api_router, prefix=settings.API_V1_STR)
+        app.dependency_overrides = {deps.get_database: get_database}
+
+        succeeded, elapsed = asyncio.run(
+            run(app, post_ids, requests=args.requests, clients=args.clients)
+        )
+        event.remove(engine, "before_cursor_execute", sleep)
+
+        rows.append([
+            mode,
+            f"{succeeded / elapsed:.0f}",
+            args.requests - succeeded,
+        ])
+
+    print_table(["mode", "requests/s", "failed"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Concurrent authenticated requests with a slow database.
+
+Sends ``--requests`` requests to ``/users/current-user/`` with
+``--concurrency`` in flight at once, while every SQL statement sleeps
+``--latency-ms`` to simulate a remote database. The user cache is
+disabled, so every request does a database lookup. Two dependency
+variants are compared:
+
+* ``event-loop`` - the old ``async def get_current_user``, which runs the
+  blocking session query on the event loop and serializes all requests
+* ``threadpool`` - the current sync ``deps.get_current_user``, which
+  FastAPI runs on its threadpool
+
+    python -m benchmarks.auth_concurrency --requests 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src import crud, models, schemas
+from src.api import deps
+from src.api.api_v1.api import api_router
+from src.core import security
+from src.core.config import settings
+
+from benchmarks.utils import get_session_factory, print_table, seed_users
+
+
+async def get_current_user_on_event_loop(
+    db: Session = Depends(deps.get_db),
+    token_data: schemas.TokenData = Depends(deps.get_token_data),
+) -> models.User:
+    return deps.get_current_user(db, token_data=token_data)
+
+
+VARIANTS = {
+    "event-loop": {deps.get_current_user: get_current_user_on_event_loop},
+    "threadpool": {},
+}
+
+
+async def run(app: FastAPI, headers: dict, requests: int, concurrency: int) -> tuple[int, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def get() -> bool:
+            async with semaphore:
+                response = await client.get(
+                    f"{settings.API_V1_STR}/users/current-user/", headers=headers
+                )
+                return response.status_code == 200
+
+        start = time.perf_counter()
+        succeeded = sum(await asyncio.gather(*(get() for _ in range(requests))))
+
+    return succeeded, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument(
+        "--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS)
+    )
+    args = parser.parse_args()
+
+    # one connection per in-flight request, so the pool is never the bottleneck
+    SessionLocal = get_session_factory(
+        args.database_url, pool_size=args.concurrency, max_overflow=0
+    )
+    db = SessionLocal()
+    owner_id, = seed_users(db, 1)
+    db_user = db.get(models.User, owner_id)
+    token = security.create_access_token(data=security.get_token_claims(db_user))
+    headers = {"Authorization": f"Bearer {token}"}
+    db.close()
+
+    def get_db():
+        with SessionLocal() as db:
+            yield db
+
+    def sleep(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(args.latency_ms / 1000)
+
+    engine = SessionLocal.kw["bind"]
+    event.listen(engine, "before_cursor_execute", sleep)
+    ttl = crud.user.cache.ttl
+    crud.user.cache.ttl = 0
+
+    rows = []
+    for name in args.variants:
+        app = FastAPI()
+        app.include_router(api_router, prefix=settings.API_V1_STR)
+        app.dependency_overrides = {deps.get_db: get_db, **VARIANTS[name]}
+
+        succeeded, elapsed = asyncio.run(
+            run(app, headers, requests=args.requests, concurrency=args.concurrency)
+        )
+        rows.append([
+            name,
+            f"{succeeded / elapsed:.1f}",
+            f"{elapsed * 1000 / args.requests:.1f}",
+            args.requests - succeeded,
+        ])
+
+    crud.user.cache.ttl = ttl
+    event.remove(engine, "before_cursor_execute", sleep)
+    print_table(["dependency", "requests/s", "ms/request", "failed"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Parallel likes on one hot post.
+
+Fires ``--likes`` likes from ``--threads`` concurrent sessions at a single
+post and reports throughput, failed writes and lost updates (likes that
+made it into the ``likes`` table but not into the counter) for each
+counter strategy:
+
+* ``recount`` - the old ``COUNT(*)`` recount after every like
+* ``delta``   - ``posts.likes = posts.likes + 1`` on the post row
+* ``sharded`` - ``+1`` on one of ``LIKE_COUNTER_SHARDS`` stripes, folded
+  into ``posts.likes`` afterwards
+
+    python -m benchmarks.like_concurrency --threads 16 --likes 2000
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import Session, sessionmaker
+from src import crud, models
+from src.core.config import settings
+from src.crud.utils import utils
+
+from benchmarks.utils import (get_post, get_session_factory, print_table,
+                              seed_posts, seed_users)
+
+
+def like_post_with_recount(db: Session, post_id: int, owner_id: int):
+    db.add(models.Like(post_id=post_id, owner_id=owner_id))
+    db.commit()
+
+    utils.update_post_likes_count(db, post_id=post_id)
+    db.commit()
+
+
+def like_post_with_counter(db: Session, post_id: int, owner_id: int):
+    crud.like.like_post(db, post_id=post_id, owner_id=owner_id)
+
+
+STRATEGIES = {
+    "recount": ("delta", like_post_with_recount),
+    "delta": ("delta", like_post_with_counter),
+    "sharded": ("sharded", like_post_with_counter),
+}
+
+
+def run(SessionLocal: sessionmaker, like_post, post_id: int, liker_ids: list[int], threads: int) -> int:
+    def like(owner_id: int) -> bool:
+        with SessionLocal() as db:
+            try:
+                like_post(db, post_id=post_id, owner_id=owner_id)
+            except Exception:
+                db.rollback()
+                return False
+
+        return True
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return sum(executor.map(like, liker_ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--likes", type=int, default=2_000)
+    parser.add_argument(
+        "--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES)
+    )
+    args = parser.parse_args()
+
+    SessionLocal = get_session_factory(args.database_url)
+    db = SessionLocal()
+    owner_id, = seed_users(db, 1)
+    mode = settings.LIKE_COUNTER_MODE
+    rows = []
+
+    for name in args.strategies:
+        settings.LIKE_COUNTER_MODE, like_post = STRATEGIES[name]
+        post_id = seed_posts(db, owner_id=owner_id, count=1)[0]
+        liker_ids = seed_users(db, args.likes)
+
+        start = time.perf_counter()
+        succeeded = run(
+            SessionLocal, like_post, post_id, liker_ids, threads=args.threads
+        )
+        elapsed = time.perf_counter() - start
+
+        utils.fold_post_like_shards(db)
+        db.commit()
+
+        stored = (
+            db.query(models.Like)
+            .filter(models.Like.post_id == post_id)
+            .count()
+        )
+        counted = get_post(db, post_id=post_id).likes
+        db.expire_all()
+
+        rows.append([
+            name,
+            f"{succeeded / elapsed:.0f}",
+            args.likes - succeeded,
+            stored - counted,
+        ])
+
+    settings.LIKE_COUNTER_MODE = mode
+    print_table(["strategy", "likes/s", "failed", "lost updates"], rows)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
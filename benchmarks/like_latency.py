@@ -0,0 +1,80 @@
+"""Like/unlike latency as the number of likes on a post grows.
+
+Compares the full ``COUNT(*)`` recount that used to run on every like with
+the atomic ``likes = likes + 1`` delta now used by ``crud.like``.
+
+    python -m benchmarks.like_latency --sizes 0 1000 10000 100000
+"""
+import argparse
+
+from sqlalchemy.orm import Session
+from src import crud, models
+from src.crud.utils import utils
+
+from benchmarks.utils import (get_session_factory, measure, print_table,
+                              seed_post_likes, seed_posts, seed_users)
+
+
+def like_post_with_recount(db: Session, post_id: int, owner_id: int):
+    db.add(models.Like(post_id=post_id, owner_id=owner_id))
+    db.commit()
+
+    utils.update_post_likes_count(db, post_id=post_id)
+    db.commit()
+
+
+def like_post_with_delta(db: Session, post_id: int, owner_id: int):
+    crud.like.like_post(db, post_id=post_id, owner_id=owner_id)
+
+
+STRATEGIES = {
+    "recount": like_post_with_recount,
+    "delta": like_post_with_delta,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[0, 1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    SessionLocal = get_session_factory(args.database_url)
+    db = SessionLocal()
+
+    liker_id, owner_id = seed_users(db, 2)
+    rows = []
+
+    for size in args.sizes:
+        post_id = seed_posts(db, owner_id=owner_id, count=1)[0]
+        seed_post_likes(db, post_id=post_id, owner_ids=seed_users(db, size))
+        utils.update_post_likes_count(db, post_id=post_id)
+        db.commit()
+
+        def unlike():
+            crud.like.unlike_post(db, post_id=post_id, owner_id=liker_id)
+
+        row = [size]
+        for like_post in STRATEGIES.values():
+            timings = measure(
+                lambda: like_post(db, post_id=post_id, owner_id=liker_id),
+                repeat=args.repeat,
+                teardown=unlike,
+            )
+            row += [f"{timings['median']:.2f}", f"{timings['p95']:.2f}"]
+
+        rows.append(row)
+
+    print_table(
+        ["likes", "recount p50 ms", "recount p95 ms",
+            "delta p50 ms", "delta p95 ms"],
+        rows,
+    )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
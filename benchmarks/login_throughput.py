@@ -0,0 +1,92 @@
+"""``/auth/signin`` throughput at different bcrypt costs.
+
+For each cost in ``--rounds`` the benchmark stores a bcrypt hash of that
+cost for one user, then sends ``--requests`` sign-ins with
+``--concurrency`` in flight at once. It reports successful logins per
+second and how many requests the bounded hashing pool rejected with 503
+(``PASSWORD_HASHING_WORKERS``, ``PASSWORD_HASHING_QUEUE_SIZE``).
+
+    python -m benchmarks.login_throughput --rounds 10 11 12 13 --concurrency 32
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from passlib.context import CryptContext
+from src import models
+from src.api import deps
+from src.api.api_v1.api import api_router
+from src.core.config import settings
+
+from benchmarks.utils import get_session_factory, print_table, seed_users
+
+
+async def run(app: FastAPI, username: str, password: str, requests: int, concurrency: int) -> tuple[dict[int, int], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def sign_in() -> int:
+            async with semaphore:
+                response = await client.post(
+                    f"{settings.API_V1_STR}/auth/signin",
+                    data={"username": username, "password": password},
+                )
+                return response.status_code
+
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(sign_in() for _ in range(requests)))
+
+    return {status: statuses.count(status) for status in set(statuses)}, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    SessionLocal = get_session_factory(
+        args.database_url, pool_size=args.concurrency, max_overflow=0
+    )
+    db = SessionLocal()
+    owner_id, = seed_users(db, 1)
+    db_user = db.get(models.User, owner_id)
+    password = "bench-password"
+
+    def get_db():
+        with SessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    app.dependency_overrides = {deps.get_db: get_db}
+
+    rows = []
+    for rounds in args.rounds:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        db_user.hashed_password = context.hash(password)
+        db.commit()
+
+        statuses, elapsed = asyncio.run(
+            run(
+                app, db_user.username, password,
+                requests=args.requests, concurrency=args.concurrency,
+            )
+        )
+        rows.append([
+            rounds,
+            f"{statuses.get(200, 0) / elapsed:.1f}",
+            statuses.get(503, 0),
+        ])
+
+    db.close()
+    print_table(["rounds", "logins/s", "rejected"], rows)
+
+
+if __name__ == "__main__":
+    main()
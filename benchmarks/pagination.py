@@ -0,0 +1,76 @@
+"""Page latency of ``/active-posts/all/`` at increasing depth.
+
+Compares the legacy ``skip`` (``OFFSET``) pagination with the keyset
+``cursor`` pagination. Offset pages get slower the deeper they are, keyset
+pages should stay flat.
+
+    python -m benchmarks.pagination --pages 1 100 10000 --page-size 20
+"""
+import argparse
+
+from src import crud, models
+
+from benchmarks.utils import (get_session_factory, measure, print_table,
+                              seed_posts, seed_users)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument(
+        "--pages", type=int, nargs="+", default=[1, 100, 10_000]
+    )
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    SessionLocal = get_session_factory(args.database_url)
+    db = SessionLocal()
+
+    owner_id, = seed_users(db, 1)
+    needed = max(args.pages) * args.page_size
+    existing = crud.post.get_all_active_posts_count(db)
+    if existing < needed:
+        seed_posts(db, owner_id=owner_id, count=needed - existing)
+
+    rows = []
+    for page in args.pages:
+        skip = (page - 1) * args.page_size
+        after = None
+        if skip:
+            after = (
+                db.query(models.Post.id)
+                .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
+                .order_by(models.Post.id)
+                .offset(skip - 1)
+                .limit(1)
+                .scalar()
+            )
+
+        offset_timings = measure(
+            lambda: crud.post.get_all_active_posts(
+                db, skip=skip, limit=args.page_size
+            ),
+            repeat=args.repeat,
+            teardown=db.expunge_all,
+        )
+        cursor_timings = measure(
+            lambda: crud.post.get_all_active_posts(
+                db, limit=args.page_size, after=after
+            ),
+            repeat=args.repeat,
+            teardown=db.expunge_all,
+        )
+
+        rows.append([
+            page,
+            f"{offset_timings['median']:.2f}",
+            f"{cursor_timings['median']:.2f}",
+        ])
+
+    print_table(["page", "skip p50 ms", "cursor p50 ms"], rows)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Database round trips per write endpoint, with and without a single
+unit of work per request.
+
+Sends one request to each write endpoint and counts the SQL statements
+and ``COMMIT``s it sends to the database. Two modes are compared:
+
+* ``per-call`` - every crud method commits on its own
+  (``DATABASE_TRANSACTION_PER_REQUEST=false``)
+* ``per-request`` - crud methods only flush and the route commits once
+  after the handler returns (``DATABASE_TRANSACTION_PER_REQUEST=true``)
+
+Token checks use the token version map, so the counts are for the
+endpoint itself. ``BEGIN`` is implicit on SQLite and not counted.
+
+    python -m benchmarks.request_round_trips
+"""
+import argparse
+from contextlib import contextmanager
+from typing import Generator
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+from sqlalchemy.engine import Engine
+from src import crud, models
+from src.api import deps
+from src.api.api_v1.api import api_router
+from src.core import security
+from src.core.config import settings
+
+from benchmarks.utils import get_session_factory, print_table, seed_users
+
+MODES = {
+    "per-call": False,
+    "per-request": True,
+}
+
+
+@contextmanager
+def count_round_trips(engine: Engine) -> Generator[dict[str, int], None, None]:
+    counts = {"statements": 0, "commits": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+
+    def commit(conn):
+        counts["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "commit", commit)
+    try:
+        yield counts
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(engine, "commit", commit)
+
+
+def get_headers(db_user: models.User) -> dict[str, str]:
+    token = security.create_access_token(data=security.get_token_claims(db_user))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def run(client: TestClient, engine: Engine, SessionLocal) -> dict[str, dict[str, int]]:
+    with SessionLocal() as db:
+        owner_id, follower_id = seed_users(db, 2)
+        db.execute(
+            update(models.User)
+            .where(models.User.id == owner_id)
+            .values(is_superuser=True)
+        )
+        db.commit()
+
+        crud.token_version.load(db)
+        owner = get_headers(db.get(models.User, owner_id))
+        follower = get_headers(db.get(models.User, follower_id))
+        username = db.get(models.User, follower_id).username
+
+    prefix = settings.API_V1_STR
+    text = {"text": "bench"}
+    counts = {}
+
+    def send(name: str, method: str, path: str, headers: dict, **kwargs) -> dict:
+        with count_round_trips(engine) as counts[name]:
+            response = client.request(method, f"{prefix}{path}", headers=headers, **kwargs)
+
+        response.raise_for_status()
+        return response.json()
+
+    post = send("create post", "POST", "/posts/", owner, json=text)
+    send("update post", "PUT", f"/posts/{post['id']}", owner, json=text)
+    comment = send("create comment", "POST", "/comments/", follower, json={**text, "post_id": post["id"]})
+    send("update comment", "PUT", f"/comments/{comment['id']}", follower, json=text)
+    send("like post", "POST", f"/likes/post/{post['id']}", follower)
+    send("unlike post", "DELETE", f"/likes/post/{post['id']}", follower)
+    send("follow user", "POST", f"/follows/{owner_id}", follower)
+    send("unfollow user", "DELETE", f"/follows/{owner_id}", follower)
+    send("update user", "PUT", "/users/", follower, json={"username": username, "name": "bench", "bio": ""})
+    send("deactivate post", "PUT", f"/posts/deactivate/{post['id']}", owner)
+    send("activate post", "PUT", f"/posts/activate/{post['id']}", owner)
+    send("delete comment", "DELETE", f"/comments/{comment['id']}", owner)
+    send("delete post", "DELETE", f"/posts/{post['id']}", owner)
+    send("deactivate user", "PUT", f"/users/deactivate/{username}", owner)
+    send("activate user", "PUT", f"/users/activate/{username}", owner)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    SessionLocal = get_session_factory(args.database_url)
+    engine = SessionLocal.kw["bind"]
+    deps.SessionLocal = SessionLocal
+
+    app = FastAPI()
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    client = TestClient(app)
+
+    results = {}
+    for mode, enabled in MODES.items():
+        settings.DATABASE_TRANSACTION_PER_REQUEST = enabled
+        results[mode] = run(client, engine, SessionLocal)
+
+    rows = []
+    for name in results["per-call"]:
+        row = [name]
+        for mode in MODES:
+            counts = results[mode][name]
+            row.append(f"{counts['statements']} + {counts['commits']}")
+        rows.append(row)
+
+    print_table(["endpoint", *[f"{mode} (statements + commits)" for mode in MODES]], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""User deactivate/activate cascade cost as dependent rows grow.
+
+Each user owns a third of the dependent rows as posts, a third as comments
+and a third as likes on someone else's posts. The statement count should
+stay flat while the row count grows.
+
+    python -m benchmarks.user_cascade --sizes 10 1000 100000
+"""
+import argparse
+import time
+
+from src import crud
+
+from benchmarks.utils import (count_statements, get_session_factory,
+                              print_table, seed_comments, seed_owner_likes,
+                              seed_posts, seed_users)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 1_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    SessionLocal = get_session_factory(args.database_url)
+    db = SessionLocal()
+    rows = []
+
+    for size in args.sizes:
+        user_id, other_id = seed_users(db, 2)
+        username = crud.user.get_user_by_id(db, id=user_id).username
+
+        other_post_ids = seed_posts(
+            db, owner_id=other_id, count=max(size - 2 * (size // 3), 1)
+        )
+        seed_posts(db, owner_id=user_id, count=size // 3)
+        seed_comments(
+            db, post_id=other_post_ids[0], owner_id=user_id, count=size // 3
+        )
+        seed_owner_likes(
+            db, owner_id=user_id,
+            post_ids=other_post_ids[:size - 2 * (size // 3)]
+        )
+
+        row = [size]
+        for cascade in (crud.user.deactivate, crud.user.activate):
+            with count_statements(db) as statements:
+                start = time.perf_counter()
+                cascade(db, username=username)
+                elapsed = (time.perf_counter() - start) * 1000
+
+            row += [f"{elapsed:.1f}", len(statements)]
+
+        rows.append(row)
+
+    print_table(
+        ["dependent rows", "deactivate ms", "deactivate stmts",
+            "activate ms", "activate stmts"],
+        rows,
+    )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
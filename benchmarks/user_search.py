@@ -0,0 +1,68 @@
+"""Keystroke-rate ``/active-users/search`` latency.
+
+Seeds ``--users`` active users, then runs ``--repeat`` prefix searches
+against the database (trigram index on PostgreSQL, ``LIKE`` on SQLite) and
+against the in-memory autocomplete index used when
+``USER_AUTOCOMPLETE_ENABLED`` is on. The autocomplete p99 should stay well
+under 5 ms at 1M users.
+
+    python -m benchmarks.user_search --users 1000000 --repeat 1000
+"""
+import argparse
+import random
+
+from src import crud, models
+
+from benchmarks.utils import (get_session_factory, measure, print_table,
+                              seed_users)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    SessionLocal = get_session_factory(args.database_url)
+    db = SessionLocal()
+
+    existing = db.query(models.User).filter(models.User.is_active == True).count()
+    if existing < args.users:
+        seed_users(db, args.users - existing)
+
+    usernames = [
+        username for username, in (
+            db.query(models.User.username)
+            .filter(models.User.is_active == True)
+            .limit(args.repeat)
+        )
+    ]
+
+    def search():
+        username = random.choice(usernames)
+        return username[:random.randint(1, len(username))]
+
+    rows = []
+    database_timings = measure(
+        lambda: crud.user.search_active_users(db, q=search(), limit=args.limit),
+        repeat=args.repeat,
+        teardown=db.expunge_all,
+    )
+    rows.append(["database", *[f"{database_timings[key]:.3f}" for key in ("median", "p95", "p99")]])
+
+    crud.autocomplete.load(db)
+    autocomplete_timings = measure(
+        lambda: crud.user.search_active_users(db, q=search(), limit=args.limit),
+        repeat=args.repeat,
+    )
+    crud.autocomplete.clear()
+    rows.append(["autocomplete", *[f"{autocomplete_timings[key]:.3f}" for key in ("median", "p95", "p99")]])
+
+    print_table(["source", "p50 ms", "p95 ms", "p99 ms"], rows)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Generator
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+from src import models
+from src.core.config import settings
+from src.database.routing import RoutingSession
+from src.database.session import Base
+
+
+def get_session_factory(database_url: str | None = None, **engine_kwargs) -> sessionmaker:
+    engine = create_engine(database_url or settings.TEST_DATABASE_URL, **engine_kwargs)
+    Base.metadata.create_all(bind=engine)
+
+    return sessionmaker(
+        class_=RoutingSession, autocommit=False, autoflush=False,
+        expire_on_commit=False, bind=engine,
+    )
+
+
+def seed_users(db: Session, count: int, batch_size: int = 10_000) -> list[int]:
+    prefix = uuid.uuid4().hex[:12]
+    ids: list[int] = []
+
+    for start in range(0, count, batch_size):
+        rows = [
+            {
+                "username": f"bench-{prefix}-{index}",
+                "hashed_password": "",
+                "name": "bench",
+            }
+            for index in range(start, min(start + batch_size, count))
+        ]
+        ids.extend(
+            db.scalars(insert(models.User).returning(models.User.id), rows)
+        )
+        db.commit()
+
+    return ids
+
+
+def seed_posts(db: Session, owner_id: int, count: int) -> list[int]:
+    rows = [{"text": "bench", "owner_id": owner_id} for _ in range(count)]
+    ids = list(db.scalars(insert(models.Post).returning(models.Post.id), rows))
+    db.commit()
+
+    return ids
+
+
+def seed_comments(db: Session, post_id: int, owner_id: int, count: int) -> list[int]:
+    rows = [
+        {"text": "bench", "post_id": post_id, "owner_id": owner_id}
+        for _ in range(count)
+    ]
+    ids = list(
+        db.scalars(insert(models.Comment).returning(models.Comment.id), rows)
+    )
+    db.commit()
+
+    return ids
+
+
+def seed_post_likes(db: Session, post_id: int, owner_ids: list[int], batch_size: int = 10_000):
+    for start in range(0, len(owner_ids), batch_size):
+        rows = [
+            {"post_id": post_id, "owner_id": owner_id}
+            for owner_id in owner_ids[start:start + batch_size]
+        ]
+        db.execute(insert(models.Like), rows)
+        db.commit()
+
+
+def seed_owner_likes(db: Session, owner_id: int, post_ids: list[int], batch_size: int = 10_000):
+    for start in range(0, len(post_ids), batch_size):
+        rows = [
+            {"post_id": post_id, "owner_id": owner_id}
+            for post_id in post_ids[start:start + batch_size]
+        ]
+        db.execute(insert(models.Like), rows)
+        db.commit()
+
+
+def get_post(db: Session, post_id: int) -> models.Post:
+    return db.scalars(
+        select(models.Post).where(models.Post.id == post_id)
+    ).one()
+
+
+@contextmanager
+def count_statements(db: Session) -> Generator[list[str], None, None]:
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def measure(fn: Callable[[], None], repeat: int, teardown: Callable[[], None] | None = None) -> dict[str, float]:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+        if teardown is not None:
+            teardown()
+
+    timings.sort()
+    return {
+        "median": statistics.median(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def print_table(headers: list[str], rows: list[list]):
+    cells = [headers] + [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(row[index]) for row in cells) for index in range(len(headers))]
+
+    for index, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if index == 0:
+            print("  ".join("-" * width for width in widths))
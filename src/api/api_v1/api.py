@@ -1,35 +1,78 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from src.api import deps
 from src.api.api_v1.endpoints import (active_comments, active_follows,
                                       active_likes, active_posts, active_users,
-                                      auth, comments, follows, likes, posts,
-                                      users)
+                                      auth, comments, follows, internal, jobs,
+                                      likes, posts, users)
+from src.core.config import settings
+
+auth_rate_limit = deps.RateLimit(
+    "auth", per_minute=settings.RATE_LIMIT_AUTH_PER_MINUTE
+)
+users_rate_limit = deps.RateLimit(
+    "users", per_minute=settings.RATE_LIMIT_WRITE_PER_MINUTE
+)
+posts_rate_limit = deps.RateLimit(
+    "posts", per_minute=settings.RATE_LIMIT_WRITE_PER_MINUTE
+)
+comments_rate_limit = deps.RateLimit(
+    "comments", per_minute=settings.RATE_LIMIT_WRITE_PER_MINUTE
+)
+likes_rate_limit = deps.RateLimit(
+    "likes", per_minute=settings.RATE_LIMIT_WRITE_PER_MINUTE
+)
+follows_rate_limit = deps.RateLimit(
+    "follows", per_minute=settings.RATE_LIMIT_WRITE_PER_MINUTE
+)
 
 api_router = APIRouter()
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(
+    auth.router, prefix="/auth", tags=["auth"],
+    dependencies=[Depends(auth_rate_limit)],
+)
 
-api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(
+    users.router, prefix="/users", tags=["users"],
+    dependencies=[Depends(users_rate_limit)],
+)
 api_router.include_router(
     active_users.router, prefix="/active-users", tags=["active users"]
 )
 
-api_router.include_router(posts.router, prefix="/posts", tags=["posts"])
+api_router.include_router(
+    posts.router, prefix="/posts", tags=["posts"],
+    dependencies=[Depends(posts_rate_limit)],
+)
 api_router.include_router(
     active_posts.router, prefix="/active-posts", tags=["active posts"]
 )
 
 api_router.include_router(
-    comments.router, prefix="/comments", tags=["comments"]
+    comments.router, prefix="/comments", tags=["comments"],
+    dependencies=[Depends(comments_rate_limit)],
 )
 api_router.include_router(
     active_comments.router, prefix="/active-comments", tags=["active comments"]
 )
 
-api_router.include_router(likes.router, prefix="/likes", tags=["likes"])
+api_router.include_router(
+    likes.router, prefix="/likes", tags=["likes"],
+    dependencies=[Depends(likes_rate_limit)],
+)
 api_router.include_router(
     active_likes.router, prefix="/active-likes", tags=["active likes"]
 )
 
-api_router.include_router(follows.router, prefix="/follows", tags=["follows"])
+api_router.include_router(
+    follows.router, prefix="/follows", tags=["follows"],
+    dependencies=[Depends(follows_rate_limit)],
+)
 api_router.include_router(
     active_follows.router, prefix="/active-follows", tags=["active follows"]
 )
+
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+
+api_router.include_router(
+    internal.router, prefix="/internal", tags=["internal"]
+)
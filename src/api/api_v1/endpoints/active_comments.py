@@ -2,17 +2,27 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src import crud, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
+from src.api.streaming import stream_ids
+from src.core.config import settings
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Comment])
 def get_all_active_comments(
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.comment.get_all_active_comments(db, skip=skip, limit=limit)
+    return page.paginate(crud.comment.get_all_active_comments(db, skip=page.skip, limit=page.limit, after=page.after))
+
+
+@router.get("/search", response_model=list[schemas.Comment])
+def search_active_comments(
+    page: deps.SearchPage = Depends(),
+    db: Session = Depends(deps.get_db)
+):
+    return page.paginate(crud.comment.search_active_comments(db, q=page.q, limit=page.limit, after=page.after))
 
 
 @router.get("/{id}", response_model=schemas.Comment)
@@ -30,18 +40,18 @@ def get_active_comment_by_id(
 
 @router.get("/count/", response_model=int)
 def get_all_active_comments_count(
+    count: deps.Count = Depends(),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.comment.get_all_active_comments_count(db)
+    return count.report(crud.comment.get_all_active_comments_count(db, mode=count.mode))
 
 
 @router.get("/ids/", response_model=list[schemas.Id])
 def get_all_active_comments_ids(
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.comment.get_all_active_comments(db, skip=skip, limit=limit)
+    return page.paginate_ids(crud.comment.get_all_active_comments_ids(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/owner/count/{owner_id}", response_model=int)
@@ -60,8 +70,7 @@ def get_active_comments_count_by_owner_id(
 @router.get("/owner/ids/{owner_id}", response_model=list[schemas.Id])
 def get_active_comments_ids_by_owner_id(
     owner_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_active_user_by_id(db, id=owner_id)
@@ -69,7 +78,7 @@ def get_active_comments_ids_by_owner_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.comment.get_active_comments_by_owner_id(db, owner_id=owner_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.comment.get_active_comments_ids_by_owner_id(db, owner_id=owner_id, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/post/count/{post_id}", response_model=int)
@@ -88,8 +97,20 @@ def get_active_comments_count_by_post_id(
 @router.get("/post/ids/{post_id}", response_model=list[schemas.Id])
 def get_active_comments_ids_by_post_id(
     post_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
+    db: Session = Depends(deps.get_db),
+):
+    db_post = crud.post.get_active_post_by_id(db, id=post_id)
+
+    if db_post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    return page.paginate_ids(crud.comment.get_active_comments_ids_by_post_id(db, post_id=post_id, skip=page.skip, limit=page.limit, after=page.after))
+
+
+@router.get("/post/ids/stream/{post_id}", response_model=list[schemas.Id])
+def stream_active_comments_ids_by_post_id(
+    post_id: int,
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_active_post_by_id(db, id=post_id)
@@ -97,4 +118,7 @@ def get_active_comments_ids_by_post_id(
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    return crud.comment.get_active_comments_by_post_id(db, post_id=post_id, skip=skip, limit=limit)
+    return stream_ids(
+        crud.comment.iter_active_comments_ids_by_post_id(db, post_id=post_id, batch_size=settings.IDS_STREAM_BATCH_SIZE),
+        batch_size=settings.IDS_STREAM_BATCH_SIZE,
+    )
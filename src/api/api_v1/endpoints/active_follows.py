@@ -2,17 +2,17 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src import crud, models, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Follow])
 def get_all_active_follows(
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.follow.get_all_active_follows(db, skip=skip, limit=limit)
+    return page.paginate(crud.follow.get_all_active_follows(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/{id}", response_model=schemas.Follow)
@@ -30,9 +30,10 @@ def get_active_follow_by_id(
 
 @router.get("/count/", response_model=int)
 def get_all_active_follows_count(
+    count: deps.Count = Depends(),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.follow.get_all_active_follows_count(db)
+    return count.report(crud.follow.get_all_active_follows_count(db, mode=count.mode))
 
 
 @router.get("/following/count/{user_id}", response_model=int)
@@ -51,8 +52,7 @@ def get_active_following_count_by_user_id(
 @router.get("/following/ids/{user_id}", response_model=list[schemas.Id])
 def get_active_following_ids_by_user_id(
     user_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_active_user_by_id(db, id=user_id)
@@ -60,7 +60,7 @@ def get_active_following_ids_by_user_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.follow.get_active_followings_by_user_id(db, user_id=user_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.follow.get_active_followings_ids_by_user_id(db, user_id=user_id, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/follower/count/{user_id}", response_model=int)
@@ -79,8 +79,7 @@ def get_active_follower_count_by_user_id(
 @router.get("/follower/ids/{user_id}", response_model=list[schemas.Id])
 def get_active_follower_ids_by_user_id(
     user_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_active_user_by_id(db, id=user_id)
@@ -88,4 +87,4 @@ def get_active_follower_ids_by_user_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.follow.get_active_followers_by_user_id(db, user_id=user_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.follow.get_active_followers_ids_by_user_id(db, user_id=user_id, skip=page.skip, limit=page.limit, after=page.after))
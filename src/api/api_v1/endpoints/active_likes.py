@@ -2,17 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src import crud, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
+from src.api.streaming import stream_ids
+from src.core.config import settings
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Like])
 def get_all_active_likes(
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.like.get_all_active_likes(db, skip=skip, limit=limit)
+    return page.paginate(crud.like.get_all_active_likes(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/{id}", response_model=schemas.Like)
@@ -30,9 +32,10 @@ def get_active_like_by_id(
 
 @router.get("/count/", response_model=int)
 def get_all_active_likes_count(
+    count: deps.Count = Depends(),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.like.get_all_active_likes_count(db)
+    return count.report(crud.like.get_all_active_likes_count(db, mode=count.mode))
 
 
 @router.get("/owner/count/{owner_id}", response_model=int)
@@ -51,8 +54,7 @@ def get_active_likes_count_by_owner_id(
 @router.get("/owner/ids/{owner_id}", response_model=list[schemas.Id])
 def get_active_likes_ids_by_owner_id(
     owner_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_active_user_by_id(db, id=owner_id)
@@ -60,7 +62,7 @@ def get_active_likes_ids_by_owner_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.like.get_active_likes_by_owner_id(db, owner_id=owner_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.like.get_active_likes_ids_by_owner_id(db, owner_id=owner_id, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/post/count/{post_id}", response_model=int)
@@ -79,8 +81,7 @@ def get_active_likes_count_by_post_id(
 @router.get("/post/ids/{post_id}", response_model=list[schemas.Id])
 def get_active_likes_ids_by_post_id(
     post_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_active_post_by_id(db, id=post_id)
@@ -88,7 +89,23 @@ def get_active_likes_ids_by_post_id(
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    return crud.like.get_active_likes_by_post_id(db, post_id=post_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.like.get_active_likes_ids_by_post_id(db, post_id=post_id, skip=page.skip, limit=page.limit, after=page.after))
+
+
+@router.get("/post/ids/stream/{post_id}", response_model=list[schemas.Id])
+def stream_active_likes_ids_by_post_id(
+    post_id: int,
+    db: Session = Depends(deps.get_db),
+):
+    db_post = crud.post.get_active_post_by_id(db, id=post_id)
+
+    if db_post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    return stream_ids(
+        crud.like.iter_active_likes_ids_by_post_id(db, post_id=post_id, batch_size=settings.IDS_STREAM_BATCH_SIZE),
+        batch_size=settings.IDS_STREAM_BATCH_SIZE,
+    )
 
 
 @router.get("/comment/count/{comment_id}", response_model=int)
@@ -107,8 +124,7 @@ def get_active_likes_count_by_comment_id(
 @router.get("/comment/ids/{comment_id}", response_model=list[schemas.Id])
 def get_active_likes_ids_by_comment_id(
     comment_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
     db_comment = crud.comment.get_active_comment_by_id(db, id=comment_id)
@@ -116,4 +132,4 @@ def get_active_likes_ids_by_comment_id(
     if db_comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    return crud.like.get_active_likes_by_comment_id(db, comment_id=comment_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.like.get_active_likes_ids_by_comment_id(db, comment_id=comment_id, skip=page.skip, limit=page.limit, after=page.after))
@@ -2,25 +2,35 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src import crud, models, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
+from src.api.streaming import stream_ids
+from src.core.config import settings
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Post])
-def get_all_active_posts(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(deps.get_db)
+async def get_all_active_posts(
+    page: deps.Page = Depends(),
+    database: deps.Database = Depends(deps.get_database)
 ):
-    return crud.post.get_all_active_posts(db, skip=skip, limit=limit)
+    return page.paginate(await database.run(crud.post.get_all_active_posts, skip=page.skip, limit=page.limit, after=page.after))
+
+
+@router.get("/search", response_model=list[schemas.Post])
+async def search_active_posts(
+    page: deps.SearchPage = Depends(),
+    database: deps.Database = Depends(deps.get_database)
+):
+    return page.paginate(await database.run(crud.post.search_active_posts, q=page.q, limit=page.limit, after=page.after))
 
 
 @router.get("/{id}", response_model=schemas.Post)
-def get_active_post_by_id(
+async def get_active_post_by_id(
     id: int,
-    db: Session = Depends(deps.get_db),
+    database: deps.Database = Depends(deps.get_database),
 ):
-    db_post = crud.post.get_active_post_by_id(db, id=id)
+    db_post = await database.run(crud.post.get_active_post_by_id, id=id)
 
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -29,19 +39,29 @@ def get_active_post_by_id(
 
 
 @router.get("/count/", response_model=int)
-def get_all_active_posts_count(
-    db: Session = Depends(deps.get_db)
+async def get_all_active_posts_count(
+    count: deps.Count = Depends(),
+    database: deps.Database = Depends(deps.get_database)
 ):
-    return crud.post.get_all_active_posts_count(db)
+    return count.report(await database.run(crud.post.get_all_active_posts_count, mode=count.mode))
 
 
 @router.get("/ids/", response_model=list[schemas.Id])
-def get_all_active_posts_ids(
-    skip: int = 0,
-    limit: int = 100,
+async def get_all_active_posts_ids(
+    page: deps.Page = Depends(),
+    database: deps.Database = Depends(deps.get_database)
+):
+    return page.paginate_ids(await database.run(crud.post.get_all_active_posts_ids, skip=page.skip, limit=page.limit, after=page.after))
+
+
+@router.get("/ids/stream/", response_model=list[schemas.Id])
+def stream_all_active_posts_ids(
     db: Session = Depends(deps.get_db)
 ):
-    return crud.post.get_all_active_posts(db, skip=skip, limit=limit)
+    return stream_ids(
+        crud.post.iter_all_active_posts_ids(db, batch_size=settings.IDS_STREAM_BATCH_SIZE),
+        batch_size=settings.IDS_STREAM_BATCH_SIZE,
+    )
 
 
 @router.get("/owner/count/{owner_id}", response_model=int)
@@ -60,8 +80,7 @@ def get_active_posts_count_by_owner_id(
 @router.get("/owner/ids/{owner_id}", response_model=list[schemas.Id])
 def get_active_posts_ids_by_owner_id(
     owner_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_active_user_by_id(db, id=owner_id)
@@ -69,4 +88,4 @@ def get_active_posts_ids_by_owner_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.post.get_active_posts_by_owner_id(db, owner_id=owner_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.post.get_active_posts_ids_by_owner_id(db, owner_id=owner_id, skip=page.skip, limit=page.limit, after=page.after))
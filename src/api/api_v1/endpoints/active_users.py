@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from src import crud, models, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.User])
 def get_all_active_users(
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(),
     db: Session = Depends(deps.get_db),
 ):
-    return crud.user.get_all_active_users(db, skip=skip, limit=limit)
+    return page.paginate(crud.user.get_all_active_users(db, skip=page.skip, limit=page.limit, after=page.after))
+
+
+@router.get("/search", response_model=list[schemas.Owner])
+def search_active_users(
+    q: str = Query(min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(deps.get_db),
+):
+    return crud.user.search_active_users(db, q=q, limit=limit)
 
 
 @router.get("/{username}", response_model=schemas.User)
@@ -30,6 +39,7 @@ def get_active_user_by_username(
 
 @router.get("/count/", response_model=int)
 def get_all_active_users_count(
+    count: deps.Count = Depends(),
     db: Session = Depends(deps.get_db),
 ):
-    return crud.user.get_all_active_users_count(db)
+    return count.report(crud.user.get_all_active_users_count(db, mode=count.mode))
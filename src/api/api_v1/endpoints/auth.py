@@ -1,35 +1,49 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from src import crud, models, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
 from src.core import security
 from src.core.config import settings
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.post("/signup", response_model=schemas.Token)
-def create_user(
+async def create_user(
     user: schemas.UserCreate,
     db: Session = Depends(deps.get_db)
 ):
 
-    if crud.user.get_user_by_username(db, username=user.username):
+    if await run_in_threadpool(crud.user.get_user_by_username, db, username=user.username):
         raise HTTPException(
             status_code=400,
             detail="Username already registered"
         )
 
-    crud.user.create(db=db, user=user)
+    try:
+        hashed_password = await security.hash_password(user.password)
+
+    except security.PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-ups, try again later",
+            headers={"Retry-After": "1"},
+        ) from e
+
+    db_user = await run_in_threadpool(
+        crud.user.create, db=db, user=user, hashed_password=hashed_password
+    )
 
     access_token_expires = timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
     access_token = security.create_access_token(
-        data={"sub": user.username},
+        data=security.get_token_claims(db_user),
         expires_delta=access_token_expires
     )
 
@@ -37,17 +51,26 @@ def create_user(
 
 
 @router.post("/signin", response_model=schemas.Token)
-def sign_in(
+async def sign_in(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(deps.get_db)
 ):
 
-    user = crud.user.authenticate(
-        db,
-        username=form_data.username,
-        password=form_data.password
+    user = await run_in_threadpool(
+        crud.user.get_user_by_username, db, username=form_data.username
     )
 
+    try:
+        if user and not await security.check_password(form_data.password, user.hashed_password):
+            user = None
+
+    except security.PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-ins, try again later",
+            headers={"Retry-After": "1"},
+        ) from e
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,7 +85,7 @@ def sign_in(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
     access_token = security.create_access_token(
-        data={"sub": user.username},
+        data=security.get_token_claims(user),
         expires_delta=access_token_expires
     )
 
@@ -1,25 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from src import crud, models, schemas
+from src import crud, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Comment])
 def get_all_comments(
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.comment.get_all_comments(db, skip=skip, limit=limit)
+    return page.paginate(crud.comment.get_all_comments(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.post("/", response_model=schemas.Comment)
 def create_comment(
     comment: schemas.CommentCreate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_active_post_by_id(db, id=comment.post_id)
@@ -33,7 +33,7 @@ def create_comment(
 @router.get("/{id}", response_model=schemas.Comment)
 def get_comment_by_id(
     id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_comment = crud.comment.get_comment_by_id(db, id=id)
@@ -48,24 +48,26 @@ def get_comment_by_id(
 def update_comment(
     id: int,
     comment_update: schemas.CommentUpdate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
-    db_comment = crud.comment.get_active_comment_by_id(db, id=id)
+    db_comment = crud.comment.update(
+        db, id=id, comment_update=comment_update, owner_id=current_user.id
+    )
 
-    if db_comment is None:
-        raise HTTPException(status_code=404, detail="Comment not found")
+    if db_comment is not None:
+        return db_comment
 
-    if db_comment.owner_id != current_user.id:
-        raise HTTPException(status_code=401, detail="Permission Denied")
+    if crud.comment.get_active_comment_by_id(db, id=id) is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
 
-    return crud.comment.update(db, id=id, comment_update=comment_update)
+    raise HTTPException(status_code=401, detail="Permission Denied")
 
 
 @router.delete("/{id}")
 def delete_comment(
     id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_comment = crud.comment.get_comment_by_id(db, id=id)
@@ -82,7 +84,7 @@ def delete_comment(
 @router.put("/activate/{id}", response_model=schemas.Comment)
 def activate_comment(
     id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db)
 ):
     db_comment = crud.comment.get_comment_by_id(db, id=id)
@@ -99,7 +101,7 @@ def activate_comment(
 @router.put("/deactivate/{id}", response_model=schemas.Comment)
 def deactivate_comment(
     id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db)
 ):
     db_comment = crud.comment.get_active_comment_by_id(db, id=id)
@@ -115,26 +117,26 @@ def deactivate_comment(
 
 @router.get("/count/", response_model=int)
 def get_all_comments_count(
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    count: deps.Count = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.comment.get_all_comments_count(db)
+    return count.report(crud.comment.get_all_comments_count(db, mode=count.mode))
 
 
 @router.get("/ids/", response_model=list[schemas.Id])
 def get_all_comments_ids(
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.comment.get_all_comments(db, skip=skip, limit=limit)
+    return page.paginate_ids(crud.comment.get_all_comments_ids(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/owner/count/{owner_id}", response_model=int)
 def get_comments_count_by_owner_id(
     owner_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_user_by_id(db, id=owner_id)
@@ -148,9 +150,8 @@ def get_comments_count_by_owner_id(
 @router.get("/owner/ids/{owner_id}", response_model=list[schemas.Id])
 def get_comments_ids_by_owner_id(
     owner_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_user_by_id(db, id=owner_id)
@@ -158,13 +159,13 @@ def get_comments_ids_by_owner_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.comment.get_comments_by_owner_id(db, owner_id=owner_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.comment.get_comments_ids_by_owner_id(db, owner_id=owner_id, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/post/count/{post_id}", response_model=int)
 def get_comments_count_by_post_id(
     post_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_post = crud.post.get_post_by_id(db, id=post_id)
@@ -178,9 +179,8 @@ def get_comments_count_by_post_id(
 @router.get("/post/ids/{post_id}", response_model=list[schemas.Id])
 def get_comments_ids_by_post_id(
     post_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_post_by_id(db, id=post_id)
@@ -188,4 +188,4 @@ def get_comments_ids_by_post_id(
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    return crud.comment.get_comments_by_post_id(db, post_id=post_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.comment.get_comments_ids_by_post_id(db, post_id=post_id, skip=page.skip, limit=page.limit, after=page.after))
@@ -1,25 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from src import crud, models, schemas
+from src import crud, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Follow])
 def get_all_follows(
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.follow.get_all_follows(db, skip=skip, limit=limit)
+    return page.paginate(crud.follow.get_all_follows(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/{id}", response_model=schemas.Follow)
 def get_follow_by_id(
     id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_follow = crud.follow.get_follow_by_id(db, id=id)
@@ -33,7 +33,7 @@ def get_follow_by_id(
 @router.get("/is-following/{following_id}", response_model=bool)
 def get_follow_by_follower_id_and_following_id(
     following_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_follow = crud.follow.get_follow_by_follower_id_and_following_id(
@@ -46,7 +46,7 @@ def get_follow_by_follower_id_and_following_id(
 @router.post("/{following_id}", response_model=schemas.Follow)
 def follow_user(
     following_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_active_user_by_id(db, id=following_id)
@@ -59,22 +59,22 @@ def follow_user(
             status_code=400, detail="You can't follow yourself"
         )
 
-    db_follow = crud.follow.get_follow_by_follower_id_and_following_id(
+    db_follow = crud.follow.follow(
         db, follower_id=current_user.id, following_id=following_id
     )
 
-    if db_follow:
+    if db_follow is None:
         raise HTTPException(
             status_code=400, detail="You already followed this user"
         )
 
-    return crud.follow.follow(db, follower_id=current_user.id, following_id=following_id)
+    return db_follow
 
 
 @router.delete("/{following_id}", response_model=schemas.Follow)
 def unfollow_user(
     following_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_active_user_by_id(db, id=following_id)
@@ -87,7 +87,7 @@ def unfollow_user(
             status_code=400, detail="You can't unfollow yourself"
         )
 
-    db_follow = crud.follow.get_follow_by_follower_id_and_following_id(
+    db_follow = crud.follow.unfollow(
         db, follower_id=current_user.id, following_id=following_id
     )
 
@@ -96,21 +96,22 @@ def unfollow_user(
             status_code=400, detail="You have not followed this user"
         )
 
-    return crud.follow.unfollow(db, follower_id=current_user.id, following_id=following_id)
+    return db_follow
 
 
 @router.get("/count/", response_model=int)
 def get_all_follows_count(
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    count: deps.Count = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.follow.get_all_follows_count(db)
+    return count.report(crud.follow.get_all_follows_count(db, mode=count.mode))
 
 
 @router.get("/follower/count/{user_id}", response_model=int)
 def get_follower_count_by_user_id(
     user_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_user_by_id(db, id=user_id)
@@ -124,9 +125,8 @@ def get_follower_count_by_user_id(
 @router.get("/follower/ids/{user_id}", response_model=list[schemas.Id])
 def get_follower_ids_by_user_id(
     user_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_user_by_id(db, id=user_id)
@@ -134,13 +134,13 @@ def get_follower_ids_by_user_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.follow.get_followers_by_user_id(db, user_id=user_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.follow.get_followers_ids_by_user_id(db, user_id=user_id, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/following/count/{user_id}", response_model=int)
 def get_following_count_by_user_id(
     user_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_user_by_id(db, id=user_id)
@@ -154,9 +154,8 @@ def get_following_count_by_user_id(
 @router.get("/following/ids/{user_id}", response_model=list[schemas.Id])
 def get_following_ids_by_user_id(
     user_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_user_by_id(db, id=user_id)
@@ -164,4 +163,4 @@ def get_following_ids_by_user_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.follow.get_followings_by_user_id(db, user_id=user_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.follow.get_followings_ids_by_user_id(db, user_id=user_id, skip=page.skip, limit=page.limit, after=page.after))
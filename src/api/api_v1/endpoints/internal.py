@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from src import crud, schemas
+from src.api import deps
+from src.api.routing import UnitOfWorkRoute
+from src.core import security
+from src.core.config import settings
+from src.database.pool import pool_metrics
+
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+
+@router.get("/counters", response_model=schemas.CounterBufferStats)
+def get_counter_buffer_stats(
+    current_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
+):
+    return {"mode": settings.LIKE_COUNTER_MODE, **crud.counter_buffer.get_stats()}
+
+
+@router.get("/caches", response_model=dict[str, schemas.CacheStats])
+def get_cache_stats(
+    current_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
+):
+    return {
+        "tokens": security.token_cache.get_stats(),
+        "users": crud.user.cache.get_stats(),
+        "row_counts": crud.row_count.cache.get_stats(),
+    }
+
+
+@router.get("/pool", response_model=schemas.PoolStats)
+def get_pool_stats(
+    current_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
+):
+    return pool_metrics.get_stats()
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from src import crud, schemas
+from src.api import deps
+from src.api.routing import UnitOfWorkRoute
+from src.core.worker import worker
+
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+
+@router.post("/reconcile", response_model=schemas.Job, status_code=202)
+def reconcile_counters(
+    current_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
+    db: Session = Depends(deps.get_db),
+):
+    db_job = crud.job.create(
+        db, kind="reconcile", target_id=None, owner_id=current_user.id
+    )
+    worker.submit(db.get_bind(), job_id=db_job.id)
+
+    return db_job
+
+
+@router.get("/{id}", response_model=schemas.Job)
+def get_job_by_id(
+    id: int,
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
+    db: Session = Depends(deps.get_db),
+):
+    db_job = crud.job.get_job_by_id(db, id=id)
+
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if current_user.is_superuser is False and current_user.id != db_job.owner_id:
+        raise HTTPException(status_code=401, detail="Permission Denied")
+
+    return db_job
@@ -1,25 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from src import crud, models, schemas
+from src import crud, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Like])
 def get_all_likes(
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.like.get_all_likes(db, skip=skip, limit=limit)
+    return page.paginate(crud.like.get_all_likes(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/{id}", response_model=schemas.Like)
 def get_like_by_id(
     id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_like = crud.like.get_like_by_id(db, id=id)
@@ -33,7 +33,7 @@ def get_like_by_id(
 @router.get("/is-post-liked/{post_id}", response_model=bool)
 def get_is_post_liked(
     post_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_like = crud.like.get_like_by_post_id_and_owner_id(
@@ -46,7 +46,7 @@ def get_is_post_liked(
 @router.get("/is-comment-liked/{comment_id}", response_model=bool)
 def get_is_comment_liked(
     comment_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_like = crud.like.get_like_by_comment_id_and_owner_id(
@@ -59,7 +59,7 @@ def get_is_comment_liked(
 @router.post("/post/{post_id}", response_model=schemas.Like)
 def like_post(
     post_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_active_post_by_id(db, id=post_id)
@@ -67,22 +67,22 @@ def like_post(
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    db_like = crud.like.get_like_by_post_id_and_owner_id(
+    db_like = crud.like.like_post(
         db, post_id=post_id, owner_id=current_user.id
     )
 
-    if db_like:
+    if db_like is None:
         raise HTTPException(
             status_code=400, detail="You already liked this post"
         )
 
-    return crud.like.like_post(db, post_id=post_id, owner_id=current_user.id)
+    return db_like
 
 
 @router.delete("/post/{post_id}", response_model=schemas.Like)
 def unlike_post(
     post_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_active_post_by_id(db, id=post_id)
@@ -90,7 +90,7 @@ def unlike_post(
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    db_like = crud.like.get_like_by_post_id_and_owner_id(
+    db_like = crud.like.unlike_post(
         db, post_id=post_id, owner_id=current_user.id
     )
 
@@ -99,13 +99,13 @@ def unlike_post(
             status_code=400, detail="You have not liked this post"
         )
 
-    return crud.like.unlike_post(db, post_id=post_id, owner_id=current_user.id)
+    return db_like
 
 
 @router.post("/comment/{comment_id}", response_model=schemas.Like)
 def like_comment(
     comment_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_comment = crud.comment.get_active_comment_by_id(db, id=comment_id)
@@ -113,22 +113,22 @@ def like_comment(
     if db_comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    db_like = crud.like.get_like_by_comment_id_and_owner_id(
+    db_like = crud.like.like_comment(
         db, comment_id=comment_id, owner_id=current_user.id
     )
 
-    if db_like:
+    if db_like is None:
         raise HTTPException(
             status_code=400, detail="You already liked this comment"
         )
 
-    return crud.like.like_comment(db, comment_id=comment_id, owner_id=current_user.id)
+    return db_like
 
 
 @router.delete("/comment/{comment_id}", response_model=schemas.Like)
 def unlike_comment(
     comment_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_comment = crud.comment.get_active_comment_by_id(db, id=comment_id)
@@ -136,7 +136,7 @@ def unlike_comment(
     if db_comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    db_like = crud.like.get_like_by_comment_id_and_owner_id(
+    db_like = crud.like.unlike_comment(
         db, comment_id=comment_id, owner_id=current_user.id
     )
 
@@ -145,21 +145,22 @@ def unlike_comment(
             status_code=400, detail="You have not liked this comment"
         )
 
-    return crud.like.unlike_comment(db, comment_id=comment_id, owner_id=current_user.id)
+    return db_like
 
 
 @router.get("/count/", response_model=int)
 def get_all_likes_count(
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    count: deps.Count = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.like.get_all_likes_count(db)
+    return count.report(crud.like.get_all_likes_count(db, mode=count.mode))
 
 
 @router.get("/owner/count/{owner_id}", response_model=int)
 def get_likes_count_by_owner_id(
     owner_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_user_by_id(db, id=owner_id)
@@ -173,9 +174,8 @@ def get_likes_count_by_owner_id(
 @router.get("/owner/ids/{owner_id}", response_model=list[schemas.Id])
 def get_likes_ids_by_owner_id(
     owner_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_user_by_id(db, id=owner_id)
@@ -183,13 +183,13 @@ def get_likes_ids_by_owner_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.like.get_likes_by_owner_id(db, owner_id=owner_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.like.get_likes_ids_by_owner_id(db, owner_id=owner_id, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/post/count/{post_id}", response_model=int)
 def get_likes_count_by_post_id(
     post_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_post = crud.post.get_post_by_id(db, id=post_id)
@@ -203,9 +203,8 @@ def get_likes_count_by_post_id(
 @router.get("/post/ids/{post_id}", response_model=list[schemas.Id])
 def get_likes_ids_by_post_id(
     post_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_post_by_id(db, id=post_id)
@@ -213,13 +212,13 @@ def get_likes_ids_by_post_id(
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    return crud.like.get_likes_by_post_id(db, post_id=post_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.like.get_likes_ids_by_post_id(db, post_id=post_id, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/comment/count/{comment_id}", response_model=int)
 def get_likes_count_by_comment_id(
     comment_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_comment = crud.comment.get_comment_by_id(db, id=comment_id)
@@ -233,9 +232,8 @@ def get_likes_count_by_comment_id(
 @router.get("/comment/ids/{comment_id}", response_model=list[schemas.Id])
 def get_likes_ids_by_comment_id(
     comment_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_comment = crud.comment.get_comment_by_id(db, id=comment_id)
@@ -243,4 +241,4 @@ def get_likes_ids_by_comment_id(
     if db_comment is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    return crud.like.get_likes_by_comment_id(db, comment_id=comment_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.like.get_likes_ids_by_comment_id(db, comment_id=comment_id, skip=page.skip, limit=page.limit, after=page.after))
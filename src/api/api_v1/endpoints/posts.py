@@ -1,25 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from src import crud, models, schemas
+from src import crud, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/all/", response_model=list[schemas.Post])
 def get_all_posts(
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.post.get_all_posts(db, skip=skip, limit=limit)
+    return page.paginate(crud.post.get_all_posts(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.post("/", response_model=schemas.Post)
 def create_post(
     post: schemas.PostCreate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     return crud.post.create(db, post=post, owner_id=current_user.id)
@@ -28,7 +28,7 @@ def create_post(
 @router.get("/{id}", response_model=schemas.Post)
 def get_post_by_id(
     id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_post_by_id(db, id=id)
@@ -43,24 +43,26 @@ def get_post_by_id(
 def update_post(
     id: int,
     post_update: schemas.PostUpdate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
-    db_post = crud.post.get_active_post_by_id(db, id=id)
+    db_post = crud.post.update(
+        db, id=id, post_update=post_update, owner_id=current_user.id
+    )
 
-    if db_post is None:
-        raise HTTPException(status_code=404, detail="Post not found")
+    if db_post is not None:
+        return db_post
 
-    if db_post.owner_id != current_user.id:
-        raise HTTPException(status_code=401, detail="Permission Denied")
+    if crud.post.get_active_post_by_id(db, id=id) is None:
+        raise HTTPException(status_code=404, detail="Post not found")
 
-    return crud.post.update(db, id=id, post_update=post_update)
+    raise HTTPException(status_code=401, detail="Permission Denied")
 
 
 @router.delete("/{id}")
 def delete_post(
     id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db),
 ):
     db_post = crud.post.get_post_by_id(db, id=id)
@@ -77,7 +79,7 @@ def delete_post(
 @router.put("/activate/{id}", response_model=schemas.Post)
 def activate_post(
     id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db)
 ):
     db_post = crud.post.get_post_by_id(db, id=id)
@@ -94,7 +96,7 @@ def activate_post(
 @router.put("/deactivate/{id}", response_model=schemas.Post)
 def deactivate_post(
     id: int,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db)
 ):
     db_post = crud.post.get_active_post_by_id(db, id=id)
@@ -110,26 +112,26 @@ def deactivate_post(
 
 @router.get("/count/", response_model=int)
 def get_all_posts_count(
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    count: deps.Count = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.post.get_all_posts_count(db)
+    return count.report(crud.post.get_all_posts_count(db, mode=count.mode))
 
 
 @router.get("/ids/", response_model=list[schemas.Id])
 def get_all_posts_ids(
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
-    return crud.post.get_all_posts(db, skip=skip, limit=limit)
+    return page.paginate_ids(crud.post.get_all_posts_ids(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/owner/count/{owner_id}", response_model=int)
 def get_posts_count_by_owner_id(
     owner_id: int,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_user_by_id(db, id=owner_id)
@@ -143,9 +145,8 @@ def get_posts_count_by_owner_id(
 @router.get("/owner/ids/{owner_id}", response_model=list[schemas.Id])
 def get_posts_ids_by_owner_id(
     owner_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_user_by_id(db, id=owner_id)
@@ -153,4 +154,4 @@ def get_posts_ids_by_owner_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return crud.post.get_posts_by_owner_id(db, owner_id=owner_id, skip=skip, limit=limit)
+    return page.paginate_ids(crud.post.get_posts_ids_by_owner_id(db, owner_id=owner_id, skip=page.skip, limit=page.limit, after=page.after))
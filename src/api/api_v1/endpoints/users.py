@@ -2,8 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src import crud, models, schemas
 from src.api import deps
+from src.api.routing import UnitOfWorkRoute
+from src.core.worker import worker
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/current-user/", response_model=schemas.User)
@@ -15,18 +17,17 @@ def get_current_user(
 
 @router.get("/all/", response_model=list[schemas.User])
 def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    page: deps.Page = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
-    return crud.user.get_all_users(db, skip=skip, limit=limit)
+    return page.paginate(crud.user.get_all_users(db, skip=page.skip, limit=page.limit, after=page.after))
 
 
 @router.get("/{username}", response_model=schemas.User)
 def get_user_by_username(
     username: str,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
     db_user = crud.user.get_user_by_username(db, username=username)
@@ -39,37 +40,37 @@ def get_user_by_username(
 
 @router.get("/count/", response_model=int)
 def get_all_users_count(
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    count: deps.Count = Depends(),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db),
 ):
-    return crud.user.get_all_users_count(db)
+    return count.report(crud.user.get_all_users_count(db, mode=count.mode))
 
 
 @router.put("/", response_model=schemas.User)
 def update_user(
     user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db)
 ):
-    db_user = crud.user.get_active_user_by_username(
-        db, username=current_user.username)
-
-    if db_user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-
     if current_user.username != user_update.username and crud.user.get_user_by_username(db, username=user_update.username):
         raise HTTPException(
             status_code=400,
             detail="Username already registered"
         )
 
-    return crud.user.update(db, username=current_user.username, user_update=user_update)
+    db_user = crud.user.update(db, username=current_user.username, user_update=user_update)
+
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return db_user
 
 
 @router.delete("/{username}")
 def delete_user(
     username: str,
-    super_user: models.User = Depends(deps.get_current_active_superuser),
+    super_user: schemas.TokenData = Depends(deps.get_current_active_superuser),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_user_by_username(db, username=username)
@@ -83,7 +84,7 @@ def delete_user(
 @router.put("/activate/{username}", response_model=schemas.User)
 def activate_user(
     username: str,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_user_by_username(db, username=username)
@@ -94,13 +95,37 @@ def activate_user(
     if current_user.is_superuser is False and current_user.username != username:
         raise HTTPException(status_code=401, detail="Not Authenticated")
 
+    crud.job.cancel_jobs_by_target_id(db, target_id=db_user.id)
     return crud.user.activate(db, username=username)
 
 
+@router.put("/activate/{username}/job", response_model=schemas.Job, status_code=202)
+def activate_user_in_background(
+    username: str,
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
+    db: Session = Depends(deps.get_db)
+):
+    db_user = crud.user.get_user_by_username(db, username=username)
+
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if current_user.is_superuser is False and current_user.username != username:
+        raise HTTPException(status_code=401, detail="Not Authenticated")
+
+    db_user = crud.user.activate(db, username=username, cascade=False)
+    db_job = crud.job.create(
+        db, kind="activate_user", target_id=db_user.id, owner_id=current_user.id
+    )
+    worker.submit(db.get_bind(), job_id=db_job.id)
+
+    return db_job
+
+
 @router.put("/deactivate/{username}", response_model=schemas.User)
 def deactivate_user(
     username: str,
-    current_user: models.User = Depends(deps.get_current_user),
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
     db: Session = Depends(deps.get_db)
 ):
     db_user = crud.user.get_active_user_by_username(db, username=username)
@@ -111,4 +136,28 @@ def deactivate_user(
     if current_user.is_superuser is False and current_user.username != username:
         raise HTTPException(status_code=401, detail="Not Authenticated")
 
+    crud.job.cancel_jobs_by_target_id(db, target_id=db_user.id)
     return crud.user.deactivate(db, username=username)
+
+
+@router.put("/deactivate/{username}/job", response_model=schemas.Job, status_code=202)
+def deactivate_user_in_background(
+    username: str,
+    current_user: schemas.TokenData = Depends(deps.get_current_identity),
+    db: Session = Depends(deps.get_db)
+):
+    db_user = crud.user.get_active_user_by_username(db, username=username)
+
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if current_user.is_superuser is False and current_user.username != username:
+        raise HTTPException(status_code=401, detail="Not Authenticated")
+
+    db_user = crud.user.deactivate(db, username=username, cascade=False)
+    db_job = crud.job.create(
+        db, kind="deactivate_user", target_id=db_user.id, owner_id=current_user.id
+    )
+    worker.submit(db.get_bind(), job_id=db_job.id)
+
+    return db_job
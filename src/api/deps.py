@@ -1,63 +1,246 @@
-from typing import Generator
+import math
+from contextlib import contextmanager
+from typing import AsyncGenerator, Callable, Generator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import contextmanager_in_threadpool, run_in_threadpool
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src import crud, models, schemas
-from src.core import security
+from src.core import rate_limit, security
 from src.core.config import settings
-from src.database.session import SessionLocal
+from src.core.cursor import decode_cursor, decode_ranked_cursor, encode_cursor
+from src.database.routing import read_your_writes
+from src.database.session import AsyncSessionLocal, SessionLocal
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/signin"
 )
 
 
-def get_db() -> Generator:
+def get_client(request: Request) -> str:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = security.decode_access_token(token)
+            return f"user:{payload.get('uid') or payload.get('sub')}"
+        except JWTError:
+            pass
+
+    return f"ip:{request.client.host if request.client else None}"
+
+
+def use_replica(request: Request, client: str) -> bool:
+    return request.method in {"GET", "HEAD"} and not read_your_writes.is_recent(client)
+
+
+def get_db(request: Request) -> Generator:
+    client = get_client(request)
+
     try:
         db = SessionLocal()
+        db.info["use_replica"] = use_replica(request, client)
+        db.info["unit_of_work"] = settings.DATABASE_TRANSACTION_PER_REQUEST
+        request.state.db = db
         yield db
 
     finally:
+        if db.info.get("wrote"):
+            read_your_writes.mark(client)
+
         db.close()
 
 
-async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> models.User:
-    credentials_exception = HTTPException(
+class Database():
+    def __init__(self, session: Session | AsyncSession):
+        self.session = session
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+
+async def get_database(request: Request) -> AsyncGenerator[Database, None]:
+    if AsyncSessionLocal is None:
+        async with contextmanager_in_threadpool(contextmanager(get_db)(request)) as db:
+            yield Database(db)
+        return
+
+    client = get_client(request)
+
+    async with AsyncSessionLocal() as async_db:
+        async_db.sync_session.info["use_replica"] = use_replica(request, client)
+
+        try:
+            yield Database(async_db)
+
+        finally:
+            if async_db.sync_session.info.get("wrote"):
+                read_your_writes.mark(client)
+
+
+class Page():
+    def __init__(self, response: Response, skip: int = 0, limit: int = 100, cursor: str | None = None):
+        self.response = response
+        self.skip = skip
+        self.limit = limit
+        self.after = None
+
+        if cursor is not None:
+            try:
+                self.after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def paginate(self, items: list) -> list:
+        if items and len(items) == self.limit:
+            self.response.headers["X-Next-Cursor"] = encode_cursor(items[-1].id)
+
+        return items
+
+    def paginate_ids(self, ids: list[int]) -> JSONResponse:
+        response = JSONResponse([{"id": id} for id in ids])
+
+        if ids and len(ids) == self.limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(ids[-1])
+
+        return response
+
+
+class SearchPage():
+    def __init__(self, response: Response, q: str = Query(min_length=1), limit: int = 100, cursor: str | None = None):
+        self.response = response
+        self.q = q
+        self.limit = limit
+        self.after = None
+
+        if cursor is not None:
+            try:
+                self.after = decode_ranked_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def paginate(self, results: list[tuple]) -> list:
+        if results and len(results) == self.limit:
+            item, rank = results[-1]
+            self.response.headers["X-Next-Cursor"] = encode_cursor(item.id, rank=rank)
+
+        return [item for item, rank in results]
+
+
+class Count():
+    def __init__(self, response: Response, mode: schemas.CountMode = schemas.CountMode.exact):
+        self.response = response
+        self.mode = mode.value
+
+    def report(self, count: int) -> int:
+        self.response.headers["X-Count-Mode"] = self.mode
+        return count
+
+
+class RateLimit():
+    def __init__(self, name: str, per_minute: int, burst: int | None = None, methods: set[str] | None = None):
+        self.name = name
+        self.rate = per_minute / 60
+        self.burst = burst or per_minute
+        self.methods = methods or {"POST", "PUT", "PATCH", "DELETE"}
+
+    async def __call__(self, request: Request):
+        if not settings.RATE_LIMIT_ENABLED or request.method not in self.methods:
+            return
+
+        key = f"{self.name}:{get_client(request)}"
+        backend = rate_limit.backend
+
+        if backend.is_blocking:
+            retry_after = await run_in_threadpool(backend.take, key, self.rate, self.burst)
+        else:
+            retry_after = backend.take(key, self.rate, self.burst)
+
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+def get_credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+async def get_token_data(token: str = Depends(oauth2_scheme)) -> schemas.TokenData:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
+        payload = security.decode_access_token(token)
 
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise get_credentials_exception()
 
-        token_data = schemas.TokenData(username=username)
+        return schemas.TokenData(
+            username=username,
+            id=payload.get("uid"),
+            is_superuser=payload.get("su", False),
+            version=payload.get("ver"),
+        )
 
     except JWTError as e:
-        raise credentials_exception from e
+        raise get_credentials_exception() from e
+
 
-    user = crud.user.get_user_by_username(db, username=token_data.username)
+def get_current_user(db: Session = Depends(get_db), token_data: schemas.TokenData = Depends(get_token_data)) -> models.User:
+    with db.primary():
+        user = crud.user.get_cached_user_by_username(db, username=token_data.username)
 
     if user is None:
-        raise credentials_exception
+        raise get_credentials_exception()
 
+    if token_data.id is not None and token_data.id != user.id:
+        raise get_credentials_exception()
+
+    if token_data.version is not None and token_data.version != user.token_version:
+        raise get_credentials_exception()
+
+    crud.token_version.set(user.id, user.token_version)
     return user
 
 
+def get_current_identity(db: Session = Depends(get_db), token_data: schemas.TokenData = Depends(get_token_data)) -> schemas.TokenData:
+    if token_data.id is not None and token_data.version is not None:
+        is_current = crud.token_version.is_current(token_data.id, token_data.version)
+
+        if is_current:
+            return token_data
+
+        if is_current is False:
+            raise get_credentials_exception()
+
+    user = get_current_user(db, token_data=token_data)
+
+    return schemas.TokenData(
+        username=user.username,
+        id=user.id,
+        is_superuser=user.is_superuser,
+        version=user.token_version,
+    )
+
+
 # async def get_current_active_user(current_user: models.User = Depends(get_current_user)):
 #     # if current_user.disabled:
 #     #     raise HTTPException(status_code=400, detail="Inactive user")
 #     return current_user
 
-async def get_current_active_superuser(current_user: models.User = Depends(get_current_user)) -> models.User:
+async def get_current_active_superuser(current_user: schemas.TokenData = Depends(get_current_identity)) -> schemas.TokenData:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=401, detail="The user doesn't have enough privileges"
@@ -0,0 +1,23 @@
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+
+class UnitOfWorkRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+
+            db = getattr(request.state, "db", None)
+            if db is not None and db.info.get("unit_of_work"):
+                # yield dependencies exit after the response is sent, so the
+                # request's single commit has to happen here
+                await run_in_threadpool(db.commit)
+
+            return response
+
+        return route_handler
@@ -0,0 +1,25 @@
+from typing import Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+
+def stream_ids(ids: Iterable[int], batch_size: int) -> StreamingResponse:
+    def generate() -> Iterator[str]:
+        yield "["
+
+        separator = ""
+        batch = []
+        for id in ids:
+            batch.append(f'{{"id":{id}}}')
+
+            if len(batch) == batch_size:
+                yield separator + ",".join(batch)
+                separator = ","
+                batch = []
+
+        if batch:
+            yield separator + ",".join(batch)
+
+        yield "]"
+
+    return StreamingResponse(generate(), media_type="application/json")
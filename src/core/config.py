@@ -7,6 +7,16 @@ class Settings(BaseSettings):
     PROJECT_NAME: str
     DATABASE_URL: str
     TEST_DATABASE_URL: str
+    DATABASE_ASYNC_ACTIVE_POSTS: bool = False
+    DATABASE_POOL_MODE: str = "queue"
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DATABASE_TRANSACTION_PER_REQUEST: bool = False
     CORS_ORIGINS: list = []
 
     API_V1_STR: str = "/api/v1"
@@ -20,6 +30,41 @@ class Settings(BaseSettings):
     NORMAL_USERNAME: str
     NORMAL_PASSWORD: str
 
+    JOBS_CHUNK_SIZE: int = 1000
+    JOBS_LEASE_SECONDS: int = 60
+
+    RECONCILE_CHUNK_SIZE: int = 1000
+    RECONCILE_THROTTLE_MS: int = 100
+
+    LIKE_COUNTER_MODE: str = "delta"
+    LIKE_COUNTER_SHARDS: int = 16
+    LIKE_COUNTER_FOLD_SECONDS: float = 1.0
+    LIKE_BUFFER_FLUSH_MS: int = 500
+    LIKE_BUFFER_MAX_EVENTS: int = 1000
+
+    COUNT_CACHE_TTL_SECONDS: int = 30
+    COUNT_SAMPLE_SIZE: int = 10000
+
+    OWNER_LOADING: str = "selectin"
+
+    IDS_STREAM_BATCH_SIZE: int = 1000
+
+    USER_AUTOCOMPLETE_ENABLED: bool = False
+
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAXSIZE: int = 10000
+    TOKEN_VERSION_REFRESH_SECONDS: float = 30.0
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASHING_WORKERS: int = 2
+    PASSWORD_HASHING_QUEUE_SIZE: int = 16
+
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_AUTH_PER_MINUTE: int = 10
+    RATE_LIMIT_WRITE_PER_MINUTE: int = 60
+    RATE_LIMIT_PRUNE_SECONDS: float = 60.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,38 @@
+import base64
+import json
+
+
+def encode_cursor(id: int, rank: float | None = None) -> str:
+    payload = {"id": id} if rank is None else {"rank": rank, "id": id}
+    payload = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_payload(cursor: str) -> dict:
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        id = payload["id"]
+
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(id, int) or isinstance(id, bool):
+        raise ValueError("Invalid cursor")
+
+    return payload
+
+
+def decode_cursor(cursor: str) -> int:
+    return decode_payload(cursor)["id"]
+
+
+def decode_ranked_cursor(cursor: str) -> tuple[float, int]:
+    payload = decode_payload(cursor)
+    rank = payload.get("rank")
+
+    if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+        raise ValueError("Invalid cursor")
+
+    return rank, payload["id"]
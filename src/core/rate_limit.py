@@ -0,0 +1,103 @@
+import threading
+import time
+
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src import models
+from src.core.config import settings
+from src.database.session import engine
+
+
+class MemoryBackend():
+    is_blocking = False
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.buckets: dict[str, tuple[float, float]] = {}
+        self.lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+
+        with self.lock:
+            tokens, updated_at = self.buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+
+            else:
+                retry_after = (1 - tokens) / rate
+
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.maxsize:
+                del self.buckets[next(iter(self.buckets))]
+
+        return retry_after
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class DatabaseBackend():
+    is_blocking = True
+
+    def __init__(self, bind: Engine):
+        self.bind = bind
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        table = models.RateLimitBucket.__table__
+        insert = {
+            "postgresql": postgresql.insert,
+            "sqlite": sqlite.insert,
+        }[self.bind.dialect.name]
+
+        now = time.time()
+        refilled = table.c.tokens + (now - table.c.updated_at) * rate
+        tokens = case((refilled > burst, burst), else_=refilled)
+
+        with self.bind.begin() as connection:
+            taken = connection.execute(
+                insert(table)
+                .values(key=key, tokens=burst - 1, updated_at=now, full_at=now + 1 / rate)
+                .on_conflict_do_update(
+                    index_elements=[table.c.key],
+                    set_={
+                        "tokens": tokens - 1,
+                        "updated_at": now,
+                        "full_at": now + (burst - tokens + 1) / rate,
+                    },
+                    where=tokens >= 1,
+                )
+                .returning(table.c.tokens)
+            ).first()
+
+            if taken is not None:
+                return 0.0
+
+            left = connection.execute(
+                select(tokens).where(table.c.key == key)
+            ).scalar_one()
+
+        return max(1 - left, 0) / rate or 1 / rate
+
+    def prune(self, db: Session) -> int:
+        table = models.RateLimitBucket.__table__
+
+        return db.execute(
+            delete(table).where(table.c.full_at <= time.time())
+        ).rowcount
+
+
+def get_backend(name: str):
+    if name == "database":
+        return DatabaseBackend(bind=engine)
+
+    return MemoryBackend()
+
+
+backend = get_backend(settings.RATE_LIMIT_BACKEND)
@@ -1,13 +1,59 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Callable
 
-from jose import jwt
+from jose import ExpiredSignatureError, jwt
 from passlib.context import CryptContext
+from src import models
+from src.core.cache import TTLCache
 from src.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 ALGORITHM = "HS256"
 
+token_cache = TTLCache(
+    ttl=settings.AUTH_CACHE_TTL_SECONDS, maxsize=settings.AUTH_CACHE_MAXSIZE
+)
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher():
+    def __init__(self, workers: int, queue_size: int):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+
+        try:
+            future = self.executor.submit(fn, *args)
+        except Exception:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(lambda future: self.slots.release())
+        return future
+
+    async def run(self, fn: Callable, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASHING_WORKERS,
+    queue_size=settings.PASSWORD_HASHING_QUEUE_SIZE,
+)
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -17,6 +63,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password(password: str) -> str:
+    return await password_hasher.run(pwd_context.hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+
+def get_token_claims(user: models.User) -> dict:
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "su": bool(user.is_superuser),
+        "ver": user.token_version,
+    }
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
 
@@ -34,3 +97,17 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
         settings.SECRET_KEY,
         algorithm=ALGORITHM
     )
+
+
+def decode_access_token(token: str) -> dict:
+    payload = token_cache.get(token)
+
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.set(token, payload)
+
+    elif payload.get("exp", float("inf")) <= datetime.now(timezone.utc).timestamp():
+        token_cache.delete(token)
+        raise ExpiredSignatureError("Signature has expired.")
+
+    return payload
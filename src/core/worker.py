@@ -0,0 +1,146 @@
+import logging
+import queue
+import threading
+from typing import Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src import crud
+from src.core import rate_limit
+from src.core.config import settings
+from src.crud.counter_buffer import counter_buffer
+from src.crud.utils import utils
+
+logger = logging.getLogger(__name__)
+
+
+class Worker():
+    def __init__(self):
+        self.queue: queue.Queue = queue.Queue()
+        self.stopping = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+
+            self.stopping.clear()
+            self.thread = threading.Thread(
+                target=self.run, name="job-worker", daemon=True
+            )
+            self.thread.start()
+
+    def stop(self, timeout: float | None = None):
+        if self.thread is None or not self.thread.is_alive():
+            return
+
+        self.stopping.set()
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def submit(self, bind: Engine, job_id: int):
+        self.queue.put((bind, job_id))
+        self.start()
+
+    def resume(self, bind: Engine):
+        with Session(bind=bind, autoflush=False) as db:
+            job_ids = crud.job.get_resumable_job_ids(
+                db, lease_seconds=settings.JOBS_LEASE_SECONDS
+            )
+
+        for job_id in job_ids:
+            self.submit(bind, job_id)
+
+    def run(self):
+        while not self.stopping.is_set():
+            item = self.queue.get()
+            if item is None:
+                return
+
+            bind, job_id = item
+            try:
+                self.run_job(bind, job_id)
+            except Exception:
+                logger.exception("job %s crashed", job_id)
+
+    def run_job(self, bind: Engine, job_id: int):
+        with Session(bind=bind, autoflush=False) as db:
+            db_job = crud.job.claim(
+                db, id=job_id, lease_seconds=settings.JOBS_LEASE_SECONDS
+            )
+            if db_job is None:
+                return
+
+            try:
+                throttle = crud.job.get_throttle_seconds(db_job.kind)
+
+                while crud.job.run_chunk(db, db_job):
+                    if self.stopping.wait(throttle):
+                        crud.job.release(db, db_job)
+                        return
+
+            except Exception as e:
+                db.rollback()
+                crud.job.fail(db, db_job, error=str(e))
+                raise
+
+
+class Ticker():
+    def __init__(self, name: str, callback: Callable[[Session], object]):
+        self.name = name
+        self.callback = callback
+        self.stopping = threading.Event()
+        self.waking = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+
+    def start(self, bind: Engine, interval: float):
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+
+            self.bind = bind
+            self.stopping.clear()
+            self.thread = threading.Thread(
+                target=self.run, args=(interval,), name=self.name, daemon=True
+            )
+            self.thread.start()
+
+    def stop(self, timeout: float | None = None):
+        if self.thread is None or not self.thread.is_alive():
+            return
+
+        self.stopping.set()
+        self.waking.set()
+        self.thread.join(timeout)
+        self.tick()
+
+    def wake(self):
+        self.waking.set()
+
+    def run(self, interval: float):
+        while True:
+            self.waking.wait(interval)
+            self.waking.clear()
+            if self.stopping.is_set():
+                return
+
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("%s tick crashed", self.name)
+
+    def tick(self):
+        with Session(bind=self.bind, autoflush=False) as db:
+            self.callback(db)
+            db.commit()
+
+
+worker = Worker()
+like_shard_folder = Ticker("like-shard-folder", utils.fold_post_like_shards)
+like_buffer_flusher = Ticker("like-buffer-flusher", counter_buffer.flush)
+token_version_refresher = Ticker("token-version-refresher", crud.token_version.load)
+rate_limit_pruner = Ticker("rate-limit-pruner", lambda db: rate_limit.backend.prune(db))
+counter_buffer.on_full = like_buffer_flusher.wake
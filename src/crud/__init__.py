@@ -1,5 +1,12 @@
+from .autocomplete import autocomplete
 from .comment import comment
+from .counter_buffer import counter_buffer
 from .follow import follow
+from .job import job
 from .like import like
 from .post import post
+from .reconcile import reconcile
+from .row_count import row_count
+from .search import search
+from .token_version import token_version
 from .user import user
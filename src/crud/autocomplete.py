@@ -0,0 +1,100 @@
+import threading
+from bisect import bisect_left, insort
+
+from sqlalchemy.orm import Session
+from src import models
+
+
+class Autocomplete():
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys: list[tuple[str, int]] = []
+        self.users: dict[int, dict] = {}
+        self.is_loaded = False
+
+    def get_keys(self, user: dict) -> set[str]:
+        return {
+            user["username"].lower(),
+            *(word.lower() for word in (user["name"] or "").split()),
+        }
+
+    def load(self, db: Session, batch_size: int = 10000):
+        users = {
+            id: {"id": id, "username": username, "name": name, "is_superuser": is_superuser}
+            for id, username, name, is_superuser in (
+                db.query(models.User.id, models.User.username, models.User.name, models.User.is_superuser)
+                .filter(models.User.is_active == True)
+                .yield_per(batch_size)
+            )
+        }
+        keys = sorted(
+            (key, id) for id, user in users.items() for key in self.get_keys(user)
+        )
+
+        with self.lock:
+            self.users = users
+            self.keys = keys
+            self.is_loaded = True
+
+    def clear(self):
+        with self.lock:
+            self.users = {}
+            self.keys = []
+            self.is_loaded = False
+
+    def update(self, db_user: models.User):
+        if not self.is_loaded:
+            return
+
+        user = {
+            "id": db_user.id,
+            "username": db_user.username,
+            "name": db_user.name,
+            "is_superuser": bool(db_user.is_superuser),
+        }
+
+        with self.lock:
+            self.discard(db_user.id)
+
+            if db_user.is_active:
+                self.users[db_user.id] = user
+                for key in self.get_keys(user):
+                    insort(self.keys, (key, db_user.id))
+
+    def remove(self, id: int):
+        if not self.is_loaded:
+            return
+
+        with self.lock:
+            self.discard(id)
+
+    def discard(self, id: int):
+        user = self.users.pop(id, None)
+        if user is None:
+            return
+
+        for key in self.get_keys(user):
+            index = bisect_left(self.keys, (key, id))
+            if index < len(self.keys) and self.keys[index] == (key, id):
+                del self.keys[index]
+
+    def search(self, q: str, limit: int = 10) -> list[dict]:
+        prefix = q.lower()
+        ids = []
+
+        with self.lock:
+            index = bisect_left(self.keys, (prefix,))
+
+            while len(ids) < limit and index < len(self.keys):
+                key, id = self.keys[index]
+                if not key.startswith(prefix):
+                    break
+
+                if id not in ids:
+                    ids.append(id)
+                index += 1
+
+            return [self.users[id] for id in ids]
+
+
+autocomplete = Autocomplete()
@@ -1,6 +1,11 @@
+from typing import Iterator
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from src import models, schemas
+from src.crud.row_count import row_count
+from src.crud.search import search
 from src.crud.utils import utils
 
 
@@ -11,66 +16,67 @@ class Comment():
             owner_id=owner_id,
         )
         db.add(db_comment)
-        db.commit()
-
-        utils.update_post_comments_count(db, post_id=comment.post_id)
-        db.commit()
-
-        db.refresh(db_comment)
+        utils.adjust_post_comments_count(db, post_id=comment.post_id, delta=1)
+        utils.commit(db)
         return db_comment
 
-    def update(self, db: Session, id: int, comment_update: schemas.CommentUpdate) -> models.Comment:
-        db_comment = self.get_comment_by_id(db, id=id)
-
+    def update(self, db: Session, id: int, comment_update: schemas.CommentUpdate, owner_id: int) -> models.Comment | None:
         update_data = comment_update.dict(exclude_unset=True)
         update_data["is_modified"] = True
         update_data["modified_at"] = func.now()
 
-        for field, value in update_data.items():
-            setattr(db_comment, field, value)
+        db_comment = db.scalar(
+            update(models.Comment)
+            .where(models.Comment.id == id, models.Comment.owner_id == owner_id)
+            .where(models.Comment.is_active == True, models.Comment.is_owner_active == True)
+            .values(update_data)
+            .returning(models.Comment)
+        )
 
-        db.commit()
-        db.refresh(db_comment)
+        utils.commit(db)
         return db_comment
 
     def delete(self, db: Session, id: int):
         db_comment = self.get_comment_by_id(db, id=id)
+        is_counted = utils.is_comment_counted(db_comment)
         db.delete(db_comment)
-        db.commit()
+        db.flush()
 
         utils.delete_likes_by_comment_id(db, comment_id=id)
-        utils.update_post_comments_count(
-            db, post_id=getattr(db_comment, "post_id")
-        )
-        db.commit()
+        if is_counted:
+            utils.adjust_post_comments_count(
+                db, post_id=getattr(db_comment, "post_id"), delta=-1
+            )
+        utils.commit(db)
 
     def activate(self, db: Session, id: int) -> models.Comment:
         db_comment = self.get_comment_by_id(db, id=id)
+        was_counted = utils.is_comment_counted(db_comment)
         setattr(db_comment, "is_active", True)
-        db.commit()
+        db.flush()
 
         utils.activate_likes_by_comment_id(db, comment_id=id)
         utils.update_comment_likes_count(db, comment_id=id)
-        utils.update_post_comments_count(
-            db, post_id=getattr(db_comment, "post_id")
-        )
-        db.commit()
-
-        db.refresh(db_comment)
+        delta = int(utils.is_comment_counted(db_comment)) - int(was_counted)
+        if delta:
+            utils.adjust_post_comments_count(
+                db, post_id=getattr(db_comment, "post_id"), delta=delta
+            )
+        utils.commit(db)
         return db_comment
 
     def deactivate(self, db: Session, id: int) -> models.Comment:
         db_comment = self.get_comment_by_id(db, id=id)
+        was_counted = utils.is_comment_counted(db_comment)
         setattr(db_comment, "is_active", False)
-        db.commit()
+        db.flush()
 
         utils.deactivate_likes_by_comment_id(db, comment_id=id)
-        utils.update_post_comments_count(
-            db, post_id=getattr(db_comment, "post_id")
-        )
-        db.commit()
-
-        db.refresh(db_comment)
+        if was_counted:
+            utils.adjust_post_comments_count(
+                db, post_id=getattr(db_comment, "post_id"), delta=-1
+            )
+        utils.commit(db)
         return db_comment
 
     def get_comment_by_id(self, db: Session, id: int) -> models.Comment | None:
@@ -80,21 +86,34 @@ class Comment():
             .first()
         )
 
-    def get_all_comments_count(self, db: Session) -> int:
-        return (
-            db.query(models.Comment)
-            .count()
-        )
+    def get_all_comments_count(self, db: Session, mode: str = "exact") -> int:
+        query = db.query(models.Comment)
+
+        return row_count.get(db, query, mode=mode)
 
-    def get_all_comments(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Comment]:
+    def get_all_comments(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Comment]:
         return (
             db.query(models.Comment)
+            .options(*utils.get_owner_loaders(models.Comment.owner))
+            .filter(*utils.id_range(models.Comment.id, after, None))
             .order_by(models.Comment.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_all_comments_ids(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Comment.id)
+                .filter(*utils.id_range(models.Comment.id, after, None))
+                .order_by(models.Comment.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_comments_count_by_owner_id(self, db: Session, owner_id: int) -> int:
         return (
             db.query(models.Comment)
@@ -102,16 +121,31 @@ class Comment():
             .count()
         )
 
-    def get_comments_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> list[models.Comment]:
+    def get_comments_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Comment]:
         return (
             db.query(models.Comment)
+            .options(*utils.get_owner_loaders(models.Comment.owner))
             .filter(models.Comment.owner_id == owner_id)
+            .filter(*utils.id_range(models.Comment.id, after, None))
             .order_by(models.Comment.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_comments_ids_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Comment.id)
+                .filter(models.Comment.owner_id == owner_id)
+                .filter(*utils.id_range(models.Comment.id, after, None))
+                .order_by(models.Comment.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_comments_count_by_post_id(self, db: Session, post_id: int) -> int:
         return (
             db.query(models.Comment)
@@ -119,16 +153,31 @@ class Comment():
             .count()
         )
 
-    def get_comments_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100) -> list[models.Comment]:
+    def get_comments_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Comment]:
         return (
             db.query(models.Comment)
+            .options(*utils.get_owner_loaders(models.Comment.owner))
             .filter(models.Comment.post_id == post_id)
+            .filter(*utils.id_range(models.Comment.id, after, None))
             .order_by(models.Comment.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_comments_ids_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Comment.id)
+                .filter(models.Comment.post_id == post_id)
+                .filter(*utils.id_range(models.Comment.id, after, None))
+                .order_by(models.Comment.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_active_comment_by_id(self, db: Session, id: int) -> models.Comment | None:
         return (
             db.query(models.Comment)
@@ -137,23 +186,48 @@ class Comment():
             .first()
         )
 
-    def get_all_active_comments_count(self, db: Session) -> int:
-        return (
+    def get_all_active_comments_count(self, db: Session, mode: str = "exact") -> int:
+        query = (
             db.query(models.Comment)
             .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
-            .count()
         )
 
-    def get_all_active_comments(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Comment]:
+        return row_count.get(db, query, mode=mode)
+
+    def get_all_active_comments(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Comment]:
         return (
             db.query(models.Comment)
+            .options(*utils.get_owner_loaders(models.Comment.owner))
             .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
+            .filter(*utils.id_range(models.Comment.id, after, None))
             .order_by(models.Comment.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def search_active_comments(self, db: Session, q: str, limit: int = 100, after: tuple[float, int] | None = None) -> list[tuple[models.Comment, float]]:
+        query = (
+            db.query(models.Comment)
+            .options(*utils.get_owner_loaders(models.Comment.owner))
+            .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
+        )
+
+        return search.get_ranked(db, query, q=q, limit=limit, after=after)
+
+    def get_all_active_comments_ids(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Comment.id)
+                .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
+                .filter(*utils.id_range(models.Comment.id, after, None))
+                .order_by(models.Comment.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_active_comments_count_by_owner_id(self, db: Session, owner_id: int) -> int:
         return (
             db.query(models.Comment)
@@ -162,17 +236,33 @@ class Comment():
             .count()
         )
 
-    def get_active_comments_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> list[models.Comment]:
+    def get_active_comments_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Comment]:
         return (
             db.query(models.Comment)
+            .options(*utils.get_owner_loaders(models.Comment.owner))
             .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
             .filter(models.Comment.owner_id == owner_id)
+            .filter(*utils.id_range(models.Comment.id, after, None))
             .order_by(models.Comment.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_comments_ids_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Comment.id)
+                .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
+                .filter(models.Comment.owner_id == owner_id)
+                .filter(*utils.id_range(models.Comment.id, after, None))
+                .order_by(models.Comment.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_active_comments_count_by_post_id(self, db: Session, post_id: int) -> int:
         return (
             db.query(models.Comment)
@@ -181,16 +271,42 @@ class Comment():
             .count()
         )
 
-    def get_active_comments_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100) -> list[models.Comment]:
+    def get_active_comments_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Comment]:
         return (
             db.query(models.Comment)
+            .options(*utils.get_owner_loaders(models.Comment.owner))
             .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
             .filter(models.Comment.post_id == post_id)
+            .filter(*utils.id_range(models.Comment.id, after, None))
             .order_by(models.Comment.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_comments_ids_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Comment.id)
+                .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
+                .filter(models.Comment.post_id == post_id)
+                .filter(*utils.id_range(models.Comment.id, after, None))
+                .order_by(models.Comment.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
+    def iter_active_comments_ids_by_post_id(self, db: Session, post_id: int, batch_size: int = 1000) -> Iterator[int]:
+        for id, in (
+            db.query(models.Comment.id)
+            .filter(models.Comment.is_active == True, models.Comment.is_owner_active == True)
+            .filter(models.Comment.post_id == post_id)
+            .order_by(models.Comment.id)
+            .yield_per(batch_size)
+        ):
+            yield id
+
 
 comment = Comment()
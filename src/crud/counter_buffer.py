@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from src import models
+
+
+class CounterBuffer():
+    def __init__(self):
+        self.columns = {
+            "posts.likes": models.Post.likes,
+            "comments.likes": models.Comment.likes,
+        }
+        self.lock = threading.Lock()
+        self.deltas: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.events = 0
+        self.oldest_at: float | None = None
+        self.flushed_at: float | None = None
+        self.flushes = 0
+        self.on_full = None
+
+    def add(self, name: str, id: int, delta: int, max_events: int):
+        with self.lock:
+            self.deltas[name][id] += delta
+            self.events += 1
+            if self.oldest_at is None:
+                self.oldest_at = time.monotonic()
+
+            full = self.events >= max_events
+
+        if full and self.on_full is not None:
+            self.on_full()
+
+    def get_pending(self, name: str) -> dict[int, int]:
+        with self.lock:
+            return dict(self.deltas.get(name, {}))
+
+    def take(self) -> tuple[dict[str, dict[int, int]], float | None]:
+        with self.lock:
+            deltas, oldest_at = self.deltas, self.oldest_at
+            self.deltas = defaultdict(lambda: defaultdict(int))
+            self.events = 0
+            self.oldest_at = None
+
+        return deltas, oldest_at
+
+    def discard(self, name: str, ids: list[int]) -> dict[int, int]:
+        with self.lock:
+            pending = self.deltas.get(name, {})
+            discarded = {id: pending.pop(id) for id in ids if id in pending}
+
+            if not any(delta for pending in self.deltas.values() for delta in pending.values()):
+                self.deltas = defaultdict(lambda: defaultdict(int))
+                self.events = 0
+                self.oldest_at = None
+
+        return discarded
+
+    def restore(self, deltas: dict[str, dict[int, int]], oldest_at: float | None):
+        with self.lock:
+            for name, ids in deltas.items():
+                for id, delta in ids.items():
+                    self.deltas[name][id] += delta
+                    self.events += 1
+
+            if oldest_at is not None:
+                self.oldest_at = min(self.oldest_at or oldest_at, oldest_at)
+
+    def flush(self, db: Session) -> int:
+        deltas, oldest_at = self.take()
+        rows = 0
+
+        try:
+            for name, ids in deltas.items():
+                ids = {id: delta for id, delta in ids.items() if delta != 0}
+                if not ids:
+                    continue
+
+                column = self.columns[name]
+                table = column.class_.__table__
+
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("_id"))
+                    .values({column.key: table.c[column.key] + bindparam("_delta")}),
+                    [{"_id": id, "_delta": delta} for id, delta in ids.items()],
+                )
+                rows += len(ids)
+
+            db.commit()
+
+        except Exception:
+            db.rollback()
+            self.restore(deltas, oldest_at)
+            raise
+
+        with self.lock:
+            self.flushed_at = time.monotonic()
+            self.flushes += 1
+
+        return rows
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+
+        with self.lock:
+            return {
+                "pending_events": self.events,
+                "pending_rows": sum(
+                    1 for ids in self.deltas.values() for delta in ids.values() if delta != 0
+                ),
+                "staleness_seconds": 0 if self.oldest_at is None else now - self.oldest_at,
+                "seconds_since_flush": None if self.flushed_at is None else now - self.flushed_at,
+                "flushes": self.flushes,
+            }
+
+
+counter_buffer = CounterBuffer()
@@ -1,46 +1,65 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from sqlalchemy.orm import Session, selectinload
 from src import models
+from src.crud.row_count import row_count
 from src.crud.utils import utils
 
 
 class Follow():
-    def follow(self, db: Session, follower_id: int, following_id: int) -> models.Follow:
-        db_follow = models.Follow(
-            follower_id=follower_id,
-            following_id=following_id,
+    def follow(self, db: Session, follower_id: int, following_id: int) -> models.Follow | None:
+        db_follow = db.scalar(
+            utils.get_insert(db)(models.Follow)
+            .values(follower_id=follower_id, following_id=following_id)
+            .on_conflict_do_nothing(index_elements=["follower_id", "following_id"])
+            .returning(models.Follow)
         )
-        db.add(db_follow)
-        db.commit()
 
-        utils.update_user_followers_count(db, user_id=following_id)
-        utils.update_user_followings_count(db, user_id=follower_id)
-        db.commit()
+        if db_follow is not None:
+            utils.adjust_user_followers_count(db, user_id=following_id, delta=1)
+            utils.adjust_user_followings_count(db, user_id=follower_id, delta=1)
 
-        db.refresh(db_follow)
+        utils.commit(db)
         return db_follow
 
-    def unfollow(self, db: Session, follower_id: int, following_id: int) -> models.Follow:
-        db_follow = self.get_follow_by_follower_id_and_following_id(
-            db, follower_id=follower_id, following_id=following_id
-        )
-        db.delete(db_follow)
-        db.commit()
-
-        utils.update_user_followers_count(db, user_id=following_id)
-        utils.update_user_followings_count(db, user_id=follower_id)
-        db.commit()
-
+    def unfollow(self, db: Session, follower_id: int, following_id: int) -> models.Follow | None:
+        db_follow = db.scalar(
+            delete(models.Follow)
+            .where(
+                models.Follow.follower_id == follower_id,
+                models.Follow.following_id == following_id,
+            )
+            .returning(models.Follow)
+            .options(
+                selectinload(models.Follow.follower),
+                selectinload(models.Follow.following),
+            )
+        )
+
+        if db_follow is not None:
+            if utils.is_follow_counted(db_follow):
+                utils.adjust_user_followers_count(
+                    db, user_id=following_id, delta=-1
+                )
+                utils.adjust_user_followings_count(
+                    db, user_id=follower_id, delta=-1
+                )
+
+            db.expunge(db_follow)
+
+        utils.commit(db)
         return db_follow
 
-    def get_all_follows_count(self, db: Session) -> int:
-        return (
-            db.query(models.Follow)
-            .count()
-        )
+    def get_all_follows_count(self, db: Session, mode: str = "exact") -> int:
+        query = db.query(models.Follow)
+
+        return row_count.get(db, query, mode=mode)
 
-    def get_all_follows(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Follow]:
+    def get_all_follows(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Follow]:
         return (
             db.query(models.Follow)
+            .options(*utils.get_owner_loaders(models.Follow.follower, models.Follow.following))
+            .filter(*utils.id_range(models.Follow.id, after, None))
+            .order_by(models.Follow.id)
             .offset(skip)
             .limit(limit)
             .all()
@@ -67,16 +86,31 @@ class Follow():
             .count()
         )
 
-    def get_followers_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> list[models.Follow]:
+    def get_followers_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Follow]:
         return (
             db.query(models.Follow)
+            .options(*utils.get_owner_loaders(models.Follow.follower, models.Follow.following))
             .filter(models.Follow.following_id == user_id)
+            .filter(*utils.id_range(models.Follow.id, after, None))
             .order_by(models.Follow.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_followers_ids_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Follow.id)
+                .filter(models.Follow.following_id == user_id)
+                .filter(*utils.id_range(models.Follow.id, after, None))
+                .order_by(models.Follow.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_followings_count_by_user_id(self, db: Session, user_id: int) -> int:
         return (
             db.query(models.Follow)
@@ -84,27 +118,46 @@ class Follow():
             .count()
         )
 
-    def get_followings_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> list[models.Follow]:
+    def get_followings_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Follow]:
         return (
             db.query(models.Follow)
+            .options(*utils.get_owner_loaders(models.Follow.follower, models.Follow.following))
             .filter(models.Follow.follower_id == user_id)
+            .filter(*utils.id_range(models.Follow.id, after, None))
             .order_by(models.Follow.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
-    def get_all_active_follows_count(self, db: Session) -> int:
-        return (
+    def get_followings_ids_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Follow.id)
+                .filter(models.Follow.follower_id == user_id)
+                .filter(*utils.id_range(models.Follow.id, after, None))
+                .order_by(models.Follow.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
+    def get_all_active_follows_count(self, db: Session, mode: str = "exact") -> int:
+        query = (
             db.query(models.Follow)
             .filter(models.Follow.is_follower_active == True, models.Follow.is_following_active == True)
-            .count()
         )
 
-    def get_all_active_follows(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Follow]:
+        return row_count.get(db, query, mode=mode)
+
+    def get_all_active_follows(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Follow]:
         return (
             db.query(models.Follow)
+            .options(*utils.get_owner_loaders(models.Follow.follower, models.Follow.following))
             .filter(models.Follow.is_follower_active == True, models.Follow.is_following_active == True)
+            .filter(*utils.id_range(models.Follow.id, after, None))
+            .order_by(models.Follow.id)
             .offset(skip)
             .limit(limit)
             .all()
@@ -134,17 +187,33 @@ class Follow():
             .count()
         )
 
-    def get_active_followers_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> list[models.Follow]:
+    def get_active_followers_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Follow]:
         return (
             db.query(models.Follow)
+            .options(*utils.get_owner_loaders(models.Follow.follower, models.Follow.following))
             .filter(models.Follow.is_follower_active == True, models.Follow.is_following_active == True)
             .filter(models.Follow.following_id == user_id)
+            .filter(*utils.id_range(models.Follow.id, after, None))
             .order_by(models.Follow.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_followers_ids_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Follow.id)
+                .filter(models.Follow.is_follower_active == True, models.Follow.is_following_active == True)
+                .filter(models.Follow.following_id == user_id)
+                .filter(*utils.id_range(models.Follow.id, after, None))
+                .order_by(models.Follow.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_active_followings_count_by_user_id(self, db: Session, user_id: int) -> int:
         return (
             db.query(models.Follow)
@@ -153,16 +222,32 @@ class Follow():
             .count()
         )
 
-    def get_active_followings_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> list[models.Follow]:
+    def get_active_followings_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Follow]:
         return (
             db.query(models.Follow)
+            .options(*utils.get_owner_loaders(models.Follow.follower, models.Follow.following))
             .filter(models.Follow.is_follower_active == True, models.Follow.is_following_active == True)
             .filter(models.Follow.follower_id == user_id)
+            .filter(*utils.id_range(models.Follow.id, after, None))
             .order_by(models.Follow.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_followings_ids_by_user_id(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Follow.id)
+                .filter(models.Follow.is_follower_active == True, models.Follow.is_following_active == True)
+                .filter(models.Follow.follower_id == user_id)
+                .filter(*utils.id_range(models.Follow.id, after, None))
+                .order_by(models.Follow.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
 
 follow = Follow()
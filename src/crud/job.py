@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from src import models
+from src.core.config import settings
+from src.crud.reconcile import reconcile
+from src.crud.utils import utils
+
+
+class Job():
+    def get_steps(self, kind: str) -> list:
+        return {
+            "activate_user": utils.activate_user_steps,
+            "deactivate_user": utils.deactivate_user_steps,
+            "reconcile": reconcile.steps,
+        }[kind]
+
+    def get_chunk_size(self, kind: str) -> int:
+        if kind == "reconcile":
+            return settings.RECONCILE_CHUNK_SIZE
+
+        return settings.JOBS_CHUNK_SIZE
+
+    def get_throttle_seconds(self, kind: str) -> float:
+        if kind == "reconcile":
+            return settings.RECONCILE_THROTTLE_MS / 1000
+
+        return 0
+
+    def create(self, db: Session, kind: str, target_id: int | None, owner_id: int) -> models.Job:
+        if target_id is not None:
+            self.cancel_jobs_by_target_id(db, target_id=target_id)
+
+        db_job = models.Job(
+            kind=kind,
+            target_id=target_id,
+            owner_id=owner_id,
+            total_steps=len(self.get_steps(kind)),
+        )
+        db.add(db_job)
+        db.commit()
+
+        db.refresh(db_job)
+        return db_job
+
+    def cancel_jobs_by_target_id(self, db: Session, target_id: int):
+        (
+            db.query(models.Job)
+            .filter(models.Job.target_id == target_id)
+            .filter(models.Job.kind.in_(["activate_user", "deactivate_user"]))
+            .filter(models.Job.status.in_(["pending", "running"]))
+            .update(
+                {models.Job.status: "cancelled", models.Job.finished_at: func.now()},
+                synchronize_session=False,
+            )
+        )
+        utils.commit(db)
+
+    def claim(self, db: Session, id: int, lease_seconds: int) -> models.Job | None:
+        now = datetime.now(timezone.utc)
+
+        claimed = (
+            db.query(models.Job)
+            .filter(models.Job.id == id)
+            .filter(or_(
+                models.Job.status == "pending",
+                and_(
+                    models.Job.status == "running",
+                    models.Job.heartbeat_at < now - timedelta(seconds=lease_seconds),
+                ),
+            ))
+            .update(
+                {models.Job.status: "running", models.Job.heartbeat_at: now},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+
+        if not claimed:
+            return None
+
+        return self.get_job_by_id(db, id=id)
+
+    def release(self, db: Session, db_job: models.Job):
+        setattr(db_job, "status", "pending")
+        db.commit()
+
+    def run_chunk(self, db: Session, db_job: models.Job) -> bool:
+        if db_job.status != "running":
+            return False
+
+        steps = self.get_steps(db_job.kind)
+        step = steps[db_job.step]
+        size = self.get_chunk_size(db_job.kind)
+
+        until = step.get_chunk_end(
+            db, db_job.target_id, after=db_job.cursor, size=size
+        )
+        stats = step.run(db, db_job.target_id, after=db_job.cursor, until=until)
+
+        result = dict(db_job.result or {})
+        step_result = dict(result.get(step.name, {}))
+        for name, value in stats.items():
+            step_result[name] = step_result.get(name, 0) + value
+        result[step.name] = step_result
+
+        if until is None:
+            setattr(db_job, "step", db_job.step + 1)
+            setattr(db_job, "cursor", 0)
+        else:
+            setattr(db_job, "cursor", until)
+
+        setattr(db_job, "processed", db_job.processed + stats["rows"])
+        setattr(db_job, "result", result)
+        setattr(db_job, "heartbeat_at", datetime.now(timezone.utc))
+
+        if db_job.step == len(steps):
+            setattr(db_job, "status", "completed")
+            setattr(db_job, "finished_at", func.now())
+
+        db.commit()
+        return db_job.status == "running"
+
+    def fail(self, db: Session, db_job: models.Job, error: str):
+        setattr(db_job, "status", "failed")
+        setattr(db_job, "error", error)
+        setattr(db_job, "finished_at", func.now())
+        db.commit()
+
+    def get_job_by_id(self, db: Session, id: int) -> models.Job | None:
+        return (
+            db.query(models.Job)
+            .filter(models.Job.id == id)
+            .first()
+        )
+
+    def get_resumable_job_ids(self, db: Session, lease_seconds: int) -> list[int]:
+        stale = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)
+
+        return [
+            id for id, in (
+                db.query(models.Job.id)
+                .filter(or_(
+                    models.Job.status == "pending",
+                    and_(models.Job.status == "running", models.Job.heartbeat_at < stale),
+                ))
+                .order_by(models.Job.id)
+                .all()
+            )
+        ]
+
+
+job = Job()
@@ -1,59 +1,75 @@
-from sqlalchemy.orm import Session
+from typing import Iterator
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session, selectinload
 from src import models
+from src.crud.row_count import row_count
 from src.crud.utils import utils
 
 
 class Like():
-    def like_post(self, db: Session, post_id: int, owner_id: int) -> models.Like:
-        db_like = models.Like(
-            post_id=post_id,
-            owner_id=owner_id,
+    def like_post(self, db: Session, post_id: int, owner_id: int) -> models.Like | None:
+        db_like = db.scalar(
+            utils.get_insert(db)(models.Like)
+            .values(post_id=post_id, owner_id=owner_id)
+            .on_conflict_do_nothing(index_elements=["post_id", "owner_id"])
+            .returning(models.Like)
         )
-        db.add(db_like)
-        db.commit()
 
-        utils.update_post_likes_count(db, post_id=post_id)
-        db.commit()
+        if db_like is not None:
+            utils.adjust_post_likes_count(db, post_id=post_id, delta=1)
 
-        db.refresh(db_like)
+        utils.commit(db)
         return db_like
 
-    def unlike_post(self, db: Session, post_id: int, owner_id: int) -> models.Like:
-        db_like = self.get_like_by_post_id_and_owner_id(
-            db, post_id=post_id, owner_id=owner_id
+    def unlike_post(self, db: Session, post_id: int, owner_id: int) -> models.Like | None:
+        db_like = db.scalar(
+            delete(models.Like)
+            .where(models.Like.post_id == post_id, models.Like.owner_id == owner_id)
+            .returning(models.Like)
+            .options(selectinload(models.Like.owner))
         )
-        db.delete(db_like)
-        db.commit()
 
-        utils.update_post_likes_count(db, post_id=post_id)
-        db.commit()
+        if db_like is not None:
+            if utils.is_like_counted(db_like):
+                utils.adjust_post_likes_count(db, post_id=post_id, delta=-1)
+
+            db.expunge(db_like)
 
+        utils.commit(db)
         return db_like
 
-    def like_comment(self, db: Session, comment_id: int, owner_id: int) -> models.Like:
-        db_like = models.Like(
-            comment_id=comment_id,
-            owner_id=owner_id,
+    def like_comment(self, db: Session, comment_id: int, owner_id: int) -> models.Like | None:
+        db_like = db.scalar(
+            utils.get_insert(db)(models.Like)
+            .values(comment_id=comment_id, owner_id=owner_id)
+            .on_conflict_do_nothing(index_elements=["comment_id", "owner_id"])
+            .returning(models.Like)
         )
-        db.add(db_like)
-        db.commit()
 
-        utils.update_comment_likes_count(db, comment_id=comment_id)
-        db.commit()
+        if db_like is not None:
+            utils.adjust_comment_likes_count(db, comment_id=comment_id, delta=1)
 
-        db.refresh(db_like)
+        utils.commit(db)
         return db_like
 
-    def unlike_comment(self, db: Session, comment_id: int, owner_id: int) -> models.Like:
-        db_like = self.get_like_by_comment_id_and_owner_id(
-            db, comment_id=comment_id, owner_id=owner_id
+    def unlike_comment(self, db: Session, comment_id: int, owner_id: int) -> models.Like | None:
+        db_like = db.scalar(
+            delete(models.Like)
+            .where(models.Like.comment_id == comment_id, models.Like.owner_id == owner_id)
+            .returning(models.Like)
+            .options(selectinload(models.Like.owner))
         )
-        db.delete(db_like)
-        db.commit()
 
-        utils.update_comment_likes_count(db, comment_id=comment_id)
-        db.commit()
+        if db_like is not None:
+            if utils.is_like_counted(db_like):
+                utils.adjust_comment_likes_count(
+                    db, comment_id=comment_id, delta=-1
+                )
+
+            db.expunge(db_like)
 
+        utils.commit(db)
         return db_like
 
     def get_like_by_post_id_and_owner_id(self, db: Session, post_id: int, owner_id: int) -> models.Like | None:
@@ -77,15 +93,16 @@ class Like():
             .first()
         )
 
-    def get_all_likes_count(self, db: Session):
-        return (
-            db.query(models.Like)
-            .count()
-        )
+    def get_all_likes_count(self, db: Session, mode: str = "exact") -> int:
+        query = db.query(models.Like)
+
+        return row_count.get(db, query, mode=mode)
 
-    def get_all_likes(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Like]:
+    def get_all_likes(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
+            .options(*utils.get_owner_loaders(models.Like.owner))
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
@@ -99,16 +116,31 @@ class Like():
             .count()
         )
 
-    def get_likes_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> list[models.Like]:
+    def get_likes_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
+            .options(*utils.get_owner_loaders(models.Like.owner))
             .filter(models.Like.owner_id == owner_id)
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_likes_ids_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Like.id)
+                .filter(models.Like.owner_id == owner_id)
+                .filter(*utils.id_range(models.Like.id, after, None))
+                .order_by(models.Like.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_likes_count_by_post_id(self, db: Session, post_id: int) -> int:
         return (
             db.query(models.Like)
@@ -116,16 +148,31 @@ class Like():
             .count()
         )
 
-    def get_likes_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100) -> list[models.Like]:
+    def get_likes_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
+            .options(*utils.get_owner_loaders(models.Like.owner))
             .filter(models.Like.post_id == post_id)
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_likes_ids_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Like.id)
+                .filter(models.Like.post_id == post_id)
+                .filter(*utils.id_range(models.Like.id, after, None))
+                .order_by(models.Like.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_likes_count_by_comment_id(self, db: Session, comment_id: int) -> int:
         return (
             db.query(models.Like)
@@ -133,35 +180,53 @@ class Like():
             .count()
         )
 
-    def get_likes_by_comment_id(self, db: Session, comment_id: int, skip: int = 0, limit: int = 100) -> list[models.Like]:
+    def get_likes_by_comment_id(self, db: Session, comment_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
+            .options(*utils.get_owner_loaders(models.Like.owner))
             .filter(models.Like.comment_id == comment_id)
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_likes_ids_by_comment_id(self, db: Session, comment_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Like.id)
+                .filter(models.Like.comment_id == comment_id)
+                .filter(*utils.id_range(models.Like.id, after, None))
+                .order_by(models.Like.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_active_like_by_id(self, db: Session, id: int) -> models.Like | None:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.id == id)
             .first()
         )
 
-    def get_all_active_likes_count(self, db: Session):
-        return (
+    def get_all_active_likes_count(self, db: Session, mode: str = "exact") -> int:
+        query = (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
-            .count()
+            .filter(models.Like.is_visible == True)
         )
 
-    def get_all_active_likes(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Like]:
+        return row_count.get(db, query, mode=mode)
+
+    def get_all_active_likes(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .options(*utils.get_owner_loaders(models.Like.owner))
+            .filter(models.Like.is_visible == True)
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
@@ -171,59 +236,117 @@ class Like():
     def get_active_likes_count_by_owner_id(self, db: Session, owner_id: int) -> int:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.owner_id == owner_id)
             .count()
         )
 
-    def get_active_likes_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> list[models.Like]:
+    def get_active_likes_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .options(*utils.get_owner_loaders(models.Like.owner))
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.owner_id == owner_id)
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_likes_ids_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Like.id)
+                .filter(models.Like.is_visible == True)
+                .filter(models.Like.owner_id == owner_id)
+                .filter(*utils.id_range(models.Like.id, after, None))
+                .order_by(models.Like.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_active_likes_count_by_post_id(self, db: Session, post_id: int) -> int:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.post_id == post_id)
             .count()
         )
 
-    def get_active_likes_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100) -> list[models.Like]:
+    def get_active_likes_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .options(*utils.get_owner_loaders(models.Like.owner))
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.post_id == post_id)
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_likes_ids_by_post_id(self, db: Session, post_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Like.id)
+                .filter(models.Like.is_visible == True)
+                .filter(models.Like.post_id == post_id)
+                .filter(*utils.id_range(models.Like.id, after, None))
+                .order_by(models.Like.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
+    def iter_active_likes_ids_by_post_id(self, db: Session, post_id: int, batch_size: int = 1000) -> Iterator[int]:
+        for id, in (
+            db.query(models.Like.id)
+            .filter(models.Like.is_visible == True)
+            .filter(models.Like.post_id == post_id)
+            .order_by(models.Like.id)
+            .yield_per(batch_size)
+        ):
+            yield id
+
     def get_active_likes_count_by_comment_id(self, db: Session, comment_id: int) -> int:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.comment_id == comment_id)
             .count()
         )
 
-    def get_active_likes_by_comment_id(self, db: Session, comment_id: int, skip: int = 0, limit: int = 100) -> list[models.Like]:
+    def get_active_likes_by_comment_id(self, db: Session, comment_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Like]:
         return (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .options(*utils.get_owner_loaders(models.Like.owner))
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.comment_id == comment_id)
+            .filter(*utils.id_range(models.Like.id, after, None))
             .order_by(models.Like.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_likes_ids_by_comment_id(self, db: Session, comment_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Like.id)
+                .filter(models.Like.is_visible == True)
+                .filter(models.Like.comment_id == comment_id)
+                .filter(*utils.id_range(models.Like.id, after, None))
+                .order_by(models.Like.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
 
 like = Like()
@@ -1,6 +1,11 @@
+from typing import Iterator
+
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from src import models, schemas
+from src.crud.row_count import row_count
+from src.crud.search import search
 from src.crud.utils import utils
 
 
@@ -11,67 +16,70 @@ class Post():
             owner_id=owner_id,
         )
         db.add(db_post)
-        db.commit()
-
-        utils.update_user_posts_count(db, owner_id=owner_id)
-        db.commit()
-
-        db.refresh(db_post)
+        utils.adjust_user_posts_count(db, owner_id=owner_id, delta=1)
+        utils.commit(db)
         return db_post
 
-    def update(self, db: Session, id: int, post_update: schemas.PostUpdate) -> models.Post:
-        db_post = self.get_post_by_id(db, id=id)
-
+    def update(self, db: Session, id: int, post_update: schemas.PostUpdate, owner_id: int) -> models.Post | None:
         update_data = post_update.dict(exclude_unset=True)
         update_data["is_modified"] = True
         update_data["modified_at"] = func.now()
 
-        for field, value in update_data.items():
-            setattr(db_post, field, value)
+        db_post = db.scalar(
+            update(models.Post)
+            .where(models.Post.id == id, models.Post.owner_id == owner_id)
+            .where(models.Post.is_active == True, models.Post.is_owner_active == True)
+            .values(update_data)
+            .returning(models.Post)
+        )
 
-        db.commit()
-        db.refresh(db_post)
+        utils.commit(db)
         return db_post
 
     def delete(self, db: Session, id: int):
         db_post = self.get_post_by_id(db, id=id)
+        is_counted = utils.is_post_counted(db_post)
         db.delete(db_post)
-        db.commit()
+        db.flush()
 
         utils.delete_likes_by_post_id(db, post_id=id)
-        utils.update_user_posts_count(
-            db, owner_id=getattr(db_post, "owner_id")
-        )
-        db.commit()
+        if is_counted:
+            utils.adjust_user_posts_count(
+                db, owner_id=getattr(db_post, "owner_id"), delta=-1
+            )
+        utils.commit(db)
 
     def activate(self, db: Session, id: int) -> models.Post:
         db_post = self.get_post_by_id(db, id=id)
+        was_counted = utils.is_post_counted(db_post)
         setattr(db_post, "is_active", True)
-        db.commit()
+        db.flush()
 
         utils.activate_likes_by_post_id(db, post_id=id)
         utils.update_post_likes_count(db, post_id=id)
         utils.update_post_comments_count(db, post_id=id)
-        utils.update_user_posts_count(
-            db, owner_id=getattr(db_post, "owner_id")
-        )
+        delta = int(utils.is_post_counted(db_post)) - int(was_counted)
+        if delta:
+            utils.adjust_user_posts_count(
+                db, owner_id=getattr(db_post, "owner_id"), delta=delta
+            )
 
-        db.commit()
-        db.refresh(db_post)
+        utils.commit(db)
         return db_post
 
     def deactivate(self, db: Session, id: int) -> models.Post:
         db_post = self.get_post_by_id(db, id=id)
+        was_counted = utils.is_post_counted(db_post)
         setattr(db_post, "is_active", False)
-        db.commit()
+        db.flush()
 
         utils.deactivate_likes_by_post_id(db, post_id=id)
-        utils.update_user_posts_count(
-            db, owner_id=getattr(db_post, "owner_id")
-        )
+        if was_counted:
+            utils.adjust_user_posts_count(
+                db, owner_id=getattr(db_post, "owner_id"), delta=-1
+            )
 
-        db.commit()
-        db.refresh(db_post)
+        utils.commit(db)
         return db_post
 
     def get_post_by_id(self, db: Session, id: int) -> models.Post | None:
@@ -81,21 +89,34 @@ class Post():
             .first()
         )
 
-    def get_all_posts_count(self, db: Session) -> int:
-        return (
-            db.query(models.Post)
-            .count()
-        )
+    def get_all_posts_count(self, db: Session, mode: str = "exact") -> int:
+        query = db.query(models.Post)
+
+        return row_count.get(db, query, mode=mode)
 
-    def get_all_posts(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Post]:
+    def get_all_posts(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Post]:
         return (
             db.query(models.Post)
+            .options(*utils.get_owner_loaders(models.Post.owner))
+            .filter(*utils.id_range(models.Post.id, after, None))
             .order_by(models.Post.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_all_posts_ids(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Post.id)
+                .filter(*utils.id_range(models.Post.id, after, None))
+                .order_by(models.Post.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_posts_count_by_owner_id(self, db: Session, owner_id: int) -> int:
         return (
             db.query(models.Post)
@@ -103,41 +124,91 @@ class Post():
             .count()
         )
 
-    def get_posts_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> list[models.Post]:
+    def get_posts_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Post]:
         return (
             db.query(models.Post)
+            .options(*utils.get_owner_loaders(models.Post.owner))
             .filter(models.Post.owner_id == owner_id)
+            .filter(*utils.id_range(models.Post.id, after, None))
             .order_by(models.Post.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_posts_ids_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Post.id)
+                .filter(models.Post.owner_id == owner_id)
+                .filter(*utils.id_range(models.Post.id, after, None))
+                .order_by(models.Post.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
     def get_active_post_by_id(self, db: Session, id: int) -> models.Post | None:
         return (
             db.query(models.Post)
+            .options(*utils.get_owner_loaders(models.Post.owner))
             .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
             .filter(models.Post.id == id)
             .first()
         )
 
-    def get_all_active_posts_count(self, db: Session) -> int:
-        return (
+    def get_all_active_posts_count(self, db: Session, mode: str = "exact") -> int:
+        query = (
             db.query(models.Post)
             .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
-            .count()
         )
 
-    def get_all_active_posts(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.Post]:
+        return row_count.get(db, query, mode=mode)
+
+    def get_all_active_posts(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Post]:
         return (
             db.query(models.Post)
+            .options(*utils.get_owner_loaders(models.Post.owner))
             .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
+            .filter(*utils.id_range(models.Post.id, after, None))
             .order_by(models.Post.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_all_active_posts_ids(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Post.id)
+                .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
+                .filter(*utils.id_range(models.Post.id, after, None))
+                .order_by(models.Post.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
+    def iter_all_active_posts_ids(self, db: Session, batch_size: int = 1000) -> Iterator[int]:
+        for id, in (
+            db.query(models.Post.id)
+            .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
+            .order_by(models.Post.id)
+            .yield_per(batch_size)
+        ):
+            yield id
+
+    def search_active_posts(self, db: Session, q: str, limit: int = 100, after: tuple[float, int] | None = None) -> list[tuple[models.Post, float]]:
+        query = (
+            db.query(models.Post)
+            .options(*utils.get_owner_loaders(models.Post.owner))
+            .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
+        )
+
+        return search.get_ranked(db, query, q=q, limit=limit, after=after)
+
     def get_active_posts_count_by_owner_id(self, db: Session, owner_id: int) -> int:
         return (
             db.query(models.Post)
@@ -146,16 +217,32 @@ class Post():
             .count()
         )
 
-    def get_active_posts_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> list[models.Post]:
+    def get_active_posts_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.Post]:
         return (
             db.query(models.Post)
+            .options(*utils.get_owner_loaders(models.Post.owner))
             .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
             .filter(models.Post.owner_id == owner_id)
+            .filter(*utils.id_range(models.Post.id, after, None))
             .order_by(models.Post.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_active_posts_ids_by_owner_id(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, after: int | None = None) -> list[int]:
+        return [
+            id for id, in (
+                db.query(models.Post.id)
+                .filter(models.Post.is_active == True, models.Post.is_owner_active == True)
+                .filter(models.Post.owner_id == owner_id)
+                .filter(*utils.id_range(models.Post.id, after, None))
+                .order_by(models.Post.id)
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        ]
+
 
 post = Post()
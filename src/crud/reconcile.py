@@ -0,0 +1,118 @@
+import time
+from typing import Callable
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from src.crud.counter_buffer import counter_buffer
+from src.crud.utils import utils
+
+
+class ReconcileStep():
+    def __init__(self, name: str, counter: InstrumentedAttribute, key: InstrumentedAttribute, filters: tuple, prepare: Callable | None = None):
+        self.name = name
+        self.counter = counter
+        self.key = key
+        self.filters = filters
+        self.prepare = prepare
+        self.model = counter.class_
+
+    def get_chunk_end(self, db: Session, target_id: int | None, after: int, size: int) -> int | None:
+        return (
+            db.query(self.model.id)
+            .filter(self.model.id > after)
+            .order_by(self.model.id)
+            .offset(size - 1)
+            .limit(1)
+            .scalar()
+        )
+
+    def run(self, db: Session, target_id: int | None, after: int | None = None, until: int | None = None) -> dict[str, int]:
+        if self.prepare is not None:
+            self.prepare(db, after=after, until=until)
+
+        rows = (
+            db.query(self.model.id, self.counter)
+            .filter(*utils.id_range(self.model.id, after, until))
+            .all()
+        )
+        counts = dict(
+            db.query(self.key, func.count())
+            .filter(*utils.id_range(self.key, after, until), *self.filters)
+            .group_by(self.key)
+            .all()
+        )
+
+        pending = counter_buffer.get_pending(self.name)
+        if pending:
+            utils.on_commit(
+                db, counter_buffer.discard, self.name, [id for id, _ in rows if id in pending]
+            )
+
+        drifted = [
+            {"_id": id, "_stored": -1 if stored is None else stored, "_count": counts.get(id, 0)}
+            for id, stored in rows
+            if stored != counts.get(id, 0)
+        ]
+
+        if drifted:
+            table = self.model.__table__
+            column = table.c[self.counter.key]
+
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .where(func.coalesce(column, -1) == bindparam("_stored"))
+                .values({column: bindparam("_count")}),
+                drifted,
+            )
+
+        return {
+            "rows": len(rows),
+            "drifted": len(drifted),
+            "drift": sum(abs(row["_count"] - max(row["_stored"], 0)) for row in drifted),
+        }
+
+
+class Reconcile():
+    def __init__(self):
+        prepares = {
+            "posts.likes": utils.fold_post_like_shards,
+        }
+        self.steps = [
+            ReconcileStep(name, *counter, prepare=prepares.get(name))
+            for name, counter in utils.counters.items()
+        ]
+
+    def run(self, db: Session, names: list[str] | None, chunk_size: int, throttle_seconds: float, dry_run: bool = False) -> dict[str, dict[str, int]]:
+        report = {}
+
+        for step in self.steps:
+            if names and step.name not in names:
+                continue
+
+            stats = {"rows": 0, "drifted": 0, "drift": 0}
+            after = 0
+
+            while True:
+                until = step.get_chunk_end(db, None, after=after, size=chunk_size)
+
+                for name, value in step.run(db, None, after=after, until=until).items():
+                    stats[name] += value
+
+                if dry_run:
+                    db.rollback()
+                else:
+                    db.commit()
+
+                if until is None:
+                    break
+
+                after = until
+                time.sleep(throttle_seconds)
+
+            report[step.name] = stats
+
+        return report
+
+
+reconcile = Reconcile()
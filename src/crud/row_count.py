@@ -0,0 +1,112 @@
+import json
+
+from sqlalchemy import event, func, text
+from sqlalchemy.orm import Query, Session
+from src.core.cache import TTLCache
+from src.core.config import settings
+
+
+class RowCount():
+    def __init__(self):
+        self.cache = TTLCache(ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+        event.listen(Session, "after_flush", self.collect_flushed_tables)
+        event.listen(Session, "do_orm_execute", self.collect_executed_tables)
+        event.listen(Session, "after_commit", self.invalidate_collected_tables)
+        event.listen(Session, "after_rollback", self.discard_collected_tables)
+
+    def get(self, db: Session, query: Query, mode: str = "exact") -> int:
+        if mode == "cached":
+            return self.get_cached(db, query)
+
+        if mode == "approximate":
+            return self.get_approximate(db, query)
+
+        return query.count()
+
+    def get_cached(self, db: Session, query: Query) -> int:
+        key = self.get_key(query)
+        count = self.cache.get(key)
+
+        if count is None:
+            count = query.count()
+            self.cache.set(key, count)
+
+        return count
+
+    def get_approximate(self, db: Session, query: Query) -> int:
+        if db.get_bind().dialect.name == "postgresql":
+            return self.get_planned(db, query)
+
+        return self.get_sampled(db, query)
+
+    def get_planned(self, db: Session, query: Query) -> int:
+        statement = query.statement.compile(
+            dialect=db.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_sampled(self, db: Session, query: Query) -> int:
+        model = query.column_descriptions[0]["entity"]
+
+        lowest, highest = (
+            db.query(func.min(model.id), func.max(model.id))
+            .one()
+        )
+        if highest is None:
+            return 0
+
+        span = highest - lowest + 1
+        if span <= settings.COUNT_SAMPLE_SIZE:
+            return query.count()
+
+        sampled = (
+            query
+            .filter(model.id > highest - settings.COUNT_SAMPLE_SIZE)
+            .count()
+        )
+
+        return round(span * sampled / settings.COUNT_SAMPLE_SIZE)
+
+    def get_key(self, query: Query) -> tuple[str, str]:
+        table = query.column_descriptions[0]["entity"].__tablename__
+        statement = query.statement.compile(compile_kwargs={"literal_binds": True})
+
+        return table, str(statement)
+
+    def collect_flushed_tables(self, db: Session, flush_context):
+        tables = db.info.setdefault("row_count_tables", set())
+
+        for instance in [*db.new, *db.deleted]:
+            tables.add(instance.__tablename__)
+
+        for instance in db.dirty:
+            if db.is_modified(instance):
+                tables.add(instance.__tablename__)
+
+    def collect_executed_tables(self, orm_execute_state):
+        if orm_execute_state.is_select:
+            return
+
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            orm_execute_state.session.info.setdefault(
+                "row_count_tables", set()
+            ).add(table.name)
+
+    def invalidate_collected_tables(self, db: Session):
+        tables = db.info.pop("row_count_tables", set())
+
+        if tables:
+            self.cache.delete_where(lambda key: key[0] in tables)
+
+    def discard_collected_tables(self, db: Session):
+        db.info.pop("row_count_tables", None)
+
+
+row_count = RowCount()
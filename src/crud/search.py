@@ -0,0 +1,81 @@
+import re
+
+from sqlalchemy import REAL, and_, cast, column, func, literal, literal_column, or_, table
+from sqlalchemy.orm import Query, Session
+from src.models.index import SEARCH_CONFIG, search_document
+
+
+class Search():
+    def get_terms(self, q: str) -> list[str]:
+        return re.findall(r"\w+", q)
+
+    def escape_like(self, q: str) -> str:
+        return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def get_similar(self, db: Session, query: Query, columns: list, q: str, limit: int = 10) -> list:
+        prefix = self.escape_like(q) + "%"
+
+        matches = [
+            match
+            for field in columns
+            for match in (
+                field.ilike(prefix, escape="\\"),
+                field.ilike("% " + prefix, escape="\\"),
+            )
+        ]
+        order_by = []
+
+        if db.get_bind().dialect.name == "postgresql":
+            matches += [field.op("%")(q) for field in columns]
+            order_by.append(
+                func.greatest(*[func.similarity(field, q) for field in columns]).desc()
+            )
+
+        return (
+            query
+            .filter(or_(*matches))
+            .order_by(*order_by, columns[0])
+            .limit(limit)
+            .all()
+        )
+
+    def get_ranked(self, db: Session, query: Query, q: str, limit: int = 100, after: tuple[float, int] | None = None) -> list[tuple]:
+        model = query.column_descriptions[0]["entity"]
+        terms = self.get_terms(q)
+        if not terms:
+            return []
+
+        if db.get_bind().dialect.name == "postgresql":
+            document = search_document(model.text)
+            tsquery = func.plainto_tsquery(SEARCH_CONFIG, " ".join(terms))
+
+            rank = func.ts_rank(document, tsquery)
+            query = query.filter(document.op("@@")(tsquery))
+            rank_after = cast(literal(after[0]), REAL) if after else None
+
+        else:
+            search = table(f"{model.__tablename__}_search", column("rowid"), column("text"))
+
+            rank = -func.bm25(literal_column(search.name))
+            query = (
+                query
+                .join(search, search.c.rowid == model.id)
+                .filter(search.c.text.op("MATCH")(" ".join(f'"{term}"' for term in terms)))
+            )
+            rank_after = after[0] if after else None
+
+        if after is not None:
+            query = query.filter(
+                or_(rank < rank_after, and_(rank == rank_after, model.id < after[1]))
+            )
+
+        return (
+            query
+            .add_columns(rank.label("rank"))
+            .order_by(rank.desc(), model.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+
+search = Search()
@@ -0,0 +1,45 @@
+import threading
+
+from sqlalchemy.orm import Session
+from src import models
+
+
+class TokenVersion():
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions: dict[int, int] = {}
+
+    def load(self, db: Session, batch_size: int = 10000):
+        versions = dict(
+            db.query(models.User.id, models.User.token_version)
+            .yield_per(batch_size)
+        )
+
+        with self.lock:
+            for id, version in versions.items():
+                versions[id] = max(version, self.versions.get(id, version))
+
+            self.versions = versions
+
+    def clear(self):
+        with self.lock:
+            self.versions = {}
+
+    def set(self, id: int, version: int):
+        with self.lock:
+            self.versions[id] = max(version, self.versions.get(id, version))
+
+    def remove(self, id: int):
+        with self.lock:
+            self.versions.pop(id, None)
+
+    def is_current(self, id: int, version: int) -> bool | None:
+        current = self.versions.get(id)
+
+        if current is None or version > current:
+            return None
+
+        return version == current
+
+
+token_version = TokenVersion()
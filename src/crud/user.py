@@ -1,113 +1,124 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, make_transient_to_detached
 from sqlalchemy.sql import func
 from src import models, schemas
-from src.core.security import get_password_hash, verify_password
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.core.security import get_password_hash
+from src.crud.autocomplete import autocomplete
+from src.crud.row_count import row_count
+from src.crud.search import search
+from src.crud.token_version import token_version
 from src.crud.utils import utils
 
 
 class User():
-    def create(self, db: Session, user: schemas.UserCreate) -> models.User:
+    def __init__(self):
+        self.cache = TTLCache(
+            ttl=settings.AUTH_CACHE_TTL_SECONDS, maxsize=settings.AUTH_CACHE_MAXSIZE
+        )
+        self.cached_columns = [
+            models.User.id,
+            models.User.username,
+            models.User.name,
+            models.User.is_superuser,
+            models.User.is_active,
+            models.User.token_version,
+        ]
+
+    def create(self, db: Session, user: schemas.UserCreate, hashed_password: str) -> models.User:
         db_user = models.User(
             username=user.username,
-            hashed_password=get_password_hash(user.password),
+            hashed_password=hashed_password,
             name=user.name,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        utils.on_commit(db, autocomplete.update, db_user)
+        utils.commit(db)
         return db_user
 
-    def update(self, db: Session, username: str, user_update: schemas.UserUpdate) -> models.User:
-        db_user = self.get_user_by_username(db, username=username)
-
+    def update(self, db: Session, username: str, user_update: schemas.UserUpdate) -> models.User | None:
         update_data = user_update.dict(exclude_unset=True)
         update_data["modified_at"] = func.now()
+        if update_data.get("username", username) != username:
+            update_data["token_version"] = models.User.token_version + 1
+
+        db_user = db.scalar(
+            update(models.User)
+            .where(models.User.username == username, models.User.is_active == True)
+            .values(update_data)
+            .returning(models.User)
+        )
 
-        for field, value in update_data.items():
-            setattr(db_user, field, value)
+        if db_user is not None:
+            utils.on_commit(db, self.cache.delete, username)
+            utils.on_commit(db, token_version.set, db_user.id, db_user.token_version)
+            utils.on_commit(db, autocomplete.update, db_user)
 
-        db.commit()
-        db.refresh(db_user)
+        utils.commit(db)
         return db_user
 
     def delete(self, db: Session, username: str):
         db_user = self.get_user_by_username(db, username=username)
+        id = db_user.id
         db.delete(db_user)
-        db.commit()
+
+        utils.on_commit(db, self.cache.delete, username)
+        utils.on_commit(db, token_version.remove, id)
+        utils.on_commit(db, autocomplete.remove, id)
+        utils.commit(db)
 
     def update_password(self, db: Session, username: str, new_password: str) -> models.User:
         db_user = self.get_user_by_username(db, username=username)
 
         hashed_password = get_password_hash(new_password)
         setattr(db_user, "hashed_password", hashed_password)
+        setattr(db_user, "token_version", models.User.token_version + 1)
         setattr(db_user, "modified_at", func.now())
+        db.flush()
 
-        db.commit()
-        db.refresh(db_user)
+        utils.on_commit(db, self.cache.delete, username)
+        utils.on_commit(db, token_version.set, db_user.id, db_user.token_version)
+        utils.commit(db)
         return db_user
 
-    def activate(self, db: Session, username: str) -> models.User:
+    def activate(self, db: Session, username: str, cascade: bool = True) -> models.User:
         db_user = self.get_user_by_username(db, username=username)
         setattr(db_user, "is_active", True)
-        db.commit()
+        db.flush()
 
-        utils.activate_posts_by_owner_id(db, owner_id=getattr(db_user, "id"))
-        utils.activate_comments_by_owner_id(
-            db, owner_id=getattr(db_user, "id")
-        )
-        utils.activate_likes_by_owner_id(db, owner_id=getattr(db_user, "id"))
-        utils.activate_followers_by_user_id(db, user_id=getattr(db_user, "id"))
-        utils.update_user_followers_count(db, user_id=getattr(db_user, "id"))
-        utils.activate_followings_by_user_id(
-            db, user_id=getattr(db_user, "id")
-        )
-        utils.update_user_followings_count(db, user_id=getattr(db_user, "id"))
-        db.commit()
+        if cascade:
+            for step in utils.activate_user_steps:
+                step.run(db, getattr(db_user, "id"))
 
-        db.refresh(db_user)
+        utils.on_commit(db, self.cache.delete, username)
+        utils.on_commit(db, autocomplete.update, db_user)
+        utils.commit(db)
         return db_user
 
-    def deactivate(self, db: Session, username: str) -> models.User:
+    def deactivate(self, db: Session, username: str, cascade: bool = True) -> models.User:
         db_user = self.get_user_by_username(db, username=username)
         setattr(db_user, "is_active", False)
-        db.commit()
+        db.flush()
 
-        utils.deactivate_posts_by_owner_id(db, owner_id=getattr(db_user, "id"))
-        utils.deactivate_comments_by_owner_id(
-            db, owner_id=getattr(db_user, "id")
-        )
-        utils.deactivate_likes_by_owner_id(db, owner_id=getattr(db_user, "id"))
-        utils.deactivate_followers_by_user_id(
-            db, user_id=getattr(db_user, "id")
-        )
-        utils.deactivate_followings_by_user_id(
-            db, user_id=getattr(db_user, "id")
-        )
-        db.commit()
+        if cascade:
+            for step in utils.deactivate_user_steps:
+                step.run(db, getattr(db_user, "id"))
 
-        db.refresh(db_user)
+        utils.on_commit(db, self.cache.delete, username)
+        utils.on_commit(db, autocomplete.update, db_user)
+        utils.commit(db)
         return db_user
 
-    def authenticate(self, db: Session, username: str, password: str) -> models.User | None:
-        db_user = self.get_user_by_username(db, username=username)
-
-        if not db_user:
-            return None
+    def get_all_users_count(self, db: Session, mode: str = "exact") -> int:
+        query = db.query(models.User)
 
-        if not verify_password(password, db_user.hashed_password):
-            return None
+        return row_count.get(db, query, mode=mode)
 
-        return db_user
-
-    def get_all_users_count(self, db: Session) -> int:
-        return (
-            db.query(models.User)
-            .count()
-        )
-
-    def get_all_users(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.User]:
+    def get_all_users(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.User]:
         return (
             db.query(models.User)
+            .filter(*utils.id_range(models.User.id, after, None))
             .order_by(models.User.id)
             .offset(skip)
             .limit(limit)
@@ -128,23 +139,57 @@ class User():
             .first()
         )
 
-    def get_all_active_users_count(self, db: Session) -> int:
-        return (
+    def get_cached_user_by_username(self, db: Session, username: str) -> models.User | None:
+        cached = self.cache.get(username)
+
+        if cached is None:
+            db_user = self.get_user_by_username(db, username=username)
+            if db_user is None:
+                return None
+
+            self.cache.set(username, {
+                column.key: getattr(db_user, column.key) for column in self.cached_columns
+            })
+            return db_user
+
+        db_user = models.User(**cached)
+        make_transient_to_detached(db_user)
+        return db.merge(db_user, load=False)
+
+    def get_all_active_users_count(self, db: Session, mode: str = "exact") -> int:
+        query = (
             db.query(models.User)
             .filter(models.User.is_active == True)
-            .count()
         )
 
-    def get_all_active_users(self, db: Session, skip: int = 0, limit: int = 100) -> list[models.User]:
+        return row_count.get(db, query, mode=mode)
+
+    def get_all_active_users(self, db: Session, skip: int = 0, limit: int = 100, after: int | None = None) -> list[models.User]:
         return (
             db.query(models.User)
             .filter(models.User.is_active == True)
+            .filter(*utils.id_range(models.User.id, after, None))
             .order_by(models.User.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def search_active_users(self, db: Session, q: str, limit: int = 10) -> list[models.User] | list[dict]:
+        found = autocomplete.search(q, limit=limit) if autocomplete.is_loaded else []
+        if len(found) == limit:
+            return found
+
+        query = (
+            db.query(models.User)
+            .filter(models.User.is_active == True)
+            .filter(models.User.id.not_in([user["id"] for user in found]))
+        )
+
+        return found + search.get_similar(
+            db, query, [models.User.username, models.User.name], q=q, limit=limit - len(found)
+        )
+
     def get_active_user_by_id(self, db: Session, id: id) -> models.User | None:
         return (
             db.query(models.User)
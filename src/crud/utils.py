@@ -1,8 +1,118 @@
-from sqlalchemy.orm import Session
+import random
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy import Select, bindparam, delete, event, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import (InstrumentedAttribute, Session, joinedload,
+                            selectinload)
 from src import models
+from src.core.config import settings
+from src.crud.counter_buffer import counter_buffer
+
+
+class CascadeStep():
+    def __init__(self, name: str, key: InstrumentedAttribute, cascade: Callable):
+        self.name = name
+        self.key = key
+        self.model = key.class_
+        self.cascade = cascade
+
+    def run(self, db: Session, target_id: int, after: int | None = None, until: int | None = None) -> dict[str, int]:
+        return {"rows": self.cascade(db, target_id, after=after, until=until)}
+
+    def get_chunk_end(self, db: Session, target_id: int, after: int, size: int) -> int | None:
+        return (
+            db.query(self.model.id)
+            .filter(self.key == target_id, self.model.id > after)
+            .order_by(self.model.id)
+            .offset(size - 1)
+            .limit(1)
+            .scalar()
+        )
+
+
+class RecountStep():
+    def __init__(self, name: str, recounts: list[Callable]):
+        self.name = name
+        self.recounts = recounts
+
+    def run(self, db: Session, target_id: int, after: int | None = None, until: int | None = None) -> dict[str, int]:
+        for recount in self.recounts:
+            recount(db, target_id)
+
+        return {"rows": 0}
+
+    def get_chunk_end(self, db: Session, target_id: int, after: int, size: int) -> int | None:
+        return None
+
+
+@event.listens_for(Session, "after_commit")
+def run_on_commit(db: Session):
+    for fn, args in db.info.pop("on_commit", []):
+        fn(*args)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def discard_on_commit(db: Session, transaction):
+    if transaction.parent is None:
+        db.info.pop("on_commit", None)
 
 
 class Utils():
+    def __init__(self):
+        self.counters = {
+            "users.posts": (
+                models.User.posts, models.Post.owner_id,
+                (models.Post.is_active == True, models.Post.is_owner_active == True),
+            ),
+            "posts.comments": (
+                models.Post.comments, models.Comment.post_id,
+                (models.Comment.is_active == True, models.Comment.is_owner_active == True),
+            ),
+            "posts.likes": (
+                models.Post.likes, models.Like.post_id,
+                (models.Like.is_visible == True,),
+            ),
+            "comments.likes": (
+                models.Comment.likes, models.Like.comment_id,
+                (models.Like.is_visible == True,),
+            ),
+            "users.followers": (
+                models.User.followers, models.Follow.following_id,
+                (models.Follow.is_follower_active == True, models.Follow.is_following_active == True),
+            ),
+            "users.followings": (
+                models.User.followings, models.Follow.follower_id,
+                (models.Follow.is_follower_active == True, models.Follow.is_following_active == True),
+            ),
+        }
+        self.activate_user_steps = [
+            CascadeStep("posts", models.Post.owner_id, self.activate_posts_by_owner_id),
+            CascadeStep("comments", models.Comment.owner_id, self.activate_comments_by_owner_id),
+            CascadeStep("likes", models.Like.owner_id, self.activate_likes_by_owner_id),
+            CascadeStep("followers", models.Follow.following_id, self.activate_followers_by_user_id),
+            CascadeStep("followings", models.Follow.follower_id, self.activate_followings_by_user_id),
+            RecountStep("counts", [self.update_user_followers_count, self.update_user_followings_count]),
+        ]
+        self.deactivate_user_steps = [
+            CascadeStep("posts", models.Post.owner_id, self.deactivate_posts_by_owner_id),
+            CascadeStep("comments", models.Comment.owner_id, self.deactivate_comments_by_owner_id),
+            CascadeStep("likes", models.Like.owner_id, self.deactivate_likes_by_owner_id),
+            CascadeStep("followers", models.Follow.following_id, self.deactivate_followers_by_user_id),
+            CascadeStep("followings", models.Follow.follower_id, self.deactivate_followings_by_user_id),
+        ]
+
+    def commit(self, db: Session):
+        if db.info.get("unit_of_work"):
+            db.flush()
+            return
+
+        db.commit()
+
+    def on_commit(self, db: Session, fn: Callable, *args):
+        db.info.setdefault("on_commit", []).append((fn, args))
+
     def delete_likes_by_post_id(self, db: Session, post_id: int):
         (
             db.query(models.Like)
@@ -23,265 +133,268 @@ class Utils():
     # def delete_posts_by_owner_id(self, ):
     #     pass
 
-    def activate_posts_by_owner_id(self, db: Session, owner_id: int):
-        (
-            db.query(models.Post)
-            .filter(models.Post.owner_id == owner_id)
-            .update({models.Post.is_owner_active: True})
-        )
+    def activate_posts_by_owner_id(self, db: Session, owner_id: int, after: int | None = None, until: int | None = None) -> int:
+        post_ids = self.select_post_ids_by_owner_id(owner_id, after, until)
 
-        posts = (
+        updated = (
             db.query(models.Post)
-            .filter(models.Post.owner_id == owner_id)
-            .all()
+            .filter(models.Post.owner_id == owner_id, *self.id_range(models.Post.id, after, until))
+            .update({models.Post.is_owner_active: True}, synchronize_session=False)
         )
-
-        for post in posts:
-            post_dict = post.__dict__
-
-            self.activate_like_post_owner_by_post_id(
-                db, post_id=post_dict["id"]
-            )
-            self.update_post_likes_count(db, post_id=post_dict["id"])
-            self.update_post_comments_count(db, post_id=post_dict["id"])
-
-    def activate_comments_by_owner_id(self, db: Session, owner_id: int):
         (
-            db.query(models.Comment)
-            .filter(models.Comment.owner_id == owner_id)
-            .update({models.Comment.is_owner_active: True})
+            db.query(models.Like)
+            .filter(models.Like.post_id.in_(post_ids))
+            .update(self.show_likes(models.Like.HIDDEN_BY_POST_OWNER), synchronize_session=False)
         )
 
-        comments = (
-            db.query(models.Comment)
-            .filter(models.Comment.owner_id == owner_id)
-            .all()
-        )
+        self.update_posts_likes_count(db, post_ids=post_ids)
+        self.update_posts_comments_count(db, post_ids=post_ids)
 
-        for comment in comments:
-            comment_dict = comment.__dict__
+        return updated
 
-            self.activate_like_comment_owner_by_comment_id(
-                db, comment_id=comment_dict["id"]
-            )
-            self.update_comment_likes_count(db, comment_id=comment_dict["id"])
-            self.update_post_comments_count(
-                db, post_id=comment_dict["post_id"]
-            )
+    def activate_comments_by_owner_id(self, db: Session, owner_id: int, after: int | None = None, until: int | None = None) -> int:
+        comment_ids = self.select_comment_ids_by_owner_id(owner_id, after, until)
 
-    def activate_likes_by_owner_id(self, db: Session, owner_id: int):
+        updated = (
+            db.query(models.Comment)
+            .filter(models.Comment.owner_id == owner_id, *self.id_range(models.Comment.id, after, until))
+            .update({models.Comment.is_owner_active: True}, synchronize_session=False)
+        )
         (
             db.query(models.Like)
-            .filter(models.Like.owner_id == owner_id)
-            .update({models.Like.is_owner_active: True})
+            .filter(models.Like.comment_id.in_(comment_ids))
+            .update(self.show_likes(models.Like.HIDDEN_BY_COMMENT_OWNER), synchronize_session=False)
         )
 
-        likes = (
+        self.update_comments_likes_count(db, comment_ids=comment_ids)
+        self.update_posts_comments_count(
+            db, post_ids=self.select_commented_post_ids_by_owner_id(owner_id, after, until)
+        )
+
+        return updated
+
+    def activate_likes_by_owner_id(self, db: Session, owner_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
             db.query(models.Like)
-            .filter(models.Like.owner_id == owner_id)
-            .all()
+            .filter(models.Like.owner_id == owner_id, *self.id_range(models.Like.id, after, until))
+            .update(self.show_likes(models.Like.HIDDEN_BY_OWNER), synchronize_session=False)
         )
 
-        for like in likes:
-            like_dict = like.__dict__
+        self.update_posts_likes_count(
+            db, post_ids=self.select_liked_post_ids_by_owner_id(owner_id, after, until)
+        )
+        self.update_comments_likes_count(
+            db, comment_ids=self.select_liked_comment_ids_by_owner_id(owner_id, after, until)
+        )
 
-            if like_dict["post_id"]:
-                self.update_post_likes_count(db, post_id=like_dict["post_id"])
-            else:
-                self.update_comment_likes_count(
-                    db, comment_id=like_dict["comment_id"]
-                )
+        return updated
 
-    def activate_followers_by_user_id(self, db: Session, user_id: int):
-        (
+    def activate_followers_by_user_id(self, db: Session, user_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
             db.query(models.Follow)
-            .filter(models.Follow.following_id == user_id)
-            .update({models.Follow.is_following_active: True})
+            .filter(models.Follow.following_id == user_id, *self.id_range(models.Follow.id, after, until))
+            .update({models.Follow.is_following_active: True}, synchronize_session=False)
         )
 
-        followers = (
-            db.query(models.Follow)
-            .filter(models.Follow.following_id == user_id)
-            .all()
+        self.update_users_followings_count(
+            db, user_ids=self.select_follower_ids_by_user_id(user_id, after, until)
         )
 
-        for follower in followers:
-            self.update_user_followings_count(
-                db, user_id=follower.__dict__["follower_id"]
-            )
+        return updated
 
-    def activate_followings_by_user_id(self, db: Session, user_id: int):
-        (
+    def activate_followings_by_user_id(self, db: Session, user_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
             db.query(models.Follow)
-            .filter(models.Follow.follower_id == user_id)
-            .update({models.Follow.is_follower_active: True})
+            .filter(models.Follow.follower_id == user_id, *self.id_range(models.Follow.id, after, until))
+            .update({models.Follow.is_follower_active: True}, synchronize_session=False)
         )
 
-        followings = (
-            db.query(models.Follow)
-            .filter(models.Follow.following_id == user_id)
-            .all()
+        self.update_users_followers_count(
+            db, user_ids=self.select_following_ids_by_user_id(user_id, after, until)
         )
 
-        for following in followings:
-            self.update_user_followers_count(
-                db, user_id=following.__dict__["follower_id"]
-            )
+        return updated
 
     def activate_likes_by_post_id(self, db: Session, post_id: int):
         (
             db.query(models.Like)
             .filter(models.Like.post_id == post_id)
-            .update({models.Like.is_post_active: True})
+            .update(self.show_likes(models.Like.HIDDEN_BY_POST))
         )
 
     def activate_likes_by_comment_id(self, db: Session, comment_id: int):
         (
             db.query(models.Like)
             .filter(models.Like.comment_id == comment_id)
-            .update({models.Like.is_comment_active: True})
+            .update(self.show_likes(models.Like.HIDDEN_BY_COMMENT))
         )
 
-    def activate_like_post_owner_by_post_id(self, db: Session, post_id: int):
-        (
-            db.query(models.Like)
-            .filter(models.Like.post_id == post_id)
-            .update({models.Like.is_post_owner_active: True})
+    def deactivate_posts_by_owner_id(self, db: Session, owner_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
+            db.query(models.Post)
+            .filter(models.Post.owner_id == owner_id, *self.id_range(models.Post.id, after, until))
+            .update({models.Post.is_owner_active: False}, synchronize_session=False)
         )
-
-    def activate_like_comment_owner_by_comment_id(self, db: Session, comment_id: int):
         (
             db.query(models.Like)
-            .filter(models.Like.comment_id == comment_id)
-            .update({models.Like.is_comment_owner_active: True})
+            .filter(models.Like.post_id.in_(self.select_post_ids_by_owner_id(owner_id, after, until)))
+            .update(self.hide_likes(models.Like.HIDDEN_BY_POST_OWNER), synchronize_session=False)
         )
 
-    def deactivate_posts_by_owner_id(self, db: Session, owner_id: int):
-        (
-            db.query(models.Post)
-            .filter(models.Post.owner_id == owner_id)
-            .update({models.Post.is_owner_active: False})
-        )
+        return updated
 
-        posts = (
-            db.query(models.Post)
-            .filter(models.Post.owner_id == owner_id)
-            .all()
+    def deactivate_comments_by_owner_id(self, db: Session, owner_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
+            db.query(models.Comment)
+            .filter(models.Comment.owner_id == owner_id, *self.id_range(models.Comment.id, after, until))
+            .update({models.Comment.is_owner_active: False}, synchronize_session=False)
         )
-
-        for post in posts:
-            self.deactivate_likes_post_owner_by_post_id(
-                db, post_id=post.__dict__["id"]
-            )
-
-    def deactivate_comments_by_owner_id(self, db: Session, owner_id: int):
         (
-            db.query(models.Comment)
-            .filter(models.Comment.owner_id == owner_id)
-            .update({models.Comment.is_owner_active: False})
+            db.query(models.Like)
+            .filter(models.Like.comment_id.in_(self.select_comment_ids_by_owner_id(owner_id, after, until)))
+            .update(self.hide_likes(models.Like.HIDDEN_BY_COMMENT_OWNER), synchronize_session=False)
         )
 
-        comments = (
-            db.query(models.Comment)
-            .filter(models.Comment.owner_id == owner_id)
-            .all()
+        self.update_posts_comments_count(
+            db, post_ids=self.select_commented_post_ids_by_owner_id(owner_id, after, until)
         )
 
-        for comment in comments:
-            comment_dict = comment.__dict__
+        return updated
 
-            self.deactivate_likes_comment_owner_by_comment_id(
-                db, comment_id=comment_dict["id"]
-            )
-            self.update_post_comments_count(
-                db, post_id=comment_dict["post_id"]
-            )
-
-    def deactivate_likes_by_owner_id(self, db: Session, owner_id: int):
-        (
+    def deactivate_likes_by_owner_id(self, db: Session, owner_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
             db.query(models.Like)
-            .filter(models.Like.owner_id == owner_id)
-            .update({models.Like.is_owner_active: False})
+            .filter(models.Like.owner_id == owner_id, *self.id_range(models.Like.id, after, until))
+            .update(self.hide_likes(models.Like.HIDDEN_BY_OWNER), synchronize_session=False)
         )
 
-        likes = (
-            db.query(models.Like)
-            .filter(models.Like.owner_id == owner_id)
-            .all()
+        self.update_posts_likes_count(
+            db, post_ids=self.select_liked_post_ids_by_owner_id(owner_id, after, until)
+        )
+        self.update_comments_likes_count(
+            db, comment_ids=self.select_liked_comment_ids_by_owner_id(owner_id, after, until)
         )
 
-        for like in likes:
-            like_dict = like.__dict__
-
-            if like_dict["post_id"]:
-                self.update_post_likes_count(db, post_id=like_dict["post_id"])
-            else:
-                self.update_comment_likes_count(
-                    db, comment_id=like_dict["comment_id"]
-                )
+        return updated
 
-    def deactivate_followers_by_user_id(self, db: Session, user_id: int):
-        (
+    def deactivate_followers_by_user_id(self, db: Session, user_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
             db.query(models.Follow)
-            .filter(models.Follow.following_id == user_id)
-            .update({models.Follow.is_following_active: False})
+            .filter(models.Follow.following_id == user_id, *self.id_range(models.Follow.id, after, until))
+            .update({models.Follow.is_following_active: False}, synchronize_session=False)
         )
 
-        followers = (
-            db.query(models.Follow)
-            .filter(models.Follow.following_id == user_id)
-            .all()
+        self.update_users_followings_count(
+            db, user_ids=self.select_follower_ids_by_user_id(user_id, after, until)
         )
 
-        for follower in followers:
-            self.update_user_followings_count(
-                db, user_id=follower.__dict__["follower_id"]
-            )
+        return updated
 
-    def deactivate_followings_by_user_id(self, db: Session, user_id: int):
-        (
+    def deactivate_followings_by_user_id(self, db: Session, user_id: int, after: int | None = None, until: int | None = None) -> int:
+        updated = (
             db.query(models.Follow)
-            .filter(models.Follow.follower_id == user_id)
-            .update({models.Follow.is_follower_active: False})
+            .filter(models.Follow.follower_id == user_id, *self.id_range(models.Follow.id, after, until))
+            .update({models.Follow.is_follower_active: False}, synchronize_session=False)
         )
 
-        followings = (
-            db.query(models.Follow)
-            .filter(models.Follow.follower_id == user_id)
-            .all()
+        self.update_users_followers_count(
+            db, user_ids=self.select_following_ids_by_user_id(user_id, after, until)
         )
 
-        for following in followings:
-            self.update_user_followers_count(
-                db, user_id=following.__dict__["following_id"]
-            )
+        return updated
 
     def deactivate_likes_by_post_id(self, db: Session, post_id: int):
         (
             db.query(models.Like)
             .filter(models.Like.post_id == post_id)
-            .update({models.Like.is_post_active: False})
+            .update(self.hide_likes(models.Like.HIDDEN_BY_POST))
         )
 
     def deactivate_likes_by_comment_id(self, db: Session, comment_id: int):
         (
             db.query(models.Like)
             .filter(models.Like.comment_id == comment_id)
-            .update({models.Like.is_comment_active: False})
+            .update(self.hide_likes(models.Like.HIDDEN_BY_COMMENT))
         )
 
-    def deactivate_likes_post_owner_by_post_id(self, db: Session, post_id: int):
-        (
-            db.query(models.Like)
-            .filter(models.Like.post_id == post_id)
-            .update({models.Like.is_post_owner_active: False})
+    def hide_likes(self, reason: int) -> dict:
+        return {models.Like.hidden_by: models.Like.hidden_by.bitwise_or(reason)}
+
+    def show_likes(self, reason: int) -> dict:
+        return {models.Like.hidden_by: models.Like.hidden_by.bitwise_and(~reason)}
+
+    def get_owner_loaders(self, *relationships: InstrumentedAttribute) -> list:
+        loader = {
+            "selectin": selectinload,
+            "joined": joinedload,
+        }.get(settings.OWNER_LOADING)
+
+        if loader is None:
+            return []
+
+        return [
+            loader(relationship).load_only(
+                models.User.id,
+                models.User.username,
+                models.User.name,
+                models.User.is_superuser,
+            )
+            for relationship in relationships
+        ]
+
+    def id_range(self, column: InstrumentedAttribute, after: int | None, until: int | None) -> list:
+        conditions = []
+
+        if after is not None:
+            conditions.append(column > after)
+
+        if until is not None:
+            conditions.append(column <= until)
+
+        return conditions
+
+    def select_post_ids_by_owner_id(self, owner_id: int, after: int | None = None, until: int | None = None) -> Select:
+        return (
+            select(models.Post.id)
+            .where(models.Post.owner_id == owner_id, *self.id_range(models.Post.id, after, until))
         )
 
-    def deactivate_likes_comment_owner_by_comment_id(self, db: Session, comment_id: int):
-        (
-            db.query(models.Like)
-            .filter(models.Like.comment_id == comment_id)
-            .update({models.Like.is_comment_owner_active: False})
+    def select_comment_ids_by_owner_id(self, owner_id: int, after: int | None = None, until: int | None = None) -> Select:
+        return (
+            select(models.Comment.id)
+            .where(models.Comment.owner_id == owner_id, *self.id_range(models.Comment.id, after, until))
+        )
+
+    def select_commented_post_ids_by_owner_id(self, owner_id: int, after: int | None = None, until: int | None = None) -> Select:
+        return (
+            select(models.Comment.post_id)
+            .where(models.Comment.owner_id == owner_id, *self.id_range(models.Comment.id, after, until))
+        )
+
+    def select_liked_post_ids_by_owner_id(self, owner_id: int, after: int | None = None, until: int | None = None) -> Select:
+        return (
+            select(models.Like.post_id)
+            .where(models.Like.owner_id == owner_id, models.Like.post_id.is_not(None))
+            .where(*self.id_range(models.Like.id, after, until))
+        )
+
+    def select_liked_comment_ids_by_owner_id(self, owner_id: int, after: int | None = None, until: int | None = None) -> Select:
+        return (
+            select(models.Like.comment_id)
+            .where(models.Like.owner_id == owner_id, models.Like.comment_id.is_not(None))
+            .where(*self.id_range(models.Like.id, after, until))
+        )
+
+    def select_follower_ids_by_user_id(self, user_id: int, after: int | None = None, until: int | None = None) -> Select:
+        return (
+            select(models.Follow.follower_id)
+            .where(models.Follow.following_id == user_id, *self.id_range(models.Follow.id, after, until))
+        )
+
+    def select_following_ids_by_user_id(self, user_id: int, after: int | None = None, until: int | None = None) -> Select:
+        return (
+            select(models.Follow.following_id)
+            .where(models.Follow.follower_id == user_id, *self.id_range(models.Follow.id, after, until))
         )
 
     def update_user_posts_count(self, db: Session, owner_id: int):
@@ -313,9 +426,12 @@ class Utils():
         )
 
     def update_post_likes_count(self, db: Session, post_id: int):
+        self.delete_post_like_shards(db, post_ids=[post_id])
+        self.discard_pending_counts(db, "posts.likes", ids=[post_id])
+
         count = (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.post_id == post_id)
             .count()
         )
@@ -327,9 +443,11 @@ class Utils():
         )
 
     def update_comment_likes_count(self, db: Session, comment_id: int):
+        self.discard_pending_counts(db, "comments.likes", ids=[comment_id])
+
         count = (
             db.query(models.Like)
-            .filter(models.Like.is_comment_active == True, models.Like.is_post_active == True, models.Like.is_owner_active == True)
+            .filter(models.Like.is_visible == True)
             .filter(models.Like.comment_id == comment_id)
             .count()
         )
@@ -368,5 +486,202 @@ class Utils():
             .update({models.User.followings: count})
         )
 
+    def update_posts_comments_count(self, db: Session, post_ids: Select):
+        self.recount(db, *self.counters["posts.comments"], ids=post_ids)
+
+    def update_posts_likes_count(self, db: Session, post_ids: Select):
+        self.delete_post_like_shards(db, post_ids=post_ids)
+        self.discard_pending_counts(db, "posts.likes", ids=post_ids)
+        self.recount(db, *self.counters["posts.likes"], ids=post_ids)
+
+    def update_comments_likes_count(self, db: Session, comment_ids: Select):
+        self.discard_pending_counts(db, "comments.likes", ids=comment_ids)
+        self.recount(db, *self.counters["comments.likes"], ids=comment_ids)
+
+    def update_users_followers_count(self, db: Session, user_ids: Select):
+        self.recount(db, *self.counters["users.followers"], ids=user_ids)
+
+    def update_users_followings_count(self, db: Session, user_ids: Select):
+        self.recount(db, *self.counters["users.followings"], ids=user_ids)
+
+    def discard_pending_counts(self, db: Session, name: str, ids: Select | list[int]):
+        pending = counter_buffer.get_pending(name)
+        if not pending:
+            return
+
+        if isinstance(ids, Select):
+            target = self.counters[name][0].class_
+            ids = db.scalars(
+                select(target.id).where(target.id.in_(ids), target.id.in_(list(pending)))
+            ).all()
+
+        self.on_commit(db, counter_buffer.discard, name, list(ids))
+
+    def recount(self, db: Session, counter: InstrumentedAttribute, key: InstrumentedAttribute, filters: tuple, ids: Select):
+        target = counter.class_
+
+        counts = (
+            select(key.label("id"), func.count().label("count"))
+            .where(key.in_(ids), *filters)
+            .group_by(key)
+            .subquery()
+        )
+        targets = (
+            select(target.id, func.coalesce(counts.c.count, 0).label("count"))
+            .outerjoin(counts, counts.c.id == target.id)
+            .where(target.id.in_(ids))
+            .subquery()
+        )
+
+        db.execute(
+            update(target)
+            .where(target.id == targets.c.id)
+            .values({counter: targets.c.count})
+            .execution_options(synchronize_session=False)
+        )
+
+    def adjust_user_posts_count(self, db: Session, owner_id: int, delta: int):
+        (
+            db.query(models.User)
+            .filter(models.User.id == owner_id)
+            .update({models.User.posts: models.User.posts + delta})
+        )
+
+    def adjust_post_comments_count(self, db: Session, post_id: int, delta: int):
+        (
+            db.query(models.Post)
+            .filter(models.Post.id == post_id)
+            .update({models.Post.comments: models.Post.comments + delta})
+        )
+
+    def adjust_post_likes_count(self, db: Session, post_id: int, delta: int):
+        if settings.LIKE_COUNTER_MODE == "sharded":
+            self.adjust_post_like_shard(db, post_id=post_id, delta=delta)
+            return
+
+        if settings.LIKE_COUNTER_MODE == "buffered":
+            self.on_commit(
+                db, counter_buffer.add,
+                "posts.likes", post_id, delta, settings.LIKE_BUFFER_MAX_EVENTS,
+            )
+            return
+
+        (
+            db.query(models.Post)
+            .filter(models.Post.id == post_id)
+            .update({models.Post.likes: models.Post.likes + delta})
+        )
+
+    def get_insert(self, db: Session):
+        return {
+            "postgresql": postgresql.insert,
+            "sqlite": sqlite.insert,
+        }[db.get_bind().dialect.name]
+
+    def adjust_post_like_shard(self, db: Session, post_id: int, delta: int):
+        insert = self.get_insert(db)
+
+        statement = insert(models.PostLikeShard).values(
+            post_id=post_id,
+            shard=random.randrange(settings.LIKE_COUNTER_SHARDS),
+            likes=delta,
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    models.PostLikeShard.post_id, models.PostLikeShard.shard
+                ],
+                set_={"likes": models.PostLikeShard.likes + statement.excluded.likes},
+            )
+        )
+
+    def fold_post_like_shards(self, db: Session, after: int | None = None, until: int | None = None) -> int:
+        shards = (
+            db.query(
+                models.PostLikeShard.post_id,
+                models.PostLikeShard.shard,
+                models.PostLikeShard.likes,
+            )
+            .filter(models.PostLikeShard.likes != 0)
+            .filter(*self.id_range(models.PostLikeShard.post_id, after, until))
+            .all()
+        )
+
+        if not shards:
+            return 0
+
+        deltas: dict[int, int] = defaultdict(int)
+        for post_id, _, likes in shards:
+            deltas[post_id] += likes
+
+        shard_table = models.PostLikeShard.__table__
+        db.execute(
+            update(shard_table)
+            .where(shard_table.c.post_id == bindparam("_post_id"))
+            .where(shard_table.c.shard == bindparam("_shard"))
+            .values(likes=shard_table.c.likes - bindparam("_likes")),
+            [
+                {"_post_id": post_id, "_shard": shard, "_likes": likes}
+                for post_id, shard, likes in shards
+            ],
+        )
+
+        post_table = models.Post.__table__
+        db.execute(
+            update(post_table)
+            .where(post_table.c.id == bindparam("_id"))
+            .values(likes=post_table.c.likes + bindparam("_delta")),
+            [{"_id": post_id, "_delta": delta} for post_id, delta in deltas.items()],
+        )
+
+        return len(deltas)
+
+    def delete_post_like_shards(self, db: Session, post_ids: Select | list[int]):
+        db.execute(
+            delete(models.PostLikeShard)
+            .where(models.PostLikeShard.post_id.in_(post_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    def adjust_comment_likes_count(self, db: Session, comment_id: int, delta: int):
+        if settings.LIKE_COUNTER_MODE == "buffered":
+            self.on_commit(
+                db, counter_buffer.add,
+                "comments.likes", comment_id, delta, settings.LIKE_BUFFER_MAX_EVENTS,
+            )
+            return
+
+        (
+            db.query(models.Comment)
+            .filter(models.Comment.id == comment_id)
+            .update({models.Comment.likes: models.Comment.likes + delta})
+        )
+
+    def adjust_user_followers_count(self, db: Session, user_id: int, delta: int):
+        (
+            db.query(models.User)
+            .filter(models.User.id == user_id)
+            .update({models.User.followers: models.User.followers + delta})
+        )
+
+    def adjust_user_followings_count(self, db: Session, user_id: int, delta: int):
+        (
+            db.query(models.User)
+            .filter(models.User.id == user_id)
+            .update({models.User.followings: models.User.followings + delta})
+        )
+
+    def is_post_counted(self, db_post: models.Post) -> bool:
+        return bool(db_post.is_active and db_post.is_owner_active)
+
+    def is_comment_counted(self, db_comment: models.Comment) -> bool:
+        return bool(db_comment.is_active and db_comment.is_owner_active)
+
+    def is_like_counted(self, db_like: models.Like) -> bool:
+        return bool(db_like.is_visible)
+
+    def is_follow_counted(self, db_follow: models.Follow) -> bool:
+        return bool(db_follow.is_follower_active and db_follow.is_following_active)
+
 
 utils = Utils()
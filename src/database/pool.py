@@ -0,0 +1,132 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from src.core.config import settings
+
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolMetrics():
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_out = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.disconnects = 0
+        self.invalidations = 0
+        self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_ms_sum = 0.0
+
+    def listen(self, engine: Engine):
+        event.listen(engine, "connect", self.on_connect)
+        event.listen(engine, "close", self.on_close)
+        event.listen(engine, "close_detached", self.on_close)
+        event.listen(engine, "invalidate", self.on_invalidate)
+        event.listen(engine, "checkout", self.on_checkout)
+        event.listen(engine, "checkin", self.on_checkin)
+
+    @contextmanager
+    def wait(self, blocked: bool):
+        if blocked:
+            with self.lock:
+                self.waiting += 1
+
+        start = time.perf_counter()
+        try:
+            yield
+
+        finally:
+            wait_ms = (time.perf_counter() - start) * 1000
+
+            with self.lock:
+                if blocked:
+                    self.waiting -= 1
+                self.wait_counts[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+                self.wait_ms_sum += wait_ms
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.connects += 1
+
+    def on_close(self, dbapi_connection, *args):
+        with self.lock:
+            self.disconnects += 1
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self.lock:
+            self.invalidations += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self.lock:
+            self.checked_out += 1
+            self.checkouts += 1
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self.lock:
+            self.checked_out -= 1
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "mode": settings.DATABASE_POOL_MODE,
+                "size": settings.DATABASE_POOL_SIZE,
+                "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+                "checked_out": self.checked_out,
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "disconnects": self.disconnects,
+                "invalidations": self.invalidations,
+                "wait_ms": {
+                    str(bucket): count
+                    for bucket, count in zip([*WAIT_BUCKETS_MS, "+Inf"], self.wait_counts)
+                },
+                "wait_ms_sum": self.wait_ms_sum,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredPool():
+    def is_exhausted(self) -> bool:
+        if not isinstance(self, QueuePool) or self._max_overflow < 0:
+            return False
+
+        return self.checkedout() >= self.size() + self._max_overflow
+
+    def _do_get(self):
+        with pool_metrics.wait(blocked=self.is_exhausted()):
+            return super()._do_get()
+
+
+class MeteredQueuePool(MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+
+class MeteredNullPool(MeteredPool, NullPool):
+    pass
+
+
+def get_pool_options(is_async: bool = False) -> dict:
+    if settings.DATABASE_POOL_MODE == "null":
+        return {"poolclass": MeteredNullPool, "pool_pre_ping": settings.DATABASE_POOL_PRE_PING}
+
+    return {
+        "poolclass": MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
@@ -0,0 +1,76 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src.core.config import settings
+
+
+class RoutingSession(Session):
+    def __init__(self, *args, replicas: list[Engine] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = random.choice(replicas) if replicas else None
+
+    def is_write(self, clause) -> bool:
+        if clause is None:
+            return False
+
+        return (
+            clause.is_dml
+            or getattr(clause, "_for_update_arg", None) is not None
+            or clause._execution_options.get("is_write", False)
+        )
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or self.is_write(clause):
+            self.info["wrote"] = True
+
+        if self.replica is not None and self.info.get("use_replica") and not self.info.get("wrote"):
+            return self.replica
+
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    @contextmanager
+    def primary(self):
+        use_replica = self.info.get("use_replica")
+        self.info["use_replica"] = False
+
+        try:
+            yield self
+
+        finally:
+            self.info["use_replica"] = use_replica
+
+
+class ReadYourWrites():
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.written_at: dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def mark(self, key: str):
+        now = time.monotonic()
+
+        with self.lock:
+            self.written_at.pop(key, None)
+            self.written_at[key] = now
+
+            while len(self.written_at) > self.maxsize:
+                del self.written_at[next(iter(self.written_at))]
+
+    def is_recent(self, key: str) -> bool:
+        written_at = self.written_at.get(key)
+
+        return (
+            written_at is not None
+            and time.monotonic() - written_at < settings.REPLICA_READ_YOUR_WRITES_SECONDS
+        )
+
+    def clear(self):
+        with self.lock:
+            self.written_at.clear()
+
+
+read_your_writes = ReadYourWrites()
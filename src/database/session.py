@@ -1,14 +1,68 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from src.core.config import settings
+from src.database.pool import get_pool_options, pool_metrics
+from src.database.routing import RoutingSession
 
-url = settings.DATABASE_URL
-if url and url.startswith("postgres://"):
-    url = url.replace("postgres://", "postgresql://", 1)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-engine = create_engine(url)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_async_url(url: str) -> str:
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+def get_url(url: str) -> str:
+    if url and url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+
+    return url
+
+
+url = get_url(settings.DATABASE_URL)
+
+engine = create_engine(url, **get_pool_options())
+pool_metrics.listen(engine)
+
+replica_engines = [
+    create_engine(get_url(replica_url), **get_pool_options())
+    for replica_url in settings.DATABASE_REPLICA_URLS
+]
+for replica_engine in replica_engines:
+    pool_metrics.listen(replica_engine)
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession, replicas=replica_engines,
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine,
+)
+
+async_engine = None
+async_replica_engines = []
+AsyncSessionLocal = None
+
+if settings.DATABASE_ASYNC_ACTIVE_POSTS:
+    async_engine = create_async_engine(
+        get_async_url(url), **get_pool_options(is_async=True)
+    )
+    async_replica_engines = [
+        create_async_engine(
+            get_async_url(get_url(replica_url)), **get_pool_options(is_async=True)
+        )
+        for replica_url in settings.DATABASE_REPLICA_URLS
+    ]
+    pool_metrics.listen(async_engine.sync_engine)
+    for async_replica_engine in async_replica_engines:
+        pool_metrics.listen(async_replica_engine.sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(
+        sync_session_class=RoutingSession,
+        replicas=[replica_engine.sync_engine for replica_engine in async_replica_engines],
+        bind=async_engine, autoflush=False, expire_on_commit=False,
+    )
 
 Base = declarative_base()
@@ -2,10 +2,14 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src import crud
 from src.api.api_v1.api import api_router
 from src.core.config import settings
+from src.core.worker import (like_buffer_flusher, like_shard_folder,
+                             rate_limit_pruner, token_version_refresher,
+                             worker)
 from src.database.init_db import init_db
-from src.database.session import SessionLocal
+from src.database.session import SessionLocal, engine
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -25,5 +29,60 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 
 init_db(db=SessionLocal())
 
+
+@app.on_event("startup")
+def resume_jobs():
+    worker.resume(bind=engine)
+
+
+@app.on_event("startup")
+def start_like_shard_folder():
+    if settings.LIKE_COUNTER_MODE == "sharded":
+        like_shard_folder.start(
+            bind=engine, interval=settings.LIKE_COUNTER_FOLD_SECONDS
+        )
+
+
+@app.on_event("startup")
+def start_like_buffer_flusher():
+    if settings.LIKE_COUNTER_MODE == "buffered":
+        like_buffer_flusher.start(
+            bind=engine, interval=settings.LIKE_BUFFER_FLUSH_MS / 1000
+        )
+
+
+@app.on_event("startup")
+def load_user_autocomplete():
+    if settings.USER_AUTOCOMPLETE_ENABLED:
+        with SessionLocal() as db:
+            crud.autocomplete.load(db)
+
+
+@app.on_event("startup")
+def start_token_version_refresher():
+    with SessionLocal() as db:
+        crud.token_version.load(db)
+
+    token_version_refresher.start(
+        bind=engine, interval=settings.TOKEN_VERSION_REFRESH_SECONDS
+    )
+
+
+@app.on_event("startup")
+def start_rate_limit_pruner():
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND == "database":
+        rate_limit_pruner.start(
+            bind=engine, interval=settings.RATE_LIMIT_PRUNE_SECONDS
+        )
+
+
+@app.on_event("shutdown")
+def stop_worker():
+    worker.stop()
+    like_shard_folder.stop()
+    like_buffer_flusher.stop()
+    token_version_refresher.stop()
+    rate_limit_pruner.stop()
+
 if __name__ == "__main__":
     uvicorn.run("main:app", reload=True)
@@ -1,5 +1,8 @@
 from .comment import Comment
 from .follow import Follow
+from .job import Job
 from .like import Like
 from .post import Post
+from .post_like_shard import PostLikeShard
+from .rate_limit_bucket import RateLimitBucket
 from .user import User
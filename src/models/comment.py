@@ -1,14 +1,16 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
+                        String, and_)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database.session import Base
+from src.models.index import partial_index, search_index, search_table
 
 
 class Comment(Base):
     __tablename__ = "comments"
 
     id = Column(Integer, primary_key=True, index=True)
-    text = Column(String, index=True)
+    text = Column(String)
     likes = Column(Integer, default=0)
     post_id = Column(Integer, ForeignKey("posts.id"))
     owner_id = Column(Integer, ForeignKey("users.id"))
@@ -24,3 +26,25 @@ class Comment(Base):
     )
 
     owner = relationship("User", back_populates="comment_owner")
+
+    __table_args__ = (
+        search_index("ix_comments_text_search", text),
+        Index("ix_comments_owner_id_id", owner_id, id),
+        Index("ix_comments_post_id_id", post_id, id),
+        partial_index(
+            "ix_comments_active_id", id,
+            where=and_(is_active == True, is_owner_active == True),
+        ),
+        partial_index(
+            "ix_comments_active_owner_id_id", owner_id, id,
+            where=and_(is_active == True, is_owner_active == True),
+        ),
+        partial_index(
+            "ix_comments_active_post_id_id", post_id, id,
+            where=and_(is_active == True, is_owner_active == True),
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+
+search_table(Comment.__table__, "text")
@@ -1,7 +1,9 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
+                        and_)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database.session import Base
+from src.models.index import partial_index
 
 
 class Follow(Base):
@@ -23,3 +25,24 @@ class Follow(Base):
     following = relationship(
         "User", back_populates="following_owner", foreign_keys=[following_id]
     )
+
+    __table_args__ = (
+        Index(
+            "ix_follows_follower_id_following_id", follower_id, following_id,
+            unique=True,
+        ),
+        Index("ix_follows_follower_id_id", follower_id, id),
+        Index("ix_follows_following_id_id", following_id, id),
+        partial_index(
+            "ix_follows_active_id", id,
+            where=and_(is_follower_active == True, is_following_active == True),
+        ),
+        partial_index(
+            "ix_follows_active_follower_id_id", follower_id, id,
+            where=and_(is_follower_active == True, is_following_active == True),
+        ),
+        partial_index(
+            "ix_follows_active_following_id_id", following_id, id,
+            where=and_(is_follower_active == True, is_following_active == True),
+        ),
+    )
@@ -0,0 +1,63 @@
+from sqlalchemy import (DDL, ColumnElement, Index, Table, event, func,
+                        literal_column)
+
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def partial_index(name: str, *columns, where: ColumnElement[bool]) -> Index:
+    return Index(name, *columns, postgresql_where=where, sqlite_where=where)
+
+
+def search_document(column) -> ColumnElement:
+    return func.to_tsvector(SEARCH_CONFIG, column)
+
+
+def search_index(name: str, column) -> Index:
+    return Index(
+        name, search_document(column), postgresql_using="gin"
+    ).ddl_if(dialect="postgresql")
+
+
+def trigram_index(name: str, column) -> Index:
+    return Index(
+        name, column,
+        postgresql_using="gin",
+        postgresql_ops={column.name: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
+def require_extension(table: Table, extension: str):
+    event.listen(
+        table, "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}").execute_if(dialect="postgresql"),
+    )
+
+
+def get_search_table_ddl(table: str, column: str) -> list[str]:
+    search = f"{table}_search"
+
+    return [
+        f"CREATE VIRTUAL TABLE {search} USING fts5({column}, content='{table}', content_rowid='id')",
+        f"""CREATE TRIGGER {search}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {search}(rowid, {column}) VALUES (new.id, new.{column});
+        END""",
+        f"""CREATE TRIGGER {search}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {search}({search}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+        END""",
+        f"""CREATE TRIGGER {search}_update AFTER UPDATE OF {column} ON {table} BEGIN
+            INSERT INTO {search}({search}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+            INSERT INTO {search}(rowid, {column}) VALUES (new.id, new.{column});
+        END""",
+    ]
+
+
+def search_table(table: Table, column: str):
+    for statement in get_search_table_ddl(table.name, column):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="sqlite")
+        )
+
+    event.listen(
+        table, "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {table.name}_search").execute_if(dialect="sqlite"),
+    )
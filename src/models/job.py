@@ -0,0 +1,28 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from src.database.session import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, index=True)
+    target_id = Column(Integer, nullable=True)
+    status = Column(String, index=True, default="pending")
+    step = Column(Integer, default=0)
+    total_steps = Column(Integer)
+    cursor = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    owner = relationship("User")
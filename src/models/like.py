@@ -1,24 +1,74 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer
+from sqlalchemy import (Boolean, Column, Computed, DateTime, ForeignKey, Index,
+                        Integer)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database.session import Base
+from src.models.index import partial_index
 
 
 class Like(Base):
     __tablename__ = "likes"
 
+    HIDDEN_BY_POST = 1
+    HIDDEN_BY_COMMENT = 2
+    HIDDEN_BY_OWNER = 4
+    HIDDEN_BY_POST_OWNER = 8
+    HIDDEN_BY_COMMENT_OWNER = 16
+    UNCOUNTED = HIDDEN_BY_POST | HIDDEN_BY_COMMENT | HIDDEN_BY_OWNER
+
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=True)
     comment_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id"))
-    is_post_active = Column(Boolean, default=True)
-    is_post_owner_active = Column(Boolean, default=True)
-    is_comment_active = Column(Boolean, default=True)
-    is_comment_owner_active = Column(Boolean, default=True)
-    is_owner_active = Column(Boolean, default=True)
+    hidden_by = Column(Integer, nullable=False, default=0, server_default="0")
+    is_visible = Column(Boolean, Computed(f"(hidden_by & {UNCOUNTED}) = 0"))
 
     created_at = Column(
         DateTime(timezone=True), server_default=func.now()
     )
 
     owner = relationship("User", back_populates="like_owner")
+
+    @property
+    def is_post_active(self) -> bool:
+        return not self.hidden_by & self.HIDDEN_BY_POST
+
+    @property
+    def is_post_owner_active(self) -> bool:
+        return not self.hidden_by & self.HIDDEN_BY_POST_OWNER
+
+    @property
+    def is_comment_active(self) -> bool:
+        return not self.hidden_by & self.HIDDEN_BY_COMMENT
+
+    @property
+    def is_comment_owner_active(self) -> bool:
+        return not self.hidden_by & self.HIDDEN_BY_COMMENT_OWNER
+
+    @property
+    def is_owner_active(self) -> bool:
+        return not self.hidden_by & self.HIDDEN_BY_OWNER
+
+    __table_args__ = (
+        Index("ix_likes_post_id_owner_id", post_id, owner_id, unique=True),
+        Index("ix_likes_comment_id_owner_id", comment_id, owner_id, unique=True),
+        Index("ix_likes_owner_id_id", owner_id, id),
+        Index("ix_likes_post_id_id", post_id, id),
+        Index("ix_likes_comment_id_id", comment_id, id),
+        partial_index(
+            "ix_likes_active_id", id,
+            where=is_visible == True,
+        ),
+        partial_index(
+            "ix_likes_active_owner_id_id", owner_id, id,
+            where=is_visible == True,
+        ),
+        partial_index(
+            "ix_likes_active_post_id_id", post_id, id,
+            where=is_visible == True,
+        ),
+        partial_index(
+            "ix_likes_active_comment_id_id", comment_id, id,
+            where=is_visible == True,
+        ),
+    )
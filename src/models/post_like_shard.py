@@ -0,0 +1,10 @@
+from sqlalchemy import Column, ForeignKey, Integer
+from src.database.session import Base
+
+
+class PostLikeShard(Base):
+    __tablename__ = "post_like_shards"
+
+    post_id = Column(Integer, ForeignKey("posts.id"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    likes = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Float, String
+from src.database.session import Base
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)
+    full_at = Column(Float, nullable=False, index=True)
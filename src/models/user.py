@@ -2,6 +2,7 @@ from sqlalchemy import Boolean, Column, DateTime, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database.session import Base
+from src.models.index import partial_index, require_extension, trigram_index
 
 
 class User(Base):
@@ -19,6 +20,7 @@ class User(Base):
     followings = Column(Integer, default=0)
     is_superuser = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     created_at = Column(
         DateTime(timezone=True), server_default=func.now()
@@ -36,3 +38,13 @@ class User(Base):
     following_owner = relationship(
         "Follow", back_populates="following", foreign_keys="Follow.following_id"
     )
+
+    __table_args__ = (
+        partial_index("ix_users_active_id", id, where=is_active == True),
+        trigram_index("ix_users_username_trgm", username),
+        trigram_index("ix_users_name_trgm", name),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+
+require_extension(User.__table__, "pg_trgm")
@@ -0,0 +1,41 @@
+import argparse
+import json
+
+from src import crud
+from src.core.config import settings
+from src.database.session import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute denormalized counters and repair the drifted ones."
+    )
+    parser.add_argument(
+        "--counter",
+        action="append",
+        choices=[step.name for step in crud.reconcile.steps],
+        help="counter to reconcile, may be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.RECONCILE_CHUNK_SIZE
+    )
+    parser.add_argument(
+        "--throttle-ms", type=int, default=settings.RECONCILE_THROTTLE_MS
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        report = crud.reconcile.run(
+            db,
+            names=args.counter,
+            chunk_size=args.chunk_size,
+            throttle_seconds=args.throttle_ms / 1000,
+            dry_run=args.dry_run,
+        )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from .comment import Comment, CommentCreate, CommentUpdate
 from .follow import Follow
+from .internal import CacheStats, CounterBufferStats, PoolStats
+from .job import Job
 from .like import Like
 from .post import Post, PostCreate, PostUpdate
 from .token import Token, TokenData
 from .user import Owner, PasswordUpdate, User, UserCreate, UserUpdate
-from .util import Id
+from .util import CountMode, Id
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+
+class CounterBufferStats(BaseModel):
+    mode: str
+    pending_events: int
+    pending_rows: int
+    staleness_seconds: float
+    seconds_since_flush: float | None = None
+    flushes: int
+
+
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+
+
+class PoolStats(BaseModel):
+    mode: str
+    size: int
+    max_overflow: int
+    checked_out: int
+    waiting: int
+    checkouts: int
+    connects: int
+    disconnects: int
+    invalidations: int
+    wait_ms: dict[str, int]
+    wait_ms_sum: float
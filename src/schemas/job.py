@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    target_id: int | None = None
+    status: str
+    step: int
+    total_steps: int
+    processed: int
+    result: dict[str, dict[str, int]] | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    class Config:
+        orm_mode = True
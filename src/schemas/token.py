@@ -8,3 +8,6 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str | None = None
+    id: int | None = None
+    is_superuser: bool = False
+    version: int | None = None
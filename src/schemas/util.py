@@ -1,3 +1,5 @@
+from enum import Enum
+
 from pydantic import BaseModel
 
 
@@ -6,3 +8,9 @@ class Id(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class CountMode(str, Enum):
+    exact = "exact"
+    cached = "cached"
+    approximate = "approximate"
@@ -395,3 +395,58 @@ def test_get_active_comments_ids_by_deactivated_post_id():
     )
 
     assert response.status_code == 404
+
+
+def test_search_active_comments():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    word = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+    comments = [
+        utils.create_comment(post_id=post["id"], token=token, text=f"{word} and more"),
+        utils.create_comment(post_id=post["id"], token=token, text=f"more {word}, {word}!"),
+    ]
+    utils.create_comment(post_id=post["id"], token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-comments/search",
+        params={"q": word},
+    )
+
+    assert response.status_code == 200
+    assert sorted(comment["id"] for comment in response.json()) == [comment["id"] for comment in comments]
+
+
+def test_search_active_comments_with_cursor():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    word = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+    comments = [
+        utils.create_comment(post_id=post["id"], token=token, text=" ".join([word] * (i % 3 + 1)))
+        for i in range(5)
+    ]
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"q": word, "limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+
+        response = client.get(
+            f"{settings.API_V1_STR}/active-comments/search",
+            params=params,
+        )
+        ids += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+
+        assert response.status_code == 200
+        if cursor is None:
+            break
+
+    assert sorted(ids) == [comment["id"] for comment in comments]
@@ -369,6 +369,46 @@ def test_get_active_likes_ids_by_post_id_is_all_active():
     assert len(new_ids) == 0
 
 
+def test_stream_active_likes_ids_by_post_id(monkeypatch):
+    monkeypatch.setattr(settings, "IDS_STREAM_BATCH_SIZE", 2)
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    for _ in range(5):
+        liker_token = utils.create_user(
+            username=utils.random_lower_string(),
+            password=utils.random_lower_string(),
+        )
+        utils.like_post(post_id=post["id"], token=liker_token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-likes/post/ids/stream/{post['id']}",
+    )
+    ids = utils.get_active_likes_ids_by_post_id(post_id=post["id"])
+
+    assert response.status_code == 200
+    assert len(ids) == 5
+    assert response.json() == ids
+
+
+def test_stream_active_likes_ids_by_not_existing_post_id():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-likes/post/ids/stream/{post['id'] + 1}",
+    )
+
+    assert response.status_code == 404
+
+
 def test_get_active_likes_ids_by_not_existing_post_id():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
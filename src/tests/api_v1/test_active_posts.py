@@ -1,4 +1,5 @@
 from src.core.config import settings
+from src.core.cursor import encode_cursor
 from src.tests.conftest import client
 from src.tests.utils import utils
 
@@ -11,6 +12,40 @@ def test_get_all_active_posts():
     assert response.status_code == 200
 
 
+def test_get_all_active_posts_statements_count_is_constant():
+    def get_page_statements_count(posts: list[dict]) -> int:
+        with utils.count_statements() as statements:
+            response = client.get(
+                f"{settings.API_V1_STR}/active-posts/all/",
+                params={
+                    "cursor": encode_cursor(posts[0]["id"] - 1),
+                    "limit": len(posts),
+                },
+            )
+
+        assert response.status_code == 200
+        assert [post["id"] for post in response.json()] == [post["id"] for post in posts]
+        return len(statements)
+
+    token = utils.create_user(
+        username=utils.random_lower_string(),
+        password=utils.random_lower_string(),
+    )
+    same_owner_posts = [utils.create_post(token=token) for _ in range(3)]
+
+    different_owner_posts = [
+        utils.create_post(
+            token=utils.create_user(
+                username=utils.random_lower_string(),
+                password=utils.random_lower_string(),
+            )
+        )
+        for _ in range(3)
+    ]
+
+    assert get_page_statements_count(same_owner_posts) == get_page_statements_count(different_owner_posts)
+
+
 def test_get_all_active_posts_is_all_active():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -101,6 +136,52 @@ def test_get_all_active_posts_count_is_all_active():
     assert new_count == count - 1
 
 
+def test_get_all_active_posts_cached_count_after_post_created():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/count/",
+        params={"mode": "cached"},
+    )
+    count = response.json()
+
+    utils.create_post(token=token)
+    new_count = utils.get_all_active_posts_count(mode="cached")
+
+    assert response.status_code == 200
+    assert response.headers["X-Count-Mode"] == "cached"
+    assert new_count == count + 1
+
+
+def test_get_all_active_posts_approximate_count():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    utils.create_post(token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/count/",
+        params={"mode": "approximate"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Count-Mode"] == "approximate"
+    assert response.json() > 0
+
+
+def test_get_all_active_posts_count_with_invalid_mode():
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/count/",
+        params={"mode": "guess"},
+    )
+
+    assert response.status_code == 422
+
+
 def test_get_all_active_posts_ids():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -230,6 +311,50 @@ def test_get_active_posts_ids_by_owner_id_is_all_active():
     assert len(new_ids) == 0
 
 
+def test_get_active_posts_ids_by_owner_id_with_cursor():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+    posts = [utils.create_post(token=token) for _ in range(5)]
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+
+        response = client.get(
+            f"{settings.API_V1_STR}/active-posts/owner/ids/{user['id']}",
+            params=params,
+        )
+        ids += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+
+        assert response.status_code == 200
+        if cursor is None:
+            break
+
+    assert ids == [post["id"] for post in posts]
+
+
+def test_get_active_posts_ids_by_owner_id_with_invalid_cursor():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/owner/ids/{user['id']}",
+        params={"cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == 400
+
+
 def test_get_active_posts_ids_by_not_existing_owner_id():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -257,3 +382,75 @@ def test_get_active_posts_ids_by_deactivated_owner_id():
     )
 
     assert response.status_code == 404
+
+
+def test_search_active_posts():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    word = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    posts = [
+        utils.create_post(token=token, text=f"{word} and more"),
+        utils.create_post(token=token, text=f"more {word}, {word}!"),
+    ]
+    utils.create_post(token=token)
+    deactivated_post = utils.create_post(token=token, text=word)
+    utils.deactivate_post(post_id=deactivated_post["id"], token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/search",
+        params={"q": word.upper()},
+    )
+
+    assert response.status_code == 200
+    assert sorted(post["id"] for post in response.json()) == [post["id"] for post in posts]
+
+
+def test_search_active_posts_with_cursor():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    word = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    posts = [
+        utils.create_post(token=token, text=" ".join([word] * (i % 3 + 1)))
+        for i in range(5)
+    ]
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"q": word, "limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+
+        response = client.get(
+            f"{settings.API_V1_STR}/active-posts/search",
+            params=params,
+        )
+        ids += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+
+        assert response.status_code == 200
+        if cursor is None:
+            break
+
+    assert sorted(ids) == [post["id"] for post in posts]
+
+
+def test_search_active_posts_with_invalid_cursor():
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/search",
+        params={"q": utils.random_lower_string(), "cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_search_active_posts_without_query():
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/search",
+    )
+
+    assert response.status_code == 422
@@ -1,8 +1,20 @@
+import pytest
+from src import crud, models
 from src.core.config import settings
-from src.tests.conftest import client
+from src.tests.conftest import TestingSessionLocal, client
 from src.tests.utils import utils
 
 
+@pytest.fixture
+def autocomplete():
+    with TestingSessionLocal() as db:
+        crud.autocomplete.load(db)
+
+    yield crud.autocomplete
+
+    crud.autocomplete.clear()
+
+
 def test_get_all_active_users():
     response = client.get(
         f"{settings.API_V1_STR}/active-users/all/",
@@ -90,3 +102,121 @@ def test_get_all_active_users_count_is_all_active():
     new_count = utils.get_all_active_users_count()
 
     assert new_count == count - 1
+
+
+def test_search_active_users_by_username_prefix():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-users/search",
+        params={"q": username[:12].upper()},
+    )
+
+    assert response.status_code == 200
+    assert [found["id"] for found in response.json()] == [user["id"]]
+
+
+def test_search_active_users_by_name():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    last_name = utils.random_lower_string()
+
+    utils.create_user(username=username, password=password, name=f"first {last_name}")
+    user = utils.get_active_user(username=username)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-users/search",
+        params={"q": last_name[:12]},
+    )
+
+    assert response.status_code == 200
+    assert [found["id"] for found in response.json()] == [user["id"]]
+
+
+def test_search_active_users_escapes_wildcards():
+    response = client.get(
+        f"{settings.API_V1_STR}/active-users/search",
+        params={"q": "%"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_search_active_users_without_deactivated_user():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    utils.deactivate_user(username=username, token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-users/search",
+        params={"q": username},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_search_active_users_with_autocomplete(autocomplete):
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    last_name = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password, name=f"first {last_name}")
+    user = utils.get_active_user(username=username)
+
+    with utils.count_statements() as statements:
+        by_username = client.get(
+            f"{settings.API_V1_STR}/active-users/search",
+            params={"q": username[:12].upper(), "limit": 1},
+        )
+        by_name = client.get(
+            f"{settings.API_V1_STR}/active-users/search",
+            params={"q": last_name[:12], "limit": 1},
+        )
+
+    assert statements == []
+    assert [found["id"] for found in by_username.json()] == [user["id"]]
+    assert [found["id"] for found in by_name.json()] == [user["id"]]
+
+    utils.deactivate_user(username=username, token=token)
+    response = client.get(
+        f"{settings.API_V1_STR}/active-users/search",
+        params={"q": username},
+    )
+
+    assert response.json() == []
+
+
+def test_search_active_users_falls_back_when_autocomplete_misses(autocomplete):
+    username = utils.random_lower_string()
+
+    with TestingSessionLocal() as db:
+        db.add(models.User(
+            username=username, hashed_password="", name="", is_superuser=False, is_active=True
+        ))
+        db.commit()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-users/search",
+        params={"q": username[:12]},
+    )
+
+    assert response.status_code == 200
+    assert [found["username"] for found in response.json()] == [username]
+
+
+def test_search_active_users_limit_is_bounded():
+    for limit in (0, 51):
+        response = client.get(
+            f"{settings.API_V1_STR}/active-users/search",
+            params={"q": "a", "limit": limit},
+        )
+
+        assert response.status_code == 422
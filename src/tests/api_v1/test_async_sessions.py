@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from src.api import deps
+from src.core.config import settings
+from src.database.routing import ReadYourWrites, RoutingSession
+from src.database.session import Base, get_async_url
+from src.tests.conftest import client
+from src.tests.utils import utils
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def async_sessions(monkeypatch):
+    # every TestClient request runs on its own event loop, so connections
+    # must not be pooled across requests
+    async_engine = create_async_engine(
+        get_async_url(settings.TEST_DATABASE_URL), poolclass=NullPool
+    )
+
+    def get_sync_session():
+        raise AssertionError("sync session opened in async mode")
+
+    def forbid_sync_sessions():
+        monkeypatch.setattr(deps, "SessionLocal", get_sync_session)
+
+    monkeypatch.setattr(deps, "AsyncSessionLocal", async_sessionmaker(
+        sync_session_class=RoutingSession,
+        bind=async_engine, autoflush=False, expire_on_commit=False,
+    ))
+
+    yield forbid_sync_sessions
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def async_replica(monkeypatch, tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    async_engine = create_async_engine(
+        get_async_url(settings.TEST_DATABASE_URL), poolclass=NullPool
+    )
+    async_replica_engine = create_async_engine(get_async_url(url), poolclass=NullPool)
+    Base.metadata.create_all(bind=create_engine(url))
+
+    monkeypatch.setattr(deps, "read_your_writes", ReadYourWrites())
+    monkeypatch.setattr(deps, "AsyncSessionLocal", async_sessionmaker(
+        sync_session_class=RoutingSession,
+        replicas=[async_replica_engine.sync_engine],
+        bind=async_engine, autoflush=False, expire_on_commit=False,
+    ))
+
+    yield
+    async_engine.sync_engine.dispose()
+    async_replica_engine.sync_engine.dispose()
+
+
+def test_get_active_post_with_async_session(async_sessions):
+    username = utils.random_lower_string()
+    token = utils.create_user(username=username, password=utils.random_lower_string())
+    post = utils.create_post(token=token)
+    async_sessions()
+
+    response = client.get(f"{settings.API_V1_STR}/active-posts/{post['id']}")
+
+    assert response.status_code == 200
+    assert response.json()["text"] == post["text"]
+    assert response.json()["owner"]["username"] == username
+
+
+def test_get_all_active_posts_with_async_session(async_sessions):
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    utils.create_post(token=token)
+    async_sessions()
+
+    response = client.get(f"{settings.API_V1_STR}/active-posts/all/")
+    count = client.get(f"{settings.API_V1_STR}/active-posts/count/")
+
+    assert response.status_code == 200
+    assert count.status_code == 200
+    assert count.json() >= 1
+    assert response.json()
+
+
+def test_get_not_existing_active_post_with_async_session(async_sessions):
+    async_sessions()
+
+    response = client.get(f"{settings.API_V1_STR}/active-posts/0")
+
+    assert response.status_code == 404
+
+
+def test_async_reads_go_to_replica(async_replica):
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    post = utils.create_post(token=token)
+    deps.read_your_writes.clear()
+
+    response = client.get(f"{settings.API_V1_STR}/active-posts/{post['id']}")
+
+    assert response.status_code == 404
+
+
+def test_async_reads_after_own_write_go_to_primary(async_replica):
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    post = utils.create_post(token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/{post['id']}",
+        headers=token,
+    )
+
+    assert response.status_code == 200
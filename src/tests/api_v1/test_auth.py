@@ -1,5 +1,10 @@
+import asyncio
+import threading
+
+from src import crud
+from src.core import security
 from src.core.config import settings
-from src.tests.conftest import client
+from src.tests.conftest import TestingSessionLocal, client
 from src.tests.utils import utils
 
 
@@ -91,3 +96,143 @@ def test_signin_with_wrong_password():
     )
 
     assert response.status_code == 401
+
+
+def test_signup_token_claims():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+
+    payload = security.decode_access_token(token["Authorization"].split()[1])
+
+    assert payload["sub"] == username
+    assert payload["uid"] == user["id"]
+    assert payload["su"] is False
+    assert payload["ver"] == 0
+
+
+def test_create_post_without_loading_current_user():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    utils.create_post(token=token)
+    crud.user.cache.clear()
+
+    with utils.count_statements() as statements:
+        response = client.post(
+            f"{settings.API_V1_STR}/posts/",
+            headers=token,
+            json={"text": utils.random_lower_string()},
+        )
+
+    assert response.status_code == 200
+    assert not [
+        statement for statement in statements
+        if "WHERE users.username" in statement
+    ]
+
+
+def test_password_update_revokes_tokens():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    utils.create_post(token=token)
+
+    with TestingSessionLocal() as db:
+        crud.user.update_password(
+            db, username=username, new_password=utils.random_lower_string()
+        )
+
+    response = client.post(
+        f"{settings.API_V1_STR}/posts/",
+        headers=token,
+        json={"text": utils.random_lower_string()},
+    )
+
+    assert response.status_code == 401
+
+
+def test_username_update_revokes_tokens():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+
+    new_username = utils.random_lower_string()
+    client.put(
+        f"{settings.API_V1_STR}/users/",
+        headers=token,
+        json={"username": new_username, "name": username, "bio": ""},
+    )
+
+    response = client.post(
+        f"{settings.API_V1_STR}/posts/",
+        headers=token,
+        json={"text": utils.random_lower_string()},
+    )
+    new_token = utils.authentication_headers(username=new_username, password=password)
+    new_response = client.post(
+        f"{settings.API_V1_STR}/posts/",
+        headers=new_token,
+        json={"text": utils.random_lower_string()},
+    )
+
+    assert response.status_code == 401
+    assert new_response.status_code == 200
+
+
+def test_signin_when_password_hasher_is_busy(monkeypatch):
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    utils.create_user(username=username, password=password)
+
+    password_hasher = security.PasswordHasher(workers=1, queue_size=0)
+    monkeypatch.setattr(security, "password_hasher", password_hasher)
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def hash_slowly():
+        started.set()
+        release.wait()
+
+    busy = password_hasher.submit(hash_slowly)
+    started.wait()
+
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/signin",
+        data={"username": username, "password": password},
+    )
+    release.set()
+    busy.result()
+
+    retry = client.post(
+        f"{settings.API_V1_STR}/auth/signin",
+        data={"username": username, "password": password},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert retry.status_code == 200
+
+
+def test_password_hasher_does_not_block_event_loop():
+    password_hasher = security.PasswordHasher(workers=1, queue_size=0)
+    release = threading.Event()
+
+    async def release_hasher():
+        release.set()
+
+    async def sign_in_and_release():
+        return await asyncio.gather(
+            password_hasher.run(release.wait, 5), release_hasher()
+        )
+
+    released, _ = asyncio.run(sign_in_and_release())
+
+    assert released
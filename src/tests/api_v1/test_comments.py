@@ -179,6 +179,32 @@ def test_unauthorized_update_comment():
     )
 
     assert response.status_code == 401
+    assert utils.get_comment(comment_id=comment["id"])["text"] == comment["text"]
+
+
+def test_update_comment_in_one_statement():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+    comment = utils.create_comment(post_id=post["id"], token=token)
+
+    data = {
+        "text": utils.random_lower_string()
+    }
+
+    with utils.count_statements() as statements:
+        response = client.put(
+            f"{settings.API_V1_STR}/comments/{comment['id']}",
+            headers=token,
+            json=data
+        )
+
+    assert response.status_code == 200
+    assert response.json()["owner"]["username"] == username
+    assert [statement for statement in statements if statement.startswith("UPDATE comments")]
+    assert not [statement for statement in statements if "FROM comments" in statement]
 
 
 def test_delete_comment_as_superuser():
@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src import crud
 from src.core.config import settings
-from src.tests.conftest import client
+from src.tests.conftest import TestingSessionLocal, client
 from src.tests.utils import utils
 
 
@@ -127,6 +130,29 @@ def test_follow_already_followed_user():
     assert response.status_code == 400
 
 
+def test_follow_user_concurrent_double_tap():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    utils.create_user(username=second_username, password=second_password)
+    second_user = utils.get_active_user(username=second_username)
+
+    def follow_user(_):
+        with TestingSessionLocal() as db:
+            return crud.follow.follow(db, follower_id=user["id"], following_id=second_user["id"]) is not None
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        followed = list(executor.map(follow_user, range(8)))
+
+    assert followed.count(True) == 1
+    assert utils.get_active_user(username=username)["followings"] == 1
+    assert utils.get_active_user(username=second_username)["followers"] == 1
+
+
 def test_unfollow_user():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -0,0 +1,98 @@
+import sqlite3
+import threading
+import time
+
+from src.core.config import settings
+from src.database.pool import MeteredQueuePool, pool_metrics
+from src.tests.conftest import client
+from src.tests.utils import utils
+
+
+def test_get_counter_buffer_stats():
+    stats = utils.get_counter_buffer_stats()
+
+    assert stats["mode"] == settings.LIKE_COUNTER_MODE
+    assert stats["pending_events"] >= 0
+
+
+def test_get_counter_buffer_stats_by_normal_user():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/internal/counters",
+        headers=token,
+    )
+
+    assert response.status_code == 401
+
+
+def test_get_cache_stats():
+    superuser_token = utils.authentication_headers(
+        username=settings.SUPERUSER_USERNAME,
+        password=settings.SUPERUSER_PASSWORD,
+    )
+
+    client.get(f"{settings.API_V1_STR}/internal/caches", headers=superuser_token)
+    before = client.get(
+        f"{settings.API_V1_STR}/internal/caches", headers=superuser_token
+    ).json()
+
+    with utils.count_statements() as statements:
+        response = client.get(
+            f"{settings.API_V1_STR}/internal/caches", headers=superuser_token
+        )
+    after = response.json()
+
+    assert response.status_code == 200
+    assert not [statement for statement in statements if "FROM users" in statement]
+    assert after["tokens"]["hits"] == before["tokens"]["hits"] + 2
+    assert after["users"]["misses"] == before["users"]["misses"]
+
+
+def test_get_pool_stats():
+    superuser_token = utils.authentication_headers(
+        username=settings.SUPERUSER_USERNAME,
+        password=settings.SUPERUSER_PASSWORD,
+    )
+
+    before = client.get(
+        f"{settings.API_V1_STR}/internal/pool", headers=superuser_token
+    ).json()
+    utils.get_all_posts_count()
+    after = client.get(
+        f"{settings.API_V1_STR}/internal/pool", headers=superuser_token
+    ).json()
+
+    assert after["mode"] == settings.DATABASE_POOL_MODE
+    assert after["checkouts"] > before["checkouts"]
+    assert after["checked_out"] >= 0
+    assert sum(after["wait_ms"].values()) > sum(before["wait_ms"].values())
+    assert after["connects"] >= after["disconnects"]
+
+
+def test_pool_waiting_counts_only_blocked_checkouts():
+    pool = MeteredQueuePool(
+        lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=5
+    )
+    waiting = pool_metrics.get_stats()["waiting"]
+
+    connection = pool.connect()
+    assert pool.is_exhausted()
+    assert pool_metrics.get_stats()["waiting"] == waiting
+
+    waiter = threading.Thread(target=lambda: pool.connect().close())
+    waiter.start()
+
+    deadline = time.monotonic() + 5
+    while pool_metrics.get_stats()["waiting"] == waiting and time.monotonic() < deadline:
+        time.sleep(0.01)
+    blocked = pool_metrics.get_stats()["waiting"]
+
+    connection.close()
+    waiter.join()
+    pool.dispose()
+
+    assert blocked == waiting + 1
+    assert pool_metrics.get_stats()["waiting"] == waiting
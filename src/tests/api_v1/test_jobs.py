@@ -0,0 +1,220 @@
+from src import models
+from src.core.config import settings
+from src.crud.utils import utils as crud_utils
+from src.tests.conftest import TestingSessionLocal, client
+from src.tests.utils import utils
+
+
+def test_deactivate_user_in_background():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+
+    response = client.put(
+        f"{settings.API_V1_STR}/users/deactivate/{username}/job",
+        headers=token,
+    )
+    job = response.json()
+
+    assert response.status_code == 202
+    assert job["kind"] == "deactivate_user"
+    assert job["target_id"] == user["id"]
+    assert job["total_steps"] == 5
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-users/{username}",
+    )
+
+    assert response.status_code == 404
+
+
+def test_post_likes_count_after_user_deactivated_in_background():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    second_token = utils.create_user(
+        username=second_username, password=second_password
+    )
+
+    utils.like_post(post_id=post["id"], token=second_token)
+    job = utils.deactivate_user_in_background(
+        username=second_username, token=second_token
+    )
+    job = utils.wait_for_job(job_id=job["id"], token=second_token)
+    updated_post = utils.get_active_post(post_id=post["id"])
+
+    assert job["status"] == "completed"
+    assert job["step"] == job["total_steps"]
+    assert job["processed"] == 1
+    assert updated_post["likes"] == 0
+
+
+def test_post_likes_count_after_user_activated_in_background():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    second_token = utils.create_user(
+        username=second_username, password=second_password
+    )
+
+    utils.like_post(post_id=post["id"], token=second_token)
+    job = utils.deactivate_user_in_background(
+        username=second_username, token=second_token
+    )
+    utils.wait_for_job(job_id=job["id"], token=second_token)
+
+    job = utils.activate_user_in_background(
+        username=second_username, token=second_token
+    )
+    job = utils.wait_for_job(job_id=job["id"], token=second_token)
+    updated_post = utils.get_active_post(post_id=post["id"])
+
+    assert job["status"] == "completed"
+    assert updated_post["likes"] == 1
+
+
+def test_get_job_as_another_user():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    job = utils.deactivate_user_in_background(username=username, token=token)
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    second_token = utils.create_user(
+        username=second_username, password=second_password
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/jobs/{job['id']}",
+        headers=second_token,
+    )
+
+    assert response.status_code == 401
+
+
+def test_get_not_existing_job():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    job = utils.deactivate_user_in_background(username=username, token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/jobs/{job['id'] + 1000}",
+        headers=token,
+    )
+
+    assert response.status_code == 404
+
+
+def test_deactivate_user_in_background_in_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_CHUNK_SIZE", 1)
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    posts = [utils.create_post(token=token) for _ in range(3)]
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    second_token = utils.create_user(
+        username=second_username, password=second_password
+    )
+
+    for post in posts:
+        utils.like_post(post_id=post["id"], token=second_token)
+
+    job = utils.deactivate_user_in_background(
+        username=second_username, token=second_token
+    )
+    job = utils.wait_for_job(job_id=job["id"], token=second_token)
+
+    assert job["status"] == "completed"
+    assert job["processed"] == 3
+    for post in posts:
+        assert utils.get_active_post(post_id=post["id"])["likes"] == 0
+
+
+def test_activate_user_in_background_in_chunks_recounts_user_once(monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_CHUNK_SIZE", 1)
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+
+    for _ in range(3):
+        follower_token = utils.create_user(
+            username=utils.random_lower_string(), password=utils.random_lower_string()
+        )
+        utils.follow_user(following_id=user["id"], token=follower_token)
+
+    job = utils.deactivate_user_in_background(username=username, token=token)
+    utils.wait_for_job(job_id=job["id"], token=token)
+
+    recounts = []
+    monkeypatch.setattr(
+        type(crud_utils), "update_user_followers_count",
+        lambda self, db, user_id: recounts.append(user_id),
+    )
+
+    job = utils.activate_user_in_background(username=username, token=token)
+    job = utils.wait_for_job(job_id=job["id"], token=token)
+
+    assert job["status"] == "completed"
+    assert job["result"]["followers"]["rows"] == 3
+    assert "counts" in job["result"]
+    assert recounts == []
+    assert utils.get_active_user(username=username)["followers"] == 3
+
+
+def test_reconcile_counters(monkeypatch):
+    monkeypatch.setattr(settings, "RECONCILE_THROTTLE_MS", 0)
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+    utils.like_post(post_id=post["id"], token=token)
+
+    with TestingSessionLocal() as db:
+        (
+            db.query(models.Post)
+            .filter(models.Post.id == post["id"])
+            .update({models.Post.likes: 42, models.Post.comments: 7})
+        )
+        db.commit()
+
+    job = utils.reconcile_counters()
+    updated_post = utils.get_active_post(post_id=post["id"])
+
+    assert job["status"] == "completed"
+    assert job["kind"] == "reconcile"
+    assert job["target_id"] is None
+    assert job["result"]["posts.likes"]["drifted"] >= 1
+    assert job["result"]["posts.likes"]["drift"] >= 41
+    assert job["result"]["posts.comments"]["drift"] >= 7
+    assert updated_post["likes"] == 1
+    assert updated_post["comments"] == 0
+
+
+def test_reconcile_counters_by_normal_user():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+
+    response = client.post(
+        f"{settings.API_V1_STR}/jobs/reconcile",
+        headers=token,
+    )
+
+    assert response.status_code == 401
@@ -1,5 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from src import crud
 from src.core.config import settings
-from src.tests.conftest import client
+from src.crud.counter_buffer import counter_buffer
+from src.crud.utils import utils as crud_utils
+from src.tests.conftest import TestingSessionLocal, client
 from src.tests.utils import utils
 
 
@@ -35,6 +42,148 @@ def test_post_likes_count_after_post_liked():
     assert updated_post["likes"] == 1
 
 
+def test_post_likes_count_after_post_liked_with_sharded_counter(monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", "sharded")
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    tokens = [
+        utils.create_user(
+            username=utils.random_lower_string(),
+            password=utils.random_lower_string(),
+        )
+        for _ in range(3)
+    ]
+    for liker_token in tokens:
+        utils.like_post(post_id=post["id"], token=liker_token)
+    utils.unlike_post(post_id=post["id"], token=tokens[0])
+
+    with TestingSessionLocal() as db:
+        crud_utils.fold_post_like_shards(db)
+        db.commit()
+
+    updated_post = utils.get_active_post(post_id=post["id"])
+
+    assert updated_post["likes"] == 2
+
+
+def test_post_likes_count_after_post_liked_with_buffered_counter(monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", "buffered")
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    utils.like_post(post_id=post["id"], token=token)
+    stale_post = utils.get_active_post(post_id=post["id"])
+    stats = utils.get_counter_buffer_stats()
+
+    with TestingSessionLocal() as db:
+        counter_buffer.flush(db)
+
+    updated_post = utils.get_active_post(post_id=post["id"])
+
+    assert stale_post["likes"] == 0
+    assert stats["mode"] == "buffered"
+    assert stats["pending_events"] >= 1
+    assert stats["staleness_seconds"] > 0
+    assert updated_post["likes"] == 1
+    assert utils.get_counter_buffer_stats()["pending_events"] == 0
+
+
+def test_post_likes_count_after_recount_with_buffered_counter(monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", "buffered")
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    utils.like_post(post_id=post["id"], token=token)
+    utils.deactivate_post(post_id=post["id"], token=token)
+    utils.activate_post(post_id=post["id"])
+
+    with TestingSessionLocal() as db:
+        counter_buffer.flush(db)
+
+    assert counter_buffer.get_pending("posts.likes").get(post["id"]) is None
+    assert utils.get_active_post(post_id=post["id"])["likes"] == 1
+
+
+def test_post_likes_count_after_reconcile_with_buffered_counter(monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", "buffered")
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    utils.like_post(post_id=post["id"], token=token)
+    utils.reconcile_counters()
+
+    with TestingSessionLocal() as db:
+        counter_buffer.flush(db)
+
+    assert counter_buffer.get_pending("posts.likes").get(post["id"]) is None
+    assert utils.get_active_post(post_id=post["id"])["likes"] == 1
+
+
+def test_buffered_like_discarded_on_rollback(monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", "buffered")
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+    post = utils.create_post(token=token)
+
+    with TestingSessionLocal() as db:
+        db.info["unit_of_work"] = True
+        crud.like.like_post(db, post_id=post["id"], owner_id=user["id"])
+        db.rollback()
+
+    assert counter_buffer.get_pending("posts.likes").get(post["id"]) is None
+    assert utils.get_likes_count_by_post_id(post_id=post["id"]) == 0
+
+
+def test_buffered_like_kept_when_flush_commit_fails(monkeypatch):
+    monkeypatch.setattr(settings, "LIKE_COUNTER_MODE", "buffered")
+
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    utils.like_post(post_id=post["id"], token=token)
+
+    def commit():
+        raise OperationalError("COMMIT", {}, Exception("lock timeout"))
+
+    with TestingSessionLocal() as db:
+        monkeypatch.setattr(db, "commit", commit)
+
+        with pytest.raises(OperationalError):
+            counter_buffer.flush(db)
+
+    assert counter_buffer.get_pending("posts.likes").get(post["id"]) == 1
+    assert utils.get_active_post(post_id=post["id"])["likes"] == 0
+
+    with TestingSessionLocal() as db:
+        counter_buffer.flush(db)
+
+    assert utils.get_active_post(post_id=post["id"])["likes"] == 1
+
+
 def test_like_not_existing_post():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -84,6 +233,26 @@ def test_like_post_already_liked():
     assert response.status_code == 400
 
 
+def test_like_post_concurrent_double_tap():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+    post = utils.create_post(token=token)
+
+    def like_post(_):
+        with TestingSessionLocal() as db:
+            return crud.like.like_post(db, post_id=post["id"], owner_id=user["id"]) is not None
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        liked = list(executor.map(like_post, range(8)))
+
+    assert liked.count(True) == 1
+    assert utils.get_likes_count_by_post_id(post_id=post["id"]) == 1
+    assert utils.get_active_post(post_id=post["id"])["likes"] == 1
+
+
 def test_unlike_post():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -119,6 +288,27 @@ def test_post_likes_count_after_post_unliked():
     assert updated_post["likes"] == 0
 
 
+def test_post_likes_count_after_deactivated_user_unliked_post():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    second_token = utils.create_user(
+        username=second_username, password=second_password
+    )
+
+    utils.like_post(post_id=post["id"], token=token)
+    utils.like_post(post_id=post["id"], token=second_token)
+    utils.deactivate_user(username=second_username, token=second_token)
+    utils.unlike_post(post_id=post["id"], token=second_token)
+    updated_post = utils.get_active_post(post_id=post["id"])
+
+    assert updated_post["likes"] == 1
+
+
 def test_unlike_not_existing_post():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -414,6 +604,38 @@ def test_get_like_by_id_as_super_user():
     assert response_like == like
 
 
+def test_get_like_by_id_after_post_deactivated_and_activated():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+    like = utils.like_post(post_id=post["id"], token=token)
+
+    superuser_token = utils.authentication_headers(
+        username=settings.SUPERUSER_USERNAME,
+        password=settings.SUPERUSER_PASSWORD
+    )
+
+    utils.deactivate_post(post_id=post["id"], token=token)
+    response = client.get(
+        f"{settings.API_V1_STR}/likes/{like['id']}",
+        headers=superuser_token,
+    )
+    deactivated_like = response.json()
+
+    assert deactivated_like["is_post_active"] == False
+    assert deactivated_like["is_owner_active"] == True
+
+    utils.activate_post(post_id=post["id"])
+    response = client.get(
+        f"{settings.API_V1_STR}/likes/{like['id']}",
+        headers=superuser_token,
+    )
+
+    assert response.json() == like
+
+
 def test_get_like_by_id_as_normal_user():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -128,6 +128,31 @@ def test_unauthorized_update_post():
     )
 
     assert response.status_code == 401
+    assert utils.get_post(post_id=post["id"])["text"] == post["text"]
+
+
+def test_update_post_in_one_statement():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    post = utils.create_post(token=token)
+
+    data = {
+        "text": utils.random_lower_string()
+    }
+
+    with utils.count_statements() as statements:
+        response = client.put(
+            f"{settings.API_V1_STR}/posts/{post['id']}",
+            headers=token,
+            json=data
+        )
+
+    assert response.status_code == 200
+    assert response.json()["owner"]["username"] == username
+    assert [statement for statement in statements if statement.startswith("UPDATE posts")]
+    assert not [statement for statement in statements if "FROM posts" in statement]
 
 
 def test_delete_post_as_superuser():
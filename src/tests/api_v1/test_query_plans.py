@@ -0,0 +1,41 @@
+import re
+
+import pytest
+from src import crud
+from src.tests.utils import utils
+
+HOT_QUERIES = {
+    "all_active_users": lambda db: crud.user.get_all_active_users(db),
+    "active_user_by_username": lambda db: crud.user.get_active_user_by_username(db, username="username"),
+    "all_active_posts": lambda db: crud.post.get_all_active_posts(db),
+    "all_active_posts_ids": lambda db: crud.post.get_all_active_posts_ids(db),
+    "active_posts_by_owner_id": lambda db: crud.post.get_active_posts_by_owner_id(db, owner_id=1),
+    "all_active_comments": lambda db: crud.comment.get_all_active_comments(db),
+    "active_comments_by_owner_id": lambda db: crud.comment.get_active_comments_by_owner_id(db, owner_id=1),
+    "active_comments_by_post_id": lambda db: crud.comment.get_active_comments_by_post_id(db, post_id=1),
+    "all_active_likes": lambda db: crud.like.get_all_active_likes(db),
+    "active_likes_by_owner_id": lambda db: crud.like.get_active_likes_by_owner_id(db, owner_id=1),
+    "active_likes_by_post_id": lambda db: crud.like.get_active_likes_by_post_id(db, post_id=1),
+    "active_likes_by_comment_id": lambda db: crud.like.get_active_likes_by_comment_id(db, comment_id=1),
+    "all_active_follows": lambda db: crud.follow.get_all_active_follows(db),
+    "active_followers_by_user_id": lambda db: crud.follow.get_active_followers_by_user_id(db, user_id=1),
+    "active_followings_by_user_id": lambda db: crud.follow.get_active_followings_by_user_id(db, user_id=1),
+    "posts_by_owner_id": lambda db: crud.post.get_posts_by_owner_id(db, owner_id=1),
+    "comments_by_post_id": lambda db: crud.comment.get_comments_by_post_id(db, post_id=1),
+    "likes_by_post_id": lambda db: crud.like.get_likes_by_post_id(db, post_id=1),
+    "search_active_posts": lambda db: crud.post.search_active_posts(db, q="word"),
+    "search_active_comments": lambda db: crud.comment.search_active_comments(db, q="word"),
+}
+
+
+def is_sequential_scan(plan: str) -> bool:
+    return "Seq Scan" in plan or re.search(r"^SCAN \w+$", plan, re.MULTILINE) is not None
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(name):
+    plans = utils.get_query_plans(HOT_QUERIES[name])
+
+    assert plans
+    for plan in plans:
+        assert not is_sequential_scan(plan), plan
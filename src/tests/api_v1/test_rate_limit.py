@@ -0,0 +1,121 @@
+import time
+
+from sqlalchemy import select
+from src import models
+from src.api.api_v1 import api
+from src.core import rate_limit
+from src.core.config import settings
+from src.tests.conftest import TestingSessionLocal, client, engine
+from src.tests.utils import utils
+
+
+def test_signin_is_rate_limited(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "backend", rate_limit.MemoryBackend())
+
+    data = {
+        "username": utils.random_lower_string(),
+        "password": utils.random_lower_string(),
+    }
+
+    responses = [
+        client.post(f"{settings.API_V1_STR}/auth/signin", data=data)
+        for _ in range(api.auth_rate_limit.burst + 1)
+    ]
+
+    assert {response.status_code for response in responses[:-1]} == {401}
+    assert responses[-1].status_code == 429
+    assert int(responses[-1].headers["Retry-After"]) >= 1
+
+
+def test_writes_are_rate_limited_per_user(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "backend", rate_limit.MemoryBackend())
+    monkeypatch.setattr(api.posts_rate_limit, "burst", 2)
+
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    second_token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+
+    responses = [
+        client.post(
+            f"{settings.API_V1_STR}/posts/",
+            headers=token,
+            json={"text": utils.random_lower_string()},
+        )
+        for _ in range(3)
+    ]
+    second_response = client.post(
+        f"{settings.API_V1_STR}/posts/",
+        headers=second_token,
+        json={"text": utils.random_lower_string()},
+    )
+    read_response = client.get(
+        f"{settings.API_V1_STR}/users/current-user/",
+        headers=token,
+    )
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert second_response.status_code == 200
+    assert read_response.status_code == 200
+
+
+def test_writes_are_rate_limited_per_router(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "backend", rate_limit.MemoryBackend())
+    monkeypatch.setattr(api.likes_rate_limit, "burst", 1)
+
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    post = utils.create_post(token=token)
+
+    like_response = client.post(
+        f"{settings.API_V1_STR}/likes/post/{post['id']}", headers=token
+    )
+    unlike_response = client.delete(
+        f"{settings.API_V1_STR}/likes/post/{post['id']}", headers=token
+    )
+    post_response = client.post(
+        f"{settings.API_V1_STR}/posts/",
+        headers=token,
+        json={"text": utils.random_lower_string()},
+    )
+
+    assert like_response.status_code == 200
+    assert unlike_response.status_code == 429
+    assert post_response.status_code == 200
+
+
+def test_database_backend():
+    backend = rate_limit.DatabaseBackend(bind=engine)
+    key = utils.random_lower_string()
+
+    assert backend.take(key, rate=1 / 60, burst=2) == 0
+    assert backend.take(key, rate=1 / 60, burst=2) == 0
+    assert 0 < backend.take(key, rate=1 / 60, burst=2) <= 60
+    assert backend.take(utils.random_lower_string(), rate=1 / 60, burst=2) == 0
+
+
+def test_database_backend_prunes_full_buckets():
+    backend = rate_limit.DatabaseBackend(bind=engine)
+    idle = utils.random_lower_string()
+    busy = utils.random_lower_string()
+
+    backend.take(idle, rate=1000, burst=2)
+    backend.take(busy, rate=1 / 60, burst=2)
+    time.sleep(0.01)
+
+    with TestingSessionLocal() as db:
+        backend.prune(db)
+        db.commit()
+
+        keys = set(db.scalars(select(models.RateLimitBucket.key)))
+
+    assert idle not in keys
+    assert busy in keys
+    assert backend.take(busy, rate=1 / 60, burst=2) == 0
+    assert backend.take(busy, rate=1 / 60, burst=2) > 0
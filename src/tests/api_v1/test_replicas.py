@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.api import deps
+from src.core.config import settings
+from src.crud.row_count import row_count
+from src.database.routing import ReadYourWrites, RoutingSession
+from src.database.session import Base
+from src.tests.conftest import client, engine
+from src.tests.utils import utils
+
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path):
+    replica_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica_engine)
+
+    monkeypatch.setattr(deps, "read_your_writes", ReadYourWrites())
+    monkeypatch.setattr(deps, "SessionLocal", sessionmaker(
+        class_=RoutingSession, replicas=[replica_engine],
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=engine,
+    ))
+
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def test_reads_go_to_replica(replica):
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    post = utils.create_post(token=token)
+    deps.read_your_writes.clear()
+
+    response = client.get(f"{settings.API_V1_STR}/active-posts/{post['id']}")
+
+    assert response.status_code == 404
+
+
+def test_reads_after_own_write_go_to_primary(replica):
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    post = utils.create_post(token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/{post['id']}",
+        headers=token,
+    )
+    current_user = client.get(
+        f"{settings.API_V1_STR}/users/current-user/",
+        headers=token,
+    )
+
+    assert response.status_code == 200
+    assert current_user.status_code == 200
+
+
+def test_reads_after_write_window_go_to_replica(replica, monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_READ_YOUR_WRITES_SECONDS", 0)
+
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    post = utils.create_post(token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/{post['id']}",
+        headers=token,
+    )
+
+    assert response.status_code == 404
+
+
+def test_writes_go_to_primary(replica):
+    with RoutingSession(bind=engine, replicas=[replica]) as db:
+        db.info["use_replica"] = True
+
+        assert db.get_bind() is replica
+
+        db.execute(Base.metadata.tables["users"].update().where(False).values(name=""))
+
+        assert db.get_bind() is engine
+
+
+def test_raw_reads_go_to_replica(replica):
+    with RoutingSession(bind=engine, replicas=[replica]) as db:
+        db.info["use_replica"] = True
+        db.execute(text("SELECT 1"))
+
+        assert db.get_bind() is replica
+        assert not db.info.get("wrote")
+
+        db.execute(text("UPDATE users SET name = name WHERE 0").execution_options(is_write=True))
+
+        assert db.get_bind() is engine
+
+
+def test_planned_count_stays_on_replica(replica, monkeypatch):
+    def get_planned(db, query):
+        return db.execute(text("SELECT count(*) FROM posts")).scalar()
+
+    monkeypatch.setattr(row_count, "get_approximate", get_planned)
+
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    utils.create_post(token=token)
+    deps.read_your_writes.clear()
+
+    response = client.get(
+        f"{settings.API_V1_STR}/active-posts/count/",
+        headers=token,
+        params={"mode": "approximate"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == 0
+    assert not deps.read_your_writes.written_at
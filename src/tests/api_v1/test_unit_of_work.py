@@ -0,0 +1,85 @@
+import pytest
+from src import crud, schemas
+from src.core.config import settings
+from src.tests.conftest import TestingSessionLocal, client
+from src.tests.utils import utils
+
+
+@pytest.fixture
+def unit_of_work(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_TRANSACTION_PER_REQUEST", True)
+
+
+def test_create_post_commits_once(unit_of_work):
+    username = utils.random_lower_string()
+    token = utils.create_user(username=username, password=utils.random_lower_string())
+
+    with utils.count_commits() as commits, utils.count_statements() as statements:
+        response = client.post(
+            f"{settings.API_V1_STR}/posts/",
+            headers=token,
+            json={"text": utils.random_lower_string()},
+        )
+    post = response.json()
+
+    assert response.status_code == 200
+    assert len(commits) == 1
+    assert not [statement for statement in statements if statement.startswith("SELECT posts.")]
+    assert post["created_at"] is not None
+    assert utils.get_post(post_id=post["id"])["id"] == post["id"]
+    assert utils.get_active_user(username=username)["posts"] == 1
+
+
+def test_update_post_commits_once(unit_of_work):
+    token = utils.create_user(
+        username=utils.random_lower_string(), password=utils.random_lower_string()
+    )
+    post = utils.create_post(token=token)
+
+    with utils.count_commits() as commits:
+        response = client.put(
+            f"{settings.API_V1_STR}/posts/{post['id']}",
+            headers=token,
+            json={"text": utils.random_lower_string()},
+        )
+
+    assert response.status_code == 200
+    assert len(commits) == 1
+    assert response.json()["is_modified"] is True
+    assert response.json()["modified_at"] is not None
+
+
+def test_on_commit_hooks_run_after_commit():
+    username = utils.random_lower_string()
+    utils.create_user(username=username, password=utils.random_lower_string())
+
+    with TestingSessionLocal() as db:
+        db.info["unit_of_work"] = True
+        db_user = crud.user.update(
+            db, username=username,
+            user_update=schemas.UserUpdate(username=username, name="renamed", bio=""),
+        )
+        crud.user.cache.set(username, "stale")
+
+        assert crud.user.cache.get(username) == "stale"
+
+        db.commit()
+
+        assert crud.user.cache.get(username) is None
+        assert db_user.name == "renamed"
+
+
+def test_on_commit_hooks_discarded_on_rollback():
+    username = utils.random_lower_string()
+    token = utils.create_user(username=username, password=utils.random_lower_string())
+
+    with TestingSessionLocal() as db:
+        db.info["unit_of_work"] = True
+        crud.user.update_password(db, username=username, new_password=utils.random_lower_string())
+        db.rollback()
+
+        assert not db.info.get("on_commit")
+
+    response = client.get(f"{settings.API_V1_STR}/users/current-user/", headers=token)
+
+    assert response.status_code == 200
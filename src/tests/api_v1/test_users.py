@@ -28,6 +28,33 @@ def test_update_user():
     assert user["bio"] == data["bio"]
 
 
+def test_update_user_in_one_statement():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+
+    data = {
+        "username": username,
+        "name": utils.random_lower_string(),
+        "bio": utils.random_lower_string()
+    }
+
+    client.put(f"{settings.API_V1_STR}/users/", headers=token, json=data)
+
+    with utils.count_statements() as statements:
+        response = client.put(
+            f"{settings.API_V1_STR}/users/",
+            headers=token,
+            json=data,
+        )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == data["name"]
+    assert [statement for statement in statements if statement.startswith("UPDATE users")]
+    assert not [statement for statement in statements if "FROM users" in statement]
+
+
 def test_update_username_to_existing_username():
     username = utils.random_lower_string()
     password = utils.random_lower_string()
@@ -153,22 +180,56 @@ def test_unauthorized_activate_user():
     assert response.status_code == 401
 
 
-# def test_user_follower_count_after_user_activated():
-#     username = utils.random_lower_string()
-#     password = utils.random_lower_string()
-#     token = utils.create_user(username=username, password=password)
+def test_user_follower_count_after_user_activated():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    utils.create_user(username=second_username, password=second_password)
+    second_user = utils.get_active_user(username=second_username)
+
+    utils.follow_user(following_id=second_user["id"], token=token)
+    utils.deactivate_user(username=username, token=token)
 
-#     second_username = utils.random_lower_string()
-#     second_password = utils.random_lower_string()
-#     utils.create_user(username=second_username, password=second_password)
-#     second_user = utils.get_active_user(username=second_username)
+    deactivated_second_user = utils.get_active_user(username=second_username)
+    assert deactivated_second_user["followers"] == 0
 
-#     utils.follow_user(following_id=second_user["id"], token=token)
-#     utils.deactivate_user(username=username, token=token)
+    client.put(
+        f"{settings.API_V1_STR}/users/activate/{username}",
+        headers=token,
+    )
 
+    activated_second_user = utils.get_active_user(username=second_username)
+    assert activated_second_user["followers"] == 1
 
-# def test_user_following_count_after_user_activated():
-#     pass
+
+def test_user_following_count_after_user_activated():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+    token = utils.create_user(username=username, password=password)
+    user = utils.get_active_user(username=username)
+
+    second_username = utils.random_lower_string()
+    second_password = utils.random_lower_string()
+    second_token = utils.create_user(
+        username=second_username, password=second_password
+    )
+
+    utils.follow_user(following_id=user["id"], token=second_token)
+    utils.deactivate_user(username=username, token=token)
+
+    deactivated_second_user = utils.get_active_user(username=second_username)
+    assert deactivated_second_user["followings"] == 0
+
+    client.put(
+        f"{settings.API_V1_STR}/users/activate/{username}",
+        headers=token,
+    )
+
+    activated_second_user = utils.get_active_user(username=second_username)
+    assert activated_second_user["followings"] == 1
 
 
 def test_deactivate_user_as_superuser():
@@ -459,3 +520,44 @@ def test_get_all_users_count_is_all():
     new_all_users_count = utils.get_all_users_count()
 
     assert new_all_users_count == all_users_count
+
+
+def test_current_user_after_update():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    client.get(f"{settings.API_V1_STR}/users/current-user/", headers=token)
+
+    name = utils.random_lower_string()
+    client.put(
+        f"{settings.API_V1_STR}/users/",
+        headers=token,
+        json={"username": username, "name": name, "bio": ""},
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/users/current-user/",
+        headers=token,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == name
+
+
+def test_current_user_after_deactivate():
+    username = utils.random_lower_string()
+    password = utils.random_lower_string()
+
+    token = utils.create_user(username=username, password=password)
+    client.get(f"{settings.API_V1_STR}/users/current-user/", headers=token)
+
+    utils.deactivate_user(username=username, token=token)
+
+    response = client.get(
+        f"{settings.API_V1_STR}/users/current-user/",
+        headers=token,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
@@ -4,31 +4,26 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from src.api.deps import get_db
+from src.api import deps
 from src.core.config import settings
 from src.database.init_db import init_db
+from src.database.pool import get_pool_options, pool_metrics
+from src.database.routing import RoutingSession
 from src.database.session import Base
 from src.main import app
 
-engine = create_engine(settings.TEST_DATABASE_URL)
+engine = create_engine(settings.TEST_DATABASE_URL, **get_pool_options())
+pool_metrics.listen(engine)
 
 TestingSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine
+    class_=RoutingSession, autocommit=False, autoflush=False,
+    expire_on_commit=False, bind=engine,
 )
 
 
 Base.metadata.create_all(bind=engine)
 
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db
+deps.SessionLocal = TestingSessionLocal
 
 client = TestClient(app)
 
@@ -1,14 +1,71 @@
 import random
 import string
+import time
+from contextlib import contextmanager
 
+from sqlalchemy import event
 from src.core.config import settings
-from src.tests.conftest import client
+from src.tests.conftest import TestingSessionLocal, client, engine
 
 
 class Utils():
     def random_lower_string(self):
         return "".join(random.choices(string.ascii_lowercase, k=32))
 
+    @contextmanager
+    def count_statements(self):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    @contextmanager
+    def count_commits(self):
+        commits = []
+
+        def commit(conn):
+            commits.append(conn)
+
+        event.listen(engine, "commit", commit)
+        try:
+            yield commits
+        finally:
+            event.remove(engine, "commit", commit)
+
+    def get_query_plans(self, query) -> list[str]:
+        executed = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            executed.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            with TestingSessionLocal() as db:
+                query(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+        plans = []
+        with engine.connect() as connection:
+            if engine.dialect.name == "postgresql":
+                connection.exec_driver_sql("SET enable_seqscan = off")
+
+            for statement, parameters in executed:
+                if engine.dialect.name == "postgresql":
+                    plan = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).scalars()
+                else:
+                    plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+                plans.append("\n".join(plan))
+
+        return plans
+
     def authentication_headers(self, username: str, password: str):
         data = {
             "username": username,
@@ -24,10 +81,10 @@ class Utils():
         auth_token = tokens["access_token"]
         return {"Authorization": f"Bearer {auth_token}"}
 
-    def create_user(self, username: str, password: str):
+    def create_user(self, username: str, password: str, name: str | None = None):
         data = {
             "username": username,
-            "name": self.random_lower_string(),
+            "name": name or self.random_lower_string(),
             "password": password
         }
 
@@ -56,6 +113,61 @@ class Utils():
             headers=token,
         )
 
+    def deactivate_user_in_background(self, username: str, token: str):
+        response = client.put(
+            f"{settings.API_V1_STR}/users/deactivate/{username}/job",
+            headers=token,
+        )
+        return response.json()
+
+    def activate_user_in_background(self, username: str, token: str):
+        response = client.put(
+            f"{settings.API_V1_STR}/users/activate/{username}/job",
+            headers=token,
+        )
+        return response.json()
+
+    def reconcile_counters(self):
+        superuser_token = self.authentication_headers(
+            username=settings.SUPERUSER_USERNAME,
+            password=settings.SUPERUSER_PASSWORD,
+        )
+
+        response = client.post(
+            f"{settings.API_V1_STR}/jobs/reconcile",
+            headers=superuser_token,
+        )
+        return self.wait_for_job(
+            job_id=response.json()["id"], token=superuser_token
+        )
+
+    def get_counter_buffer_stats(self):
+        superuser_token = self.authentication_headers(
+            username=settings.SUPERUSER_USERNAME,
+            password=settings.SUPERUSER_PASSWORD,
+        )
+
+        response = client.get(
+            f"{settings.API_V1_STR}/internal/counters",
+            headers=superuser_token,
+        )
+        return response.json()
+
+    def wait_for_job(self, job_id: int, token: str, timeout: float = 10):
+        deadline = time.monotonic() + timeout
+
+        while True:
+            response = client.get(
+                f"{settings.API_V1_STR}/jobs/{job_id}",
+                headers=token,
+            )
+            job = response.json()
+
+            if job["status"] not in ("pending", "running") or time.monotonic() > deadline:
+                return job
+
+            time.sleep(0.05)
+
     def get_all_users_count(self):
         superuser_token = self.authentication_headers(
             username=settings.SUPERUSER_USERNAME,
@@ -76,9 +188,9 @@ class Utils():
 
         return response.json()
 
-    def create_post(self, token: str):
+    def create_post(self, token: str, text: str | None = None):
         data = {
-            "text": self.random_lower_string()
+            "text": text or self.random_lower_string()
         }
 
         response = client.post(
@@ -188,9 +300,10 @@ class Utils():
 
         return response.json()
 
-    def get_all_active_posts_count(self):
+    def get_all_active_posts_count(self, mode: str = "exact"):
         response = client.get(
             f"{settings.API_V1_STR}/active-posts/count/",
+            params={"mode": mode},
         )
         return response.json()
 
@@ -212,9 +325,9 @@ class Utils():
         )
         return response.json()
 
-    def create_comment(self, post_id: int, token: str):
+    def create_comment(self, post_id: int, token: str, text: str | None = None):
         data = {
-            "text": self.random_lower_string(),
+            "text": text or self.random_lower_string(),
             "post_id": post_id
         }
 